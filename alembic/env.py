@@ -40,7 +40,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=target_metadata, literal_binds=True)
+        url=url, target_metadata=target_metadata, literal_binds=True,
+        transaction_per_migration=True)
 
     with context.begin_transaction():
         context.run_migrations()
@@ -59,9 +60,13 @@ def run_migrations_online():
         poolclass=pool.NullPool)
 
     with connectable.connect() as connection:
+        # every migration runs in its own transaction, so that the
+        # migrations that build indexes concurrently outside of a
+        # transaction don't affect the other migrations
         context.configure(
             connection=connection,
-            target_metadata=target_metadata
+            target_metadata=target_metadata,
+            transaction_per_migration=True
         )
 
         with context.begin_transaction():
@@ -0,0 +1,36 @@
+"""Removed the duplicate post tags
+
+Revision ID: 2e6b9f4d8a70
+Revises: 500de4365b5d
+Create Date: 2026-10-18 10:10:03.284517
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '2e6b9f4d8a70'
+down_revision = '500de4365b5d'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def is_postgresql():
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade():
+    # the duplicate rows are removed in their own transaction, so that the
+    # primary key of the post_tags table can be built concurrently by the
+    # next migration
+    if is_postgresql():
+        op.execute(
+            "DELETE FROM post_tags a USING post_tags b "
+            "WHERE a.ctid < b.ctid "
+            "AND a.post_id = b.post_id AND a.tag_id = b.tag_id"
+        )
+
+
+def downgrade():
+    pass
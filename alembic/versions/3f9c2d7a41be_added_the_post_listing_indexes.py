@@ -0,0 +1,80 @@
+"""Added the post listing indexes
+
+Revision ID: 3f9c2d7a41be
+Revises: 2e6b9f4d8a70
+Create Date: 2026-10-18 10:12:41.512038
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '3f9c2d7a41be'
+down_revision = '2e6b9f4d8a70'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+INDEXES = [
+    ("ix_post_tags__tag_id__post_id", "post_tags", ["tag_id", "post_id"]),
+    (
+        "ix_post_categories__category_id__post_id",
+        "post_categories",
+        ["category_id", "post_id"]
+    ),
+    (
+        "ix_posts__added_at__id",
+        "posts",
+        [sa.text("added_at DESC"), sa.text("id DESC")]
+    ),
+    ("ix_urls__added_at", "urls", ["added_at"])
+]
+
+
+def is_postgresql():
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def create_index_concurrently(index_name, table_name, columns, **kwargs):
+    # an index that is left invalid by a failed concurrent build is built
+    # again when the migration is run again
+    op.execute("DROP INDEX CONCURRENTLY IF EXISTS %s" % index_name)
+    op.create_index(
+        index_name, table_name, columns,
+        postgresql_concurrently=True, **kwargs
+    )
+
+
+def upgrade():
+    if is_postgresql():
+        # CREATE INDEX CONCURRENTLY can't run inside a transaction block, so
+        # the transaction of this migration is committed and the indexes are
+        # built without locking the tables for writes. The migration contains
+        # only the index builds and the next migration starts a new
+        # transaction, because every migration runs in its own transaction
+        op.execute("COMMIT")
+
+        create_index_concurrently(
+            "pk_post_tags", "post_tags", ["post_id", "tag_id"], unique=True)
+        op.execute(
+            "ALTER TABLE post_tags ADD CONSTRAINT pk_post_tags "
+            "PRIMARY KEY USING INDEX pk_post_tags"
+        )
+
+        for index_name, table_name, columns in INDEXES:
+            create_index_concurrently(index_name, table_name, columns)
+    else:
+        with op.batch_alter_table("post_tags") as batch_op:
+            batch_op.create_primary_key("pk_post_tags", ["post_id", "tag_id"])
+
+        for index_name, table_name, columns in INDEXES:
+            op.create_index(index_name, table_name, columns)
+
+
+def downgrade():
+    for index_name, table_name, columns in reversed(INDEXES):
+        op.drop_index(index_name, table_name=table_name)
+
+    with op.batch_alter_table("post_tags") as batch_op:
+        batch_op.drop_constraint("pk_post_tags", type_="primary")
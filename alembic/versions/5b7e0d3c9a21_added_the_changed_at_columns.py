@@ -0,0 +1,48 @@
+"""Added the changed_at columns
+
+Revision ID: 5b7e0d3c9a21
+Revises: c4d2a9e7f813
+Create Date: 2026-10-18 14:22:51.118734
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '5b7e0d3c9a21'
+down_revision = 'c4d2a9e7f813'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.add_column('tags', sa.Column('changed_at', sa.DateTime(), nullable=True))
+    op.add_column('categories', sa.Column('changed_at', sa.DateTime(), nullable=True))
+    op.add_column('urls', sa.Column('changed_at', sa.DateTime(), nullable=True))
+
+    op.execute(
+        "UPDATE tags SET changed_at = "
+        "(SELECT max(posts.added_at) FROM posts "
+        "JOIN post_tags ON post_tags.post_id = posts.id "
+        "WHERE post_tags.tag_id = tags.id)"
+    )
+    op.execute(
+        "UPDATE categories SET changed_at = coalesce("
+        "(SELECT max(posts.added_at) FROM posts "
+        "JOIN post_categories ON post_categories.post_id = posts.id "
+        "WHERE post_categories.category_id = categories.id), "
+        "categories.added_at)"
+    )
+    op.execute(
+        "UPDATE urls SET changed_at = coalesce("
+        "(SELECT max(posts.added_at) FROM posts "
+        "WHERE posts.url_id = urls.id), "
+        "urls.added_at)"
+    )
+
+
+def downgrade():
+    op.drop_column('urls', 'changed_at')
+    op.drop_column('categories', 'changed_at')
+    op.drop_column('tags', 'changed_at')
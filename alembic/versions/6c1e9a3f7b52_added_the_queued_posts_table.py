@@ -0,0 +1,41 @@
+"""Added the queued_posts table
+
+Revision ID: 6c1e9a3f7b52
+Revises: 9d4b7c2e5f18
+Create Date: 2026-10-18 18:12:27.640318
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '6c1e9a3f7b52'
+down_revision = '9d4b7c2e5f18'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.create_table('queued_posts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('receipt', sa.String(length=32), nullable=False),
+    sa.Column('status', sa.String(length=10), nullable=False),
+    sa.Column('title', sa.String(length=256), nullable=False),
+    sa.Column('url', sa.String(length=1024), nullable=False),
+    sa.Column('tags', sa.Text(), nullable=False),
+    sa.Column('categories', sa.Text(), nullable=False),
+    sa.Column('added_at', sa.DateTime(), nullable=False),
+    sa.Column('processed_at', sa.DateTime(), nullable=True),
+    sa.Column('post_id', sa.Integer(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], name='fk_queued_posts__post_id__posts', onupdate='CASCADE', ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id', name='pk_queued_posts'),
+    sa.UniqueConstraint('receipt', name='uq_queued_posts__receipt')
+    )
+    op.create_index('ix_queued_posts__status__id', 'queued_posts', ['status', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_queued_posts__status__id', table_name='queued_posts')
+    op.drop_table('queued_posts')
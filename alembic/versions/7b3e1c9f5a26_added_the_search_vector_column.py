@@ -0,0 +1,49 @@
+"""Added the search_vector column
+
+Revision ID: 7b3e1c9f5a26
+Revises: 8e1b6f0c52d3
+Create Date: 2026-10-18 13:02:47.518260
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '7b3e1c9f5a26'
+down_revision = '8e1b6f0c52d3'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+def is_postgresql():
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade():
+    if is_postgresql():
+        op.add_column('posts', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+        op.execute(
+            "UPDATE posts SET search_vector = "
+            "to_tsvector('english', posts.title || ' ' || urls.url) "
+            "FROM urls WHERE urls.id = posts.url_id"
+        )
+    else:
+        op.add_column('posts', sa.Column('search_vector', sa.Text(), nullable=True))
+
+        op.execute("CREATE VIRTUAL TABLE posts_search USING fts5(title, url)")
+        op.execute(
+            "INSERT INTO posts_search (rowid, title, url) "
+            "SELECT posts.id, posts.title, urls.url "
+            "FROM posts JOIN urls ON urls.id = posts.url_id"
+        )
+
+
+def downgrade():
+    if not is_postgresql():
+        op.execute("DROP TABLE posts_search")
+
+    with op.batch_alter_table("posts") as batch_op:
+        batch_op.drop_column("search_vector")
@@ -0,0 +1,42 @@
+"""Added the urls changed_at index
+
+Revision ID: 8c5f2a7d3e94
+Revises: 5b7e0d3c9a21
+Create Date: 2026-10-18 14:24:10.602391
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '8c5f2a7d3e94'
+down_revision = '5b7e0d3c9a21'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def is_postgresql():
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade():
+    if is_postgresql():
+        # CREATE INDEX CONCURRENTLY can't run inside a transaction block, so
+        # the transaction of this migration is committed. The migration
+        # contains only the index build and the next migration starts a new
+        # transaction
+        op.execute("COMMIT")
+
+        # an index that is left invalid by a failed concurrent build is built
+        # again when the migration is run again
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_urls__changed_at")
+
+    op.create_index(
+        "ix_urls__changed_at", "urls", ["changed_at"],
+        postgresql_concurrently=True
+    )
+
+
+def downgrade():
+    op.drop_index("ix_urls__changed_at", table_name="urls")
@@ -0,0 +1,36 @@
+"""Added the post count columns
+
+Revision ID: 8e1b6f0c52d3
+Revises: 3f9c2d7a41be
+Create Date: 2026-10-18 11:40:07.205318
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '8e1b6f0c52d3'
+down_revision = '3f9c2d7a41be'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.add_column('tags', sa.Column('post_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('categories', sa.Column('post_count', sa.Integer(), server_default='0', nullable=False))
+
+    op.execute(
+        "UPDATE tags SET post_count = "
+        "(SELECT count(*) FROM post_tags WHERE post_tags.tag_id = tags.id)"
+    )
+    op.execute(
+        "UPDATE categories SET post_count = "
+        "(SELECT count(*) FROM post_categories "
+        "WHERE post_categories.category_id = categories.id)"
+    )
+
+
+def downgrade():
+    op.drop_column('categories', 'post_count')
+    op.drop_column('tags', 'post_count')
@@ -0,0 +1,29 @@
+"""Added the import_checkpoints table
+
+Revision ID: 9d4b7c2e5f18
+Revises: e2f8a6b14c07
+Create Date: 2026-10-18 17:05:43.281906
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '9d4b7c2e5f18'
+down_revision = 'e2f8a6b14c07'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.create_table('import_checkpoints',
+    sa.Column('name', sa.String(length=256), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name', name='pk_import_checkpoints')
+    )
+
+
+def downgrade():
+    op.drop_table('import_checkpoints')
@@ -0,0 +1,44 @@
+"""Added the post search index
+
+Revision ID: c4d2a9e7f813
+Revises: 7b3e1c9f5a26
+Create Date: 2026-10-18 13:05:22.731904
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = 'c4d2a9e7f813'
+down_revision = '7b3e1c9f5a26'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def is_postgresql():
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade():
+    # the SQLite databases are searched using the posts_search table
+    if not is_postgresql():
+        return
+
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction block, so the
+    # transaction of this migration is committed. The migration contains
+    # only the index build and the next migration starts a new transaction
+    op.execute("COMMIT")
+
+    # an index that is left invalid by a failed concurrent build is built
+    # again when the migration is run again
+    op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_posts__search_vector")
+    op.create_index(
+        "ix_posts__search_vector", "posts", ["search_vector"],
+        postgresql_using="gin", postgresql_concurrently=True
+    )
+
+
+def downgrade():
+    if is_postgresql():
+        op.drop_index("ix_posts__search_vector", table_name="posts")
@@ -0,0 +1,26 @@
+"""Added the changed_at column to posts
+
+Revision ID: e2f8a6b14c07
+Revises: 8c5f2a7d3e94
+Create Date: 2026-10-18 15:41:09.602517
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = 'e2f8a6b14c07'
+down_revision = '8c5f2a7d3e94'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.add_column('posts', sa.Column('changed_at', sa.DateTime(), nullable=True))
+
+    op.execute("UPDATE posts SET changed_at = added_at")
+
+
+def downgrade():
+    op.drop_column('posts', 'changed_at')
@@ -0,0 +1,57 @@
+"""Compare the results of two runs of the benchmark suite
+
+The median times of the benchmarks that exist in both runs are printed
+together with the relative change. Changes larger than the threshold are
+marked.
+
+Usage: python benchmarks/compare.py BASELINE RESULTS [--threshold PERCENT]
+"""
+from argparse import ArgumentParser
+import json
+
+
+def load_results(path):
+    with open(path) as f:
+        report = json.load(f)
+
+    results = {
+        (result["kind"], result["name"], result["size"]): result
+        for result in report["results"]
+    }
+
+    return report, results
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("results")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="the change percentage that is marked")
+    args = parser.parse_args()
+
+    baseline_report, baseline = load_results(args.baseline)
+    report, results = load_results(args.results)
+
+    print("baseline: %s" % baseline_report["commit"])
+    print("results: %s" % report["commit"])
+    print("")
+
+    for key in sorted(set(baseline).intersection(results)):
+        kind, name, size = key
+        before = baseline[key]["median_ms"]
+        after = results[key]["median_ms"]
+        change = (after - before) / before * 100 if before else 0.0
+
+        marker = ""
+        if change >= args.threshold:
+            marker = "slower"
+        elif change <= -args.threshold:
+            marker = "faster"
+
+        print("%-6s %-45s %8d %10.3f ms %10.3f ms %+8.1f%% %s" % (
+            kind, name, size, before, after, change, marker))
+
+
+if __name__ == "__main__":
+    main()
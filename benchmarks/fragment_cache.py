@@ -0,0 +1,89 @@
+"""Measure the time it takes to render a page of posts with and without the
+post fragment cache
+
+Usage: python benchmarks/fragment_cache.py [--posts N] [--repeat N]
+"""
+from argparse import ArgumentParser
+from tempfile import NamedTemporaryFile
+from timeit import default_timer
+import os
+
+from flask import render_template
+
+from pagetags import db, fragment_cache
+from pagetags.main import create_app
+from pagetags.models import Post
+from pagetags.cache import TTLCache
+
+
+SETTINGS = """
+SECRET_KEY = "benchmark"
+SQLALCHEMY_DATABASE_URI = "sqlite://"
+SQLALCHEMY_TRACK_MODIFICATIONS = False
+"""
+
+
+def create_benchmark_app():
+    with NamedTemporaryFile("w", suffix=".py", delete=False) as f:
+        f.write(SETTINGS)
+
+    try:
+        return create_app(f.name, "production")
+    finally:
+        os.remove(f.name)
+
+
+def create_posts(count):
+    posts = [
+        {
+            "title": "post %d" % i,
+            "url": "http://www.example.com/page_%d" % i,
+            "tags": ["tag_%d" % (i % 50 + j) for j in range(5)],
+            "categories": ["category_%d" % (i % 10 + j) for j in range(2)]
+        }
+        for i in range(count)
+    ]
+
+    Post.create_many(db.session, posts)
+    db.session.commit()
+
+
+def measure(paginator, repeat):
+    started_at = default_timer()
+
+    for _ in range(repeat):
+        render_template("index.html", paginator=paginator)
+
+    return (default_timer() - started_at) / repeat
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    app = create_benchmark_app()
+
+    with app.app_context():
+        db.create_all()
+        create_posts(args.posts)
+
+        with app.test_request_context("/"):
+            paginator = Post.get_latest_by_page(page=1, per_page=args.posts)
+
+            fragment_cache.cache = TTLCache(max_size=0)
+            uncached = measure(paginator, args.repeat)
+
+            fragment_cache.cache = TTLCache(max_size=args.posts)
+            measure(paginator, 1)
+            cached = measure(paginator, args.repeat)
+
+    print("posts per page: %d" % args.posts)
+    print("without fragment cache: %.3f ms" % (uncached * 1000))
+    print("with fragment cache: %.3f ms" % (cached * 1000))
+    print("reduction: %.1f%%" % ((1 - cached / uncached) * 100))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Measure the time it takes to serialize a page of posts with flask-restful's
+marshal and with the compiled serializers
+
+Usage: python benchmarks/serializers.py [--posts N] [--repeat N]
+"""
+from argparse import ArgumentParser
+from datetime import datetime, timedelta
+from timeit import default_timer
+import json
+
+from flask_restful import marshal
+
+from pagetags.api.models import TagPosts
+from pagetags.api.serializers import compile_serializer
+
+
+def create_page(count):
+    added_at = datetime(2016, 10, 1)
+
+    return {
+        "tag_id": 1,
+        "posts": [
+            {
+                "id": i,
+                "title": u"post %d" % i,
+                "url": "http://www.example.com/page_%d" % i,
+                "tags": ["tag_%d" % (i % 50 + j) for j in range(5)],
+                "added_at": added_at + timedelta(minutes=i)
+            }
+            for i in range(count)
+        ],
+        "has_more": True,
+        "page": 1,
+        "per_page": count,
+        "next_cursor": "cursor"
+    }
+
+
+def measure(serialize, page, repeat):
+    started_at = default_timer()
+
+    for _ in range(repeat):
+        serialize(page)
+
+    return (default_timer() - started_at) / repeat
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    page = create_page(args.posts)
+    resource_fields = TagPosts.resource_fields
+    serializer = compile_serializer(resource_fields)
+
+    def marshal_page(page):
+        return json.dumps(marshal(page, resource_fields))
+
+    if serializer(page) != marshal_page(page):
+        raise RuntimeError("the serializers created different JSON texts")
+
+    marshalled = measure(marshal_page, page, args.repeat)
+    compiled = measure(serializer, page, args.repeat)
+
+    print("posts per page: %d" % args.posts)
+    print("marshal: %.3f ms" % (marshalled * 1000))
+    print("compiled serializer: %.3f ms" % (compiled * 1000))
+    print("reduction: %.1f%%" % ((1 - compiled / marshalled) * 100))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Measure the time it takes to import and create the application with
+different component selections
+
+Every measurement is executed in a new Python process, so that the modules
+that are required by every selection are imported from scratch.
+
+Usage: python benchmarks/startup.py [--repeat N]
+                                    [--profiles all,api,views,views+admin]
+                                    [--api_spec]
+"""
+from argparse import ArgumentParser
+from tempfile import NamedTemporaryFile
+import json
+import os
+import subprocess
+import sys
+
+from pagetags.api.spec import build_spec, write_spec
+
+
+SETTINGS = """
+SECRET_KEY = "benchmark"
+SQLALCHEMY_DATABASE_URI = "sqlite://"
+SQLALCHEMY_TRACK_MODIFICATIONS = False
+API_SPEC_FILE = {api_spec_file!r}
+"""
+
+# the script that is executed by every process. It prints the import and
+# the application creation times in milliseconds and the number of imported
+# modules
+MEASUREMENT = """
+from timeit import default_timer
+import json
+import sys
+
+started_at = default_timer()
+
+from pagetags.main import create_app
+
+imported_at = default_timer()
+
+components = sys.argv[2].split("+") if sys.argv[2] != "all" else None
+create_app(sys.argv[1], "production", components=components)
+
+created_at = default_timer()
+
+print(json.dumps({
+    "import_ms": (imported_at - started_at) * 1000,
+    "create_app_ms": (created_at - imported_at) * 1000,
+    "modules": len(sys.modules)
+}))
+"""
+
+
+def measure(settings_file, profile):
+    output = subprocess.check_output(
+        [sys.executable, "-c", MEASUREMENT, settings_file, profile],
+        stderr=open(os.devnull, "w")
+    )
+
+    return json.loads(output.decode("utf-8").strip().splitlines()[-1])
+
+
+def median(values):
+    values = sorted(values)
+
+    return values[len(values) // 2]
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--profiles", default="all,api,views,views+admin",
+                        help="the comma separated component selections. "
+                             "The components of a selection are separated "
+                             "by +")
+    parser.add_argument("--api_spec", action="store_true", default=False,
+                        help="serve the precomputed API specification")
+    args = parser.parse_args()
+
+    api_spec_file = None
+    if args.api_spec:
+        with NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            write_spec(build_spec(), f)
+
+        api_spec_file = f.name
+
+    with NamedTemporaryFile("w", suffix=".py", delete=False) as f:
+        f.write(SETTINGS.format(api_spec_file=api_spec_file))
+
+    try:
+        print("%-15s %10s %14s %10s %8s" % (
+            "profile", "import ms", "create_app ms", "total ms", "modules"))
+
+        for profile in args.profiles.split(","):
+            results = [measure(f.name, profile) for _ in range(args.repeat)]
+
+            import_ms = median([result["import_ms"] for result in results])
+            create_app_ms = median(
+                [result["create_app_ms"] for result in results])
+            total_ms = median(
+                [result["import_ms"] + result["create_app_ms"]
+                 for result in results])
+
+            print("%-15s %10.1f %14.1f %10.1f %8d" % (
+                profile, import_ms, create_app_ms, total_ms,
+                results[-1]["modules"]))
+    finally:
+        os.remove(f.name)
+
+        if api_spec_file is not None:
+            os.remove(api_spec_file)
+
+
+if __name__ == "__main__":
+    main()
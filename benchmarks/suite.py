@@ -0,0 +1,398 @@
+"""Measure the response time of the API resources, the HTML views and the
+model query methods at several dataset sizes
+
+A synthetic dataset is generated for every size. The results are written as
+JSON, so that the results of different commits can be compared using
+benchmarks/compare.py.
+
+Usage: python benchmarks/suite.py [--sizes 1000,10000] [--repeat N]
+                                  [--output results.json] [--database URI]
+                                  [--cache]
+"""
+from argparse import ArgumentParser
+from datetime import datetime
+from itertools import islice
+from tempfile import NamedTemporaryFile, mkdtemp
+from timeit import default_timer
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+
+from pagetags import db
+from pagetags.main import create_app
+from pagetags.models import User, Post, Tag, Category, Url
+from pagetags.authentication import create_token
+from pagetags.dataset import generate_posts
+from pagetags.importer import import_posts
+from pagetags.pagination import Cursor
+
+
+SETTINGS = """
+SECRET_KEY = "benchmark"
+SQLALCHEMY_DATABASE_URI = {database!r}
+SQLALCHEMY_TRACK_MODIFICATIONS = False
+RESPONSE_CACHE_BACKEND = {cache_backend!r}
+FRAGMENT_CACHE_SIZE = {fragment_cache_size!r}
+"""
+
+USERNAME = "benchmark"
+PASSWORD = "benchmark"
+
+
+def create_benchmark_app(database, cache):
+    settings = SETTINGS.format(
+        database=database,
+        cache_backend="local" if cache else None,
+        fragment_cache_size=10000 if cache else 0
+    )
+
+    with NamedTemporaryFile("w", suffix=".py", delete=False) as f:
+        f.write(settings)
+
+    try:
+        return create_app(f.name, "production")
+    finally:
+        os.remove(f.name)
+
+
+def current_commit():
+    try:
+        output = subprocess.check_output(
+            ["git", "rev-parse", "HEAD"],
+            stderr=open(os.devnull, "w")
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return output.decode("ascii").strip()
+
+
+def seed(app, size):
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+
+        User.create(db.session, USERNAME, PASSWORD)
+        db.session.commit()
+
+        posts = generate_posts(
+            size,
+            tag_count=max(size // 20, 10),
+            category_count=min(max(size // 100, 10), 200)
+        )
+
+        import_posts(
+            db.session, posts, "benchmark", batch_size=10000, restart=True)
+
+
+def sample_parameters(session):
+    """Select the tags, categories, urls and posts that are used by the
+    benchmarks"""
+    tags = session.query(Tag.name)\
+                  .order_by(Tag.post_count.desc(), Tag.id)\
+                  .limit(2)\
+                  .all()
+
+    rare_tag = session.query(Tag.name)\
+                      .filter(Tag.post_count > 0)\
+                      .order_by(Tag.post_count, Tag.id)\
+                      .first()
+
+    category = session.query(Category.name)\
+                      .order_by(Category.post_count.desc(), Category.id)\
+                      .first()
+
+    latest_posts = Post.get_latest_after(session, per_page=10)
+
+    post = session.query(Post).order_by(Post.id.desc()).first()
+
+    return {
+        "tag": tags[0].name,
+        "second_tag": tags[1].name,
+        "rare_tag": rare_tag.name,
+        "category": category.name,
+        "url": post.url.url,
+        "post_id": post.id,
+        "cursor": Cursor.from_post(latest_posts.items[-1]),
+        "search": "python flask",
+        # the middle page of the post listings that have 10 posts per page
+        "page": max(session.query(Post).count() // 20, 1)
+    }
+
+
+def api_cases(parameters):
+    p = parameters
+    cursor = p["cursor"].encode()
+
+    return [
+        ("GET /api/v1/posts", "get", "/api/v1/posts", None),
+        ("GET /api/v1/posts?after", "get",
+         "/api/v1/posts?after=%s" % cursor, None),
+        ("GET /api/v1/posts?page=<middle>", "get",
+         "/api/v1/posts?page=%d" % p["page"], None),
+        ("GET /api/v1/tags", "get", "/api/v1/tags", None),
+        ("GET /api/v1/tag/<popular>", "get",
+         "/api/v1/tag/%s" % p["tag"], None),
+        ("GET /api/v1/tag/<rare>", "get",
+         "/api/v1/tag/%s" % p["rare_tag"], None),
+        ("GET /api/v1/tags/posts?mode=all", "get",
+         "/api/v1/tags/posts?tags=%s,%s&mode=all" % (
+             p["tag"], p["second_tag"]), None),
+        ("GET /api/v1/tags/posts?mode=any", "get",
+         "/api/v1/tags/posts?tags=%s,%s&mode=any" % (
+             p["tag"], p["second_tag"]), None),
+        ("GET /api/v1/categories", "get", "/api/v1/categories", None),
+        ("GET /api/v1/category/<popular>", "get",
+         "/api/v1/category/%s" % p["category"], None),
+        ("GET /api/v1/url", "get", "/api/v1/url?url=%s" % p["url"], None),
+        ("GET /api/v1/post/<id>", "get",
+         "/api/v1/post/%d" % p["post_id"], None),
+        ("GET /api/v1/search", "get",
+         "/api/v1/search?q=%s" % p["search"], None),
+        ("GET /api/v1/posts/export?tag=<rare>", "get",
+         "/api/v1/posts/export?tag=%s" % p["rare_tag"], None)
+    ]
+
+
+def api_write_cases(parameters):
+    """Create the API cases that change the dataset. They are measured after
+    all the other cases, so that they don't change the dataset of the read
+    cases"""
+    p = parameters
+
+    new_post = {
+        "title": "benchmark post",
+        "url": "http://www.example.com/benchmark",
+        "tags": [p["tag"], "benchmark"],
+        "categories": [p["category"]]
+    }
+
+    return [
+        ("POST /api/v1/posts", "post", "/api/v1/posts", new_post),
+        ("POST /api/v1/posts/bulk", "post", "/api/v1/posts/bulk",
+         {"posts": [new_post] * 100}),
+        ("PUT /api/v1/post/<id>", "put",
+         "/api/v1/post/%d" % p["post_id"], new_post)
+    ]
+
+
+def view_cases(parameters):
+    p = parameters
+
+    return [
+        ("/", "/"),
+        ("/?page=<middle>", "/?page=%d" % p["page"]),
+        ("/tag/<popular>", "/tag/%s" % p["tag"]),
+        ("/tag/<rare>", "/tag/%s" % p["rare_tag"]),
+        ("/categories", "/categories"),
+        ("/category/<popular>", "/category/%s" % p["category"]),
+        ("/login", "/login")
+    ]
+
+
+def model_cases(parameters):
+    p = parameters
+    session = db.session
+
+    def tag():
+        return Tag.get_by_name(session, p["tag"])
+
+    def category():
+        return Category.get_by_name(session, p["category"])
+
+    def url():
+        return Url.get_by_url(session, p["url"])
+
+    return [
+        ("Post.get_latest_by_page",
+         lambda: Post.get_latest_by_page(page=1)),
+        ("Post.get_latest_by_page(page=<middle>)",
+         lambda: Post.get_latest_by_page(page=p["page"])),
+        ("Post.get_latest_after",
+         lambda: Post.get_latest_after(session, after=p["cursor"])),
+        ("Post.get_by_tags_after(match_all)",
+         lambda: Post.get_by_tags_after(
+             session, [p["tag"], p["second_tag"]], match_all=True)),
+        ("Post.get_by_tags_after(match_any)",
+         lambda: Post.get_by_tags_after(
+             session, [p["tag"], p["second_tag"]], match_all=False)),
+        ("Post.search", lambda: Post.search(session, p["search"])),
+        ("Post.get_by_id", lambda: Post.get_by_id(session, p["post_id"])),
+        ("Post.export(1000)",
+         lambda: list(islice(Post.export(session), 1000))),
+        ("Tag.get_tags_by_page", lambda: Tag.get_tags_by_page(page=1)),
+        ("Tag.get_posts_by_page", lambda: tag().get_posts_by_page(1)),
+        ("Tag.get_posts_after", lambda: tag().get_posts_after(session)),
+        ("Tag.count_posts", lambda: tag().count_posts(session)),
+        ("Tag.get_changed_at",
+         lambda: Tag.get_changed_at(session, p["tag"])),
+        ("Category.get_by_page", lambda: Category.get_by_page(1)),
+        ("Category.all", lambda: Category.all(session)),
+        ("Category.get_posts_by_page",
+         lambda: category().get_posts_by_page(1)),
+        ("Category.get_posts_after",
+         lambda: category().get_posts_after(session)),
+        ("Url.get_posts", lambda: Url.get_posts(session, p["url"])),
+        ("Url.get_posts_after", lambda: url().get_posts_after(session)),
+        ("Url.get_last_changed_at",
+         lambda: Url.get_last_changed_at(session))
+    ]
+
+
+def measure(f, repeat):
+    """Call a function repeatedly after a warm up call
+
+    :returns: the durations of the calls in milliseconds and the result of
+        the last call
+    """
+    result = f()
+
+    durations = []
+    for _ in range(repeat):
+        started_at = default_timer()
+        result = f()
+        durations.append((default_timer() - started_at) * 1000)
+
+    return durations, result
+
+
+def statistics(durations):
+    durations = sorted(durations)
+    count = len(durations)
+
+    return {
+        "min_ms": durations[0],
+        "median_ms": durations[count // 2],
+        "mean_ms": sum(durations) / count,
+        "p95_ms": durations[min(int(count * 0.95), count - 1)]
+    }
+
+
+def run_benchmarks(app, size, repeat):
+    results = []
+
+    def add_result(kind, name, durations, status=None):
+        result = {"kind": kind, "name": name, "size": size}
+        result.update(statistics(durations))
+        result["status"] = status
+        results.append(result)
+
+        sys.stderr.write(
+            "%d %s %s: %.3f ms\n" % (size, kind, name, result["median_ms"]))
+
+    with app.app_context():
+        parameters = sample_parameters(db.session)
+        user = User.get_by_username(db.session, USERNAME)
+        token = create_token(
+            user.id,
+            user.jti,
+            app.config["JWT_SECRET_KEY"],
+            app.config["JWT_ALGORITHM"]
+        )
+        db.session.remove()
+
+    client = app.test_client()
+    headers = {"Authorization": "JWT %s" % token}
+
+    def measure_api_cases(cases):
+        for name, method, url, data in cases:
+            def send_request():
+                kwargs = {"headers": headers}
+                if data is not None:
+                    kwargs["data"] = json.dumps(data)
+                    kwargs["content_type"] = "application/json"
+
+                response = getattr(client, method)(url, **kwargs)
+                # consume the streamed responses
+                response.get_data()
+
+                return response.status_code
+
+            durations, status = measure(send_request, repeat)
+            add_result("api", name, durations, status)
+
+    measure_api_cases(api_cases(parameters))
+
+    for name, url in view_cases(parameters):
+        durations, status = measure(
+            lambda: client.get(url).status_code, repeat)
+        add_result("view", name, durations, status)
+
+    with app.app_context():
+        for name, f in model_cases(parameters):
+            def call():
+                try:
+                    return f()
+                finally:
+                    db.session.remove()
+
+            durations, _ = measure(call, repeat)
+            add_result("model", name, durations)
+
+    measure_api_cases(api_write_cases(parameters))
+
+    return results
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="the comma separated numbers of posts")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="the results file. Defaults to "
+                                         "stdout")
+    parser.add_argument("--database",
+                        help="the database URI. Defaults to a temporary "
+                             "SQLite database. The database is erased")
+    parser.add_argument("--cache", action="store_true", default=False,
+                        help="enable the response, page and fragment caches")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    temporary_folder = None
+    database = args.database
+    if database is None:
+        temporary_folder = mkdtemp()
+        database = "sqlite:///%s" % os.path.join(
+            temporary_folder, "benchmark.db")
+
+    app = create_benchmark_app(database, args.cache)
+
+    results = []
+    try:
+        for size in sizes:
+            seed(app, size)
+            results.extend(run_benchmarks(app, size, args.repeat))
+    finally:
+        if temporary_folder is not None:
+            shutil.rmtree(temporary_folder)
+
+    with app.app_context():
+        dialect_name = db.get_engine(app).dialect.name
+
+    report = {
+        "commit": current_commit(),
+        "created_at": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "database": dialect_name,
+        "cache": args.cache,
+        "repeat": args.repeat,
+        "results": results
+    }
+
+    output = json.dumps(
+        report, indent=2, separators=(",", ": "), sort_keys=True)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
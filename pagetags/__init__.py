@@ -2,9 +2,17 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from flask_jwt import JWT
 
+from pagetags.cache import ResponseCache, PageCache, FragmentCache
+
 
 db = SQLAlchemy()
 
 login_manager = LoginManager()
 
 jwt = JWT()
+
+response_cache = ResponseCache()
+
+page_cache = PageCache()
+
+fragment_cache = FragmentCache()
@@ -24,7 +24,35 @@ class TagPosts(object):
         "posts": fields.List(fields.Nested(Post.resource_fields)),
         "has_more": fields.Boolean,
         "page": fields.Integer,
-        "per_page": fields.Integer
+        "per_page": fields.Integer,
+        "next_cursor": fields.String
+    }
+
+
+@swagger.model
+@swagger.nested(posts=Post.__name__)
+class TagsPosts(object):
+    required = ["tags", "mode", "posts", "has_more", "per_page"]
+    resource_fields = {
+        "tags": fields.List(fields.String),
+        "mode": fields.String,
+        "posts": fields.List(fields.Nested(Post.resource_fields)),
+        "has_more": fields.Boolean,
+        "per_page": fields.Integer,
+        "next_cursor": fields.String
+    }
+
+
+@swagger.model
+@swagger.nested(posts=Post.__name__)
+class SearchResults(object):
+    required = ["q", "posts", "has_more", "per_page"]
+    resource_fields = {
+        "q": fields.String,
+        "posts": fields.List(fields.Nested(Post.resource_fields)),
+        "has_more": fields.Boolean,
+        "per_page": fields.Integer,
+        "next_cursor": fields.String
     }
 
 
@@ -47,6 +75,54 @@ class CreatedPost(object):
     }
 
 
+@swagger.model
+class QueuedPost(object):
+    required = ["receipt", "status"]
+    resource_fields = {
+        "receipt": fields.String,
+        "status": fields.String
+    }
+
+
+@swagger.model
+class PostReceipt(object):
+    required = ["receipt", "status"]
+    resource_fields = {
+        "receipt": fields.String,
+        "status": fields.String,
+        "post_id": fields.Integer(default=None),
+        "error": fields.String
+    }
+
+
+@swagger.model
+@swagger.nested(posts=NewPost.__name__)
+class NewPosts(object):
+    required = ["posts"]
+    resource_fields = {
+        "posts": fields.List(fields.Nested(NewPost.resource_fields))
+    }
+
+
+@swagger.model
+class BulkCreatedPost(object):
+    required = []
+    resource_fields = {
+        "id": fields.Integer(default=None),
+        "error": fields.String,
+        "error_code": fields.Integer(default=None)
+    }
+
+
+@swagger.model
+@swagger.nested(posts=BulkCreatedPost.__name__)
+class BulkCreatedPosts(object):
+    required = ["posts"]
+    resource_fields = {
+        "posts": fields.List(fields.Nested(BulkCreatedPost.resource_fields))
+    }
+
+
 @swagger.model
 @swagger.nested(posts=Post.__name__)
 class Posts(object):
@@ -55,7 +131,8 @@ class Posts(object):
         "posts": fields.List(fields.Nested(Post.resource_fields)),
         "has_more": fields.Boolean,
         "page": fields.Integer,
-        "per_page": fields.Integer
+        "per_page": fields.Integer,
+        "next_cursor": fields.String
     }
 
 
@@ -68,7 +145,8 @@ class URLPosts(object):
         "posts": fields.List(fields.Nested(Post.resource_fields)),
         "has_more": fields.Boolean,
         "page": fields.Integer,
-        "per_page": fields.Integer
+        "per_page": fields.Integer,
+        "next_cursor": fields.String
     }
 
 
@@ -97,9 +175,10 @@ class UpdatedPost(object):
 
 @swagger.model
 class Tags(object):
-    required = ["tags"]
+    required = ["tags", "post_counts"]
     resource_fields = {
-        "tags": fields.List(fields.String)
+        "tags": fields.List(fields.String),
+        "post_counts": fields.Raw
     }
 
 
@@ -116,13 +195,15 @@ class CategoryPosts(object):
         "posts": fields.List(fields.Nested(Post.resource_fields)),
         "has_more": fields.Boolean,
         "page": fields.Integer,
-        "per_page": fields.Integer
+        "per_page": fields.Integer,
+        "next_cursor": fields.String
     }
 
 
 @swagger.model
 class Categories(object):
-    required = ["categories"]
+    required = ["categories", "post_counts"]
     resource_fields = {
-        "categories": fields.List(fields.String)
+        "categories": fields.List(fields.String),
+        "post_counts": fields.Raw
     }
@@ -1,11 +1,14 @@
-from flask_restful import Resource, abort, fields, marshal_with
+from flask_restful import Resource, abort, fields
 from flask_restful_swagger import swagger
 from flask_jwt import jwt_required
 
-from pagetags.models import Category
+from pagetags.models import Category, db
 from pagetags import error_codes
-from pagetags import reqparsers
+from pagetags import reqparsers, response_cache
 from pagetags.api.models import CategoryPosts, Categories
+from pagetags.api.serializers import serialize_with
+from pagetags.pagination import next_cursor
+from pagetags.conditional import conditional
 
 
 class CategoryPostsResource(Resource):
@@ -20,6 +23,14 @@ class CategoryPostsResource(Resource):
                 "allowMultiple": False,
                 "dataType": fields.String.__name__,
                 "paramType": "path"
+            },
+            {
+                "name": "after",
+                "description": "The cursor of the last retrieved post",
+                "required": False,
+                "allowMultiple": False,
+                "dataType": fields.String.__name__,
+                "paramType": "query"
             }
         ],
         responseClass=CategoryPosts.__name__,
@@ -34,10 +45,14 @@ class CategoryPostsResource(Resource):
             }
         ]
     )
-    @marshal_with(CategoryPosts.resource_fields)
     @jwt_required()
+    @conditional(
+        lambda category: Category.get_changed_at(db.session, category))
+    @response_cache.cached(
+        "category_posts", lambda category: [u"category:%s" % category])
+    @serialize_with(CategoryPosts.resource_fields)
     def get(self, category):
-        category_object = Category.get_by_name(category)
+        category_object = Category.get_by_name(db.session, category)
 
         if category_object is None:
             return abort(
@@ -49,7 +64,12 @@ class CategoryPostsResource(Resource):
 
         args = reqparsers.categories_posts.parse_args()
 
-        paginator = category_object.get_posts_by_page(args.page, args.per_page)
+        if args.after is None:
+            paginator = category_object.get_posts_by_page(
+                args.page, args.per_page)
+        else:
+            paginator = category_object.get_posts_after(
+                db.session, args.after, args.per_page)
 
         posts = [
             {
@@ -69,7 +89,8 @@ class CategoryPostsResource(Resource):
             "posts": posts,
             "has_more": paginator.has_next,
             "page": args.page,
-            "per_page": args.per_page
+            "per_page": args.per_page,
+            "next_cursor": next_cursor(paginator)
         }
 
 
@@ -85,13 +106,18 @@ class CategoriesResource(Resource):
             }
         ]
     )
-    @marshal_with(Categories.resource_fields)
     @jwt_required()
+    @response_cache.cached("categories", lambda: ["categories"])
+    @serialize_with(Categories.resource_fields)
     def get(self):
         args = reqparsers.categories.parse_args()
 
         paginator = Category.get_by_page(args.page, args.per_page)
 
         return {
-            "categories": [category.name for category in paginator.items]
+            "categories": [category.name for category in paginator.items],
+            "post_counts": {
+                category.name: category.post_count
+                for category in paginator.items
+            }
         }
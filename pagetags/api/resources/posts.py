@@ -1,14 +1,25 @@
+from argparse import ArgumentTypeError
+
 from flask_restful import Resource, abort
 from flask_jwt import jwt_required
 from sqlalchemy.exc import SQLAlchemyError
-from flask import current_app
+from flask import current_app, Response, stream_with_context
 from flask_restful_swagger import swagger
-from flask_restful import fields, marshal_with
+from flask_restful import fields
 
-from pagetags import models, db, reqparsers, error_codes
+from pagetags import (
+    models, db, reqparsers, error_codes, argtypes, response_cache
+)
+from pagetags.pagination import next_cursor
+from pagetags.ndjson import to_ndjson, NDJSON_MIMETYPE
+from pagetags.conditional import conditional
+from pagetags.post_queue import post_queue
+from pagetags.metrics import metrics
 from pagetags.api.models import (
-    NewPost, CreatedPost, Posts, Post, UpdatePost, UpdatedPost
+    NewPost, CreatedPost, Posts, Post, UpdatePost, UpdatedPost, NewPosts,
+    BulkCreatedPosts, QueuedPost, PostReceipt
 )
+from pagetags.api.serializers import serialize, serialize_with
 
 
 class PostsResource(Resource):
@@ -16,7 +27,8 @@ class PostsResource(Resource):
 
     @swagger.operation(
         nickname='create_post',
-        notes='Create a post',
+        notes='Create a post. The post is added to the post queue if the '
+              'queue is enabled',
         responseClass=CreatedPost.__name__,
         parameters=[
             {
@@ -32,22 +44,31 @@ class PostsResource(Resource):
             {
                 "code": 200,
                 "message": "created the new post"
+            },
+            {
+                "code": 202,
+                "message": "added the post to the post queue"
+            },
+            {
+                "code": 400,
+                "message": "invalid post"
             }
         ]
     )
-    @marshal_with(CreatedPost.resource_fields)
     @jwt_required()
     def post(self):
         args = reqparsers.post.parse_args()
 
+        if post_queue.enabled:
+            return self._enqueue(args)
+
         msg = "adding post: title(%s) url(%s) tags(%s)"
         current_app.logger.info(msg, args.title, args.url, ",".join(args.tags))
 
-        # TODo: set the post categories
-        post = models.Post.create(
-            db.session, args.title, args.url, args.tags, args.categories)
-
         try:
+            post = models.Post.create(
+                db.session, args.title, args.url, args.tags, args.categories)
+
             db.session.commit()
         except SQLAlchemyError:
             db.session.rollback()
@@ -65,7 +86,46 @@ class PostsResource(Resource):
                 error_code=error_codes.POST_CREATION_DATABASE_ERROR
             )
 
-        return {"id": post.id}
+        metrics.count_posts("api")
+
+        return serialize({"id": post.id}, CreatedPost.resource_fields)
+
+    def _enqueue(self, args):
+        try:
+            post = argtypes.new_post(args)
+        except ArgumentTypeError as e:
+            msg = "invalid post: title(%s) url(%s) error(%s)"
+            current_app.logger.warning(msg, args.title, args.url, e)
+
+            abort(400, error=str(e), error_code=error_codes.INVALID_POST)
+
+        msg = "queueing post: title(%s) url(%s) tags(%s)"
+        current_app.logger.info(
+            msg, post["title"], post["url"], ",".join(post["tags"]))
+
+        try:
+            queued_post = post_queue.enqueue(db.session, post)
+
+            db.session.commit()
+        except SQLAlchemyError:
+            db.session.rollback()
+
+            msg = "failed to queue post: title(%s) url(%s)"
+            current_app.logger.exception(msg, post["title"], post["url"])
+
+            abort(
+                500,
+                error="failed to queue post",
+                url=post["url"],
+                title=post["title"],
+                error_code=error_codes.POST_QUEUE_DATABASE_ERROR
+            )
+
+        metrics.count_posts("queue")
+
+        result = {"receipt": queued_post.receipt, "status": queued_post.status}
+
+        return serialize(result, QueuedPost.resource_fields), 202
 
     @swagger.operation(
         nickname='posts',
@@ -87,6 +147,14 @@ class PostsResource(Resource):
                 "allowMultiple": False,
                 "dataType": fields.Integer.__name__,
                 "paramType": "query"
+            },
+            {
+                "name": "after",
+                "description": "The cursor of the last retrieved post",
+                "required": False,
+                "allowMultiple": False,
+                "dataType": fields.String.__name__,
+                "paramType": "query"
             }
         ],
         responseMessages=[
@@ -97,14 +165,22 @@ class PostsResource(Resource):
         ]
     )
     @jwt_required()
+    @conditional(lambda: models.Url.get_last_changed_at(db.session))
     def get(self):
         args = reqparsers.posts.parse_args()
 
-        msg = "retrieving posts: page(%d) per_page(%d)"
-        current_app.logger.info(msg, args.page, args.per_page)
+        if args.after is None:
+            msg = "retrieving posts: page(%d) per_page(%d)"
+            current_app.logger.info(msg, args.page, args.per_page)
 
-        paginator = models.Post.get_latest_by_page(
-            args.page, per_page=args.per_page)
+            paginator = models.Post.get_latest_by_page(
+                args.page, per_page=args.per_page)
+        else:
+            msg = "retrieving posts: after(%s) per_page(%d)"
+            current_app.logger.info(msg, args.after, args.per_page)
+
+            paginator = models.Post.get_latest_after(
+                db.session, args.after, per_page=args.per_page)
 
         posts = [
             {
@@ -121,7 +197,227 @@ class PostsResource(Resource):
             "posts": posts,
             "has_more": paginator.has_next,
             "page": args.page,
-            "per_page": args.per_page
+            "per_page": args.per_page,
+            "next_cursor": next_cursor(paginator)
+        }
+
+
+class BulkPostsResource(Resource):
+    """Bulk post creation"""
+
+    @swagger.operation(
+        nickname='create_posts',
+        notes='Create many posts at once',
+        responseClass=BulkCreatedPosts.__name__,
+        parameters=[
+            {
+                "name": "body",
+                "description": "The new posts",
+                "required": True,
+                "allowMultiple": False,
+                "dataType": NewPosts.__name__,
+                "paramType": "body"
+            }
+        ],
+        responseMessages=[
+            {
+                "code": 200,
+                "message": "created the valid posts"
+            },
+            {
+                "code": 400,
+                "message": "too many posts in the request"
+            }
+        ]
+    )
+    @serialize_with(BulkCreatedPosts.resource_fields)
+    @jwt_required()
+    def post(self):
+        args = reqparsers.bulk_posts.parse_args()
+
+        max_count = current_app.config["BULK_POSTS_MAX_COUNT"]
+        if len(args.posts) > max_count:
+            msg = "too many posts in bulk request: count(%d) max_count(%d)"
+            current_app.logger.warning(msg, len(args.posts), max_count)
+
+            abort(
+                400,
+                error="too many posts",
+                max_count=max_count,
+                error_code=error_codes.BULK_POST_LIMIT_EXCEEDED
+            )
+
+        results = []
+        valid_posts = []
+        for item in args.posts:
+            try:
+                post = argtypes.new_post(item)
+            except ArgumentTypeError as e:
+                results.append({
+                    "error": str(e),
+                    "error_code": error_codes.INVALID_POST
+                })
+            else:
+                results.append(None)
+                valid_posts.append(post)
+
+        msg = "adding posts in bulk: count(%d) invalid(%d)"
+        current_app.logger.info(
+            msg, len(valid_posts), len(results) - len(valid_posts))
+
+        try:
+            posts = models.Post.create_many(db.session, valid_posts)
+
+            db.session.commit()
+        except SQLAlchemyError:
+            db.session.rollback()
+
+            msg = "failed to add posts in bulk: count(%d)"
+            current_app.logger.exception(msg, len(valid_posts))
+
+            abort(
+                500,
+                error="failed to add posts",
+                error_code=error_codes.BULK_POST_CREATION_DATABASE_ERROR
+            )
+
+        metrics.count_posts("bulk", len(posts))
+
+        created_posts = iter(posts)
+
+        return {
+            "posts": [
+                result or {"id": next(created_posts).id}
+                for result in results
+            ]
+        }
+
+
+class ExportPostsResource(Resource):
+    """Post export"""
+
+    @swagger.operation(
+        nickname='export_posts',
+        notes='Export the posts as newline delimited JSON ordered by id',
+        parameters=[
+            {
+                "name": "tag",
+                "description": "export the posts that have this tag",
+                "required": False,
+                "allowMultiple": False,
+                "dataType": "string",
+                "paramType": "query"
+            },
+            {
+                "name": "category",
+                "description": "export the posts that have this category",
+                "required": False,
+                "allowMultiple": False,
+                "dataType": "string",
+                "paramType": "query"
+            },
+            {
+                "name": "added_after",
+                "description": "export the posts that were added at or after "
+                               "this time",
+                "required": False,
+                "allowMultiple": False,
+                "dataType": "string",
+                "paramType": "query"
+            },
+            {
+                "name": "added_before",
+                "description": "export the posts that were added before this "
+                               "time",
+                "required": False,
+                "allowMultiple": False,
+                "dataType": "string",
+                "paramType": "query"
+            }
+        ],
+        responseMessages=[
+            {
+                "code": 200,
+                "message": "the exported posts"
+            }
+        ]
+    )
+    @jwt_required()
+    def get(self):
+        args = reqparsers.export_posts.parse_args()
+
+        msg = "exporting posts: tag(%s) category(%s) added_after(%s) " \
+              "added_before(%s)"
+        current_app.logger.info(
+            msg, args.tag, args.category, args.added_after, args.added_before)
+
+        posts = models.Post.export(
+            db.session,
+            tag=args.tag,
+            category=args.category,
+            added_after=args.added_after,
+            added_before=args.added_before,
+            batch_size=current_app.config["EXPORT_BATCH_SIZE"]
+        )
+
+        return Response(
+            stream_with_context(to_ndjson(posts)), mimetype=NDJSON_MIMETYPE)
+
+
+class PostReceiptResource(Resource):
+    """The status of a queued post"""
+
+    @swagger.operation(
+        nickname='get_post_receipt',
+        notes='Get the status of a post that was added to the post queue',
+        responseClass=PostReceipt.__name__,
+        parameters=[
+            {
+                "name": "receipt",
+                "description": "the receipt of the queued post",
+                "required": True,
+                "allowMultiple": False,
+                "dataType": "string",
+                "paramType": "path"
+            }
+        ],
+        responseMessages=[
+            {
+                "code": 200,
+                "message": "Retrieved the status of the queued post"
+            },
+            {
+                "code": 404,
+                "message": "The receipt doesn't exist"
+            }
+        ]
+    )
+    @jwt_required()
+    @serialize_with(PostReceipt.resource_fields)
+    def get(self, receipt):
+        msg = "retrieving post receipt: receipt(%s)"
+        current_app.logger.info(msg, receipt)
+
+        queued_post = None
+        if post_queue.enabled:
+            queued_post = post_queue.get_by_receipt(db.session, receipt)
+
+        if queued_post is None:
+            msg = "post receipt doesn't exist: receipt(%s)"
+            current_app.logger.warning(msg, receipt)
+
+            abort(
+                404,
+                error="receipt doesn't exist",
+                receipt=receipt,
+                error_code=error_codes.RECEIPT_DOES_NOT_EXIST
+            )
+
+        return {
+            "receipt": queued_post.receipt,
+            "status": queued_post.status,
+            "post_id": queued_post.post_id,
+            "error": queued_post.error
         }
 
 
@@ -153,8 +449,9 @@ class PostResource(Resource):
             }
         ]
     )
-    @marshal_with(Post.resource_fields)
     @jwt_required()
+    @response_cache.cached("post", lambda post_id: ["post:%d" % post_id])
+    @serialize_with(Post.resource_fields)
     def get(self, post_id):
         current_app.logger.info("retrieving post: post_id(%d)", post_id)
 
@@ -206,7 +503,7 @@ class PostResource(Resource):
             }
         ]
     )
-    @marshal_with(UpdatedPost.resource_fields)
+    @serialize_with(UpdatedPost.resource_fields)
     @jwt_required()
     def put(self, post_id):
         args = reqparsers.update_post.parse_args()
@@ -228,9 +525,9 @@ class PostResource(Resource):
                 error_code=error_codes.POST_DOES_NOT_EXIST
             )
 
-        post.update(db.session, args.title, args.url, args.tags)
-
         try:
+            post.update(db.session, args.title, args.url, args.tags)
+
             db.session.commit()
         except SQLAlchemyError:
             db.session.rollback()
@@ -0,0 +1,82 @@
+from flask_restful import Resource
+from flask_jwt import jwt_required
+from flask import current_app
+from flask_restful_swagger import swagger
+from flask_restful import fields
+
+from pagetags import models, db, reqparsers
+from pagetags.api.models import SearchResults
+from pagetags.api.serializers import serialize_with
+
+
+class SearchResource(Resource):
+    """Post search"""
+
+    @swagger.operation(
+        nickname='search',
+        notes='Search for the posts whose title or url contain the given '
+              'words',
+        parameters=[
+            {
+                "name": "q",
+                "description": "The search text",
+                "required": True,
+                "allowMultiple": False,
+                "dataType": fields.String.__name__,
+                "paramType": "query"
+            },
+            {
+                "name": "per_page",
+                "description": "The posts per page",
+                "required": False,
+                "allowMultiple": False,
+                "dataType": fields.Integer.__name__,
+                "paramType": "query"
+            },
+            {
+                "name": "after",
+                "description": "The cursor of the last retrieved post",
+                "required": False,
+                "allowMultiple": False,
+                "dataType": fields.String.__name__,
+                "paramType": "query"
+            }
+        ],
+        responseClass=SearchResults.__name__,
+        responseMessages=[
+            {
+                "code": 200,
+                "message": "retrieved the matching posts"
+            }
+        ]
+    )
+    @serialize_with(SearchResults.resource_fields)
+    @jwt_required()
+    def get(self):
+        args = reqparsers.search.parse_args()
+
+        msg = "searching for posts: q(%s) per_page(%d)"
+        current_app.logger.info(msg, args.q, args.per_page)
+
+        paginator = models.Post.search(
+            db.session, args.q, after=args.after, per_page=args.per_page)
+
+        posts = [
+            {
+                "id": post.id,
+                "title": post.title,
+                "url": post.url.url,
+                "tags": post.tag_names(),
+                "categories": post.category_names(),
+                "added_at": post.added_at
+            }
+            for post in paginator.items
+        ]
+
+        return {
+            "q": args.q,
+            "posts": posts,
+            "has_more": paginator.has_next,
+            "per_page": args.per_page,
+            "next_cursor": paginator.next_cursor
+        }
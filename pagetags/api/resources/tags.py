@@ -2,10 +2,13 @@ from flask_restful import Resource, abort
 from flask_jwt import jwt_required
 from flask import current_app
 from flask_restful_swagger import swagger
-from flask_restful import fields, marshal_with
+from flask_restful import fields
 
-from pagetags import models, db, reqparsers, error_codes
-from pagetags.api.models import TagPosts, Tags
+from pagetags import models, db, reqparsers, error_codes, response_cache
+from pagetags.api.models import TagPosts, Tags, TagsPosts
+from pagetags.api.serializers import serialize_with
+from pagetags.pagination import next_cursor
+from pagetags.conditional import conditional
 
 
 class TagsResource(Resource):
@@ -22,8 +25,9 @@ class TagsResource(Resource):
             }
         ]
     )
-    @marshal_with(Tags.resource_fields)
     @jwt_required()
+    @response_cache.cached("tags", lambda: ["tags"])
+    @serialize_with(Tags.resource_fields)
     def get(self):
         msg = "retrieving available tags"
         current_app.logger.info(msg)
@@ -31,7 +35,8 @@ class TagsResource(Resource):
         tags = db.session.query(models.Tag).all()
 
         return {
-            "tags": [tag.name for tag in tags]
+            "tags": [tag.name for tag in tags],
+            "post_counts": {tag.name: tag.post_count for tag in tags}
         }
 
 
@@ -49,6 +54,14 @@ class TagPostsResource(Resource):
                 "allowMultiple": False,
                 "dataType": fields.String.__name__,
                 "paramType": "path"
+            },
+            {
+                "name": "after",
+                "description": "The cursor of the last retrieved post",
+                "required": False,
+                "allowMultiple": False,
+                "dataType": fields.String.__name__,
+                "paramType": "query"
             }
         ],
         responseClass=TagPosts.__name__,
@@ -63,8 +76,10 @@ class TagPostsResource(Resource):
             }
         ]
     )
-    @marshal_with(TagPosts.resource_fields)
     @jwt_required()
+    @conditional(lambda tag: models.Tag.get_changed_at(db.session, tag))
+    @response_cache.cached("tag_posts", lambda tag: [u"tag:%s" % tag])
+    @serialize_with(TagPosts.resource_fields)
     def get(self, tag):
         tag_object = models.Tag.get_by_name(db.session, tag)
 
@@ -81,10 +96,17 @@ class TagPostsResource(Resource):
 
         args = reqparsers.tag_posts.parse_args()
 
-        msg = "retrieving posts for tag: tag(%s) page(%d) per_page(%d)"
-        current_app.logger.info(msg, tag, args.page, args.per_page)
+        if args.after is None:
+            msg = "retrieving posts for tag: tag(%s) page(%d) per_page(%d)"
+            current_app.logger.info(msg, tag, args.page, args.per_page)
 
-        paginator = tag_object.get_posts_by_page(args.page, args.per_page)
+            paginator = tag_object.get_posts_by_page(args.page, args.per_page)
+        else:
+            msg = "retrieving posts for tag: tag(%s) after(%s) per_page(%d)"
+            current_app.logger.info(msg, tag, args.after, args.per_page)
+
+            paginator = tag_object.get_posts_after(
+                db.session, args.after, args.per_page)
 
         posts = [
             {
@@ -102,5 +124,94 @@ class TagPostsResource(Resource):
             "posts": posts,
             "has_more": paginator.has_next,
             "page": args.page,
-            "per_page": args.per_page
+            "per_page": args.per_page,
+            "next_cursor": next_cursor(paginator)
+        }
+
+
+class TagsPostsResource(Resource):
+    """Posts of many tags"""
+
+    @swagger.operation(
+        nickname='tags_posts',
+        notes='Retrieve the posts that have all or any of the given tags',
+        parameters=[
+            {
+                "name": "tags",
+                "description": "The comma separated tag names",
+                "required": True,
+                "allowMultiple": False,
+                "dataType": fields.String.__name__,
+                "paramType": "query"
+            },
+            {
+                "name": "mode",
+                "description": "Retrieve the posts that have all the tags "
+                               "(all) or any of them (any)",
+                "required": False,
+                "allowMultiple": False,
+                "dataType": fields.String.__name__,
+                "paramType": "query"
+            },
+            {
+                "name": "per_page",
+                "description": "The posts per page",
+                "required": False,
+                "allowMultiple": False,
+                "dataType": fields.Integer.__name__,
+                "paramType": "query"
+            },
+            {
+                "name": "after",
+                "description": "The cursor of the last retrieved post",
+                "required": False,
+                "allowMultiple": False,
+                "dataType": fields.String.__name__,
+                "paramType": "query"
+            }
+        ],
+        responseClass=TagsPosts.__name__,
+        responseMessages=[
+            {
+                "code": 200,
+                "message": "retrieved the posts"
+            }
+        ]
+    )
+    @serialize_with(TagsPosts.resource_fields)
+    @jwt_required()
+    def get(self):
+        args = reqparsers.tags_posts.parse_args()
+
+        msg = "retrieving posts for tags: tags(%s) mode(%s) per_page(%d)"
+        current_app.logger.info(
+            msg, ",".join(args.tags), args.mode, args.per_page)
+
+        paginator = models.Post.get_by_tags_after(
+            db.session,
+            args.tags,
+            match_all=args.mode == "all",
+            after=args.after,
+            per_page=args.per_page
+        )
+
+        posts = [
+            {
+                "id": post.id,
+                "title": post.title,
+                "url": post.url.url,
+                "tags": post.tag_names(),
+                "categories": post.category_names(),
+                "added_at": post.added_at
+            }
+            for post in paginator.items
+        ]
+
+        return {
+            "tags": args.tags,
+            "mode": args.mode,
+            "posts": posts,
+            "has_more": paginator.has_next,
+            "per_page": args.per_page,
+            "next_cursor": paginator.next_cursor
         }
@@ -1,12 +1,15 @@
 from flask_restful import Resource, abort
 from flask_jwt import jwt_required
-from flask import current_app
+from flask import current_app, request
 from flask_restful_swagger import swagger
-from flask_restful import fields, marshal_with
+from flask_restful import fields
 
-from pagetags import models, reqparsers, error_codes
+from pagetags import models, reqparsers, error_codes, response_cache
 from pagetags.api.models import URLPosts
+from pagetags.api.serializers import serialize_with
 from pagetags.models import db
+from pagetags.pagination import next_cursor
+from pagetags.conditional import conditional
 
 
 class UrlResource(Resource):
@@ -40,6 +43,14 @@ class UrlResource(Resource):
                 "allowMultiple": False,
                 "dataType": fields.Integer.__name__,
                 "paramType": "query"
+            },
+            {
+                "name": "after",
+                "description": "The cursor of the last retrieved post",
+                "required": False,
+                "allowMultiple": False,
+                "dataType": fields.String.__name__,
+                "paramType": "query"
             }
         ],
         responseMessages=[
@@ -53,8 +64,12 @@ class UrlResource(Resource):
             }
         ]
     )
-    @marshal_with(URLPosts.resource_fields)
     @jwt_required()
+    @conditional(
+        lambda: models.Url.get_changed_at(db.session, request.args.get("url")))
+    @response_cache.cached(
+        "url_posts", lambda: [u"url:%s" % request.args.get("url")])
+    @serialize_with(URLPosts.resource_fields)
     def get(self):
         args = reqparsers.url_query.parse_args()
 
@@ -73,7 +88,11 @@ class UrlResource(Resource):
                 error_code=error_codes.URL_DOES_NOT_EXIST
             )
 
-        paginator = url.get_posts_by_page(args.page, args.per_page)
+        if args.after is None:
+            paginator = url.get_posts_by_page(args.page, args.per_page)
+        else:
+            paginator = url.get_posts_after(
+                db.session, args.after, args.per_page)
 
         posts = [
             {
@@ -91,5 +110,6 @@ class UrlResource(Resource):
             "posts": posts,
             "has_more": paginator.has_next,
             "page": args.page,
-            "per_page": args.per_page
+            "per_page": args.per_page,
+            "next_cursor": next_cursor(paginator)
         }
@@ -1,16 +1,34 @@
-from pagetags.api.resources.posts import PostsResource, PostResource
+from pagetags.api.resources.posts import (
+    PostsResource, PostResource, BulkPostsResource, ExportPostsResource,
+    PostReceiptResource
+)
 from pagetags.api.resources.urls import UrlResource
-from pagetags.api.resources.tags import TagsResource, TagPostsResource
+from pagetags.api.resources.tags import (
+    TagsResource, TagPostsResource, TagsPostsResource
+)
 from pagetags.api.resources.categories import (
     CategoryPostsResource, CategoriesResource
 )
+from pagetags.api.resources.search import SearchResource
+
+
+# the API resources and their paths
+API_ROUTES = [
+    (TagsResource, "/api/v1/tags"),
+    (TagPostsResource, "/api/v1/tag/<tag>"),
+    (TagsPostsResource, "/api/v1/tags/posts"),
+    (PostsResource, "/api/v1/posts"),
+    (BulkPostsResource, "/api/v1/posts/bulk"),
+    (ExportPostsResource, "/api/v1/posts/export"),
+    (PostReceiptResource, "/api/v1/posts/receipts/<receipt>"),
+    (UrlResource, "/api/v1/url"),
+    (PostResource, "/api/v1/post/<int:post_id>"),
+    (CategoryPostsResource, "/api/v1/category/<category>"),
+    (CategoriesResource, "/api/v1/categories"),
+    (SearchResource, "/api/v1/search")
+]
 
 
 def add_api_routes(api):
-    api.add_resource(TagsResource, "/api/v1/tags")
-    api.add_resource(TagPostsResource, "/api/v1/tag/<tag>")
-    api.add_resource(PostsResource, "/api/v1/posts")
-    api.add_resource(UrlResource, "/api/v1/url")
-    api.add_resource(PostResource, "/api/v1/post/<int:post_id>")
-    api.add_resource(CategoryPostsResource, "/api/v1/category/<category>")
-    api.add_resource(CategoriesResource, "/api/v1/categories")
+    for resource, path in API_ROUTES:
+        api.add_resource(resource, path)
@@ -0,0 +1,277 @@
+from functools import wraps
+import json
+
+from flask import current_app, make_response
+from flask_restful import fields, marshal, unpack
+from flask_restful.representations.json import output_json as dumps_json
+
+from pagetags.serializers import EncodedJSON
+
+try:
+    from _json import encode_basestring_ascii as encode_string
+except ImportError:
+    from json.encoder import encode_basestring_ascii as encode_string
+
+try:
+    text_type = unicode
+except NameError:
+    text_type = str
+
+
+# encodes the values of the fields that don't have a specialized encoder
+# exactly like json.dumps with the default settings
+_encoder = json.JSONEncoder()
+
+
+class _Unsupported(Exception):
+    """Raised by the compiled encoders for the values that must be
+    marshalled by flask-restful"""
+
+
+def _getter(key, field):
+    attribute = getattr(field, "attribute", None)
+
+    if attribute is not None or "." in key:
+        # the less common lookups are left to flask-restful
+        return lambda obj: fields.get_value(
+            key if attribute is None else attribute, obj)
+
+    def get(obj):
+        if isinstance(obj, dict):
+            try:
+                return obj[key]
+            except KeyError:
+                pass
+
+            return getattr(obj, key, None)
+
+        return fields.get_value(key, obj)
+
+    return get
+
+
+def _default(field):
+    return _encoder.encode(field.default)
+
+
+def _compile_value(field):
+    """Create the function that encodes the value of a field that has been
+    retrieved from the serialized object"""
+    field_type = type(field)
+
+    if field_type is fields.String:
+        default = _default(field)
+
+        return lambda value: (default if value is None
+                              else encode_string(text_type(value)))
+
+    if field_type is fields.Integer:
+        default = _default(field)
+
+        return lambda value: default if value is None else str(int(value))
+
+    if field_type is fields.Boolean:
+        default = _default(field)
+
+        return lambda value: (default if value is None
+                              else "true" if value else "false")
+
+    if field_type is fields.DateTime:
+        default = _default(field)
+        format_datetime = field.format
+
+        return lambda value: (default if value is None
+                              else encode_string(format_datetime(value)))
+
+    if field_type is fields.Raw:
+        default = _default(field)
+
+        return lambda value: (default if value is None
+                              else _encoder.encode(value))
+
+    if field_type is fields.List:
+        return _compile_list(field)
+
+    return None
+
+
+def _compile_list(field):
+    container = field.container
+
+    if getattr(container, "attribute", None) is not None:
+        return None
+
+    if type(container) is fields.Nested:
+        encode_object = _compile_object(container.nested)
+
+        def encode_item(item):
+            # a missing item is marshalled as an object whose fields have
+            # their default values or as the default value of the field
+            if item is None:
+                raise _Unsupported()
+
+            return encode_object(item)
+    else:
+        encode_item = _compile_value(container)
+
+        if encode_item is None:
+            return None
+
+        if type(container) is not fields.Raw:
+            encode_value = encode_item
+
+            def encode_item(item):
+                # the dictionary items are marshalled using their keys
+                if isinstance(item, dict):
+                    raise _Unsupported()
+
+                return encode_value(item)
+
+    default = _default(field)
+
+    def encode(value):
+        if value is None:
+            return default
+
+        if isinstance(value, set):
+            value = list(value)
+        elif not isinstance(value, (list, tuple)):
+            raise _Unsupported()
+
+        return "[" + ", ".join([encode_item(item) for item in value]) + "]"
+
+    return encode
+
+
+def _compile_field(key, field):
+    """Create the function that encodes a field of an object"""
+    if isinstance(field, dict):
+        # the fields of a nested dictionary are retrieved from the object
+        # itself
+        return _compile_object(field)
+
+    if isinstance(field, type):
+        field = field()
+
+    encode_value = _compile_value(field)
+
+    if encode_value is None:
+        return lambda obj: _encoder.encode(field.output(key, obj))
+
+    get = _getter(key, field)
+
+    if type(field) is not fields.List:
+        return lambda obj: encode_value(get(obj))
+
+    def encode(obj):
+        try:
+            return encode_value(get(obj))
+        except _Unsupported:
+            return _encoder.encode(field.output(key, obj))
+
+    return encode
+
+
+def _compile_object(resource_fields):
+    members = [
+        (encode_string(key) + ": ", _compile_field(key, field))
+        for key, field in resource_fields.items()
+    ]
+
+    def encode(obj):
+        if isinstance(obj, (list, tuple)):
+            return "[" + ", ".join(encode(item) for item in obj) + "]"
+
+        return "{" + ", ".join(
+            name + encode_member(obj) for name, encode_member in members
+        ) + "}"
+
+    return encode
+
+
+_serializers = {}
+
+
+def compile_serializer(resource_fields):
+    """Compile the fields of a resource into a serializer
+
+    The serializer creates the JSON text that json.dumps creates for the
+    data that is marshalled by flask-restful using the same fields, without
+    creating the intermediate dictionaries. The serializers are cached.
+
+    :param dict resource_fields: the flask-restful fields
+    :rtype: function
+    :returns: a function that accepts the data and returns the JSON text
+    """
+    serializer = _serializers.get(id(resource_fields))
+
+    if serializer is None:
+        serializer = _compile_object(resource_fields)
+        _serializers[id(resource_fields)] = serializer
+
+    return serializer
+
+
+def _compiled_serializers_enabled():
+    # the debug mode and the RESTFUL_JSON setting change the JSON formatting
+    if current_app.debug:
+        return False
+
+    return not current_app.config.get("RESTFUL_JSON")
+
+
+def serialize(data, resource_fields):
+    """Serialize data using compiled resource fields
+
+    :param data: the data
+    :param dict resource_fields: the flask-restful fields
+    :returns: an EncodedJSON object or the marshalled data when the compiled
+        serializers can't create the same JSON text
+    """
+    if not _compiled_serializers_enabled():
+        return marshal(data, resource_fields)
+
+    return EncodedJSON(compile_serializer(resource_fields)(data))
+
+
+class serialize_with(object):
+    """Decorator that serializes the return value of a resource method
+
+    It replaces flask-restful's marshal_with.
+
+    :param dict resource_fields: the flask-restful fields
+    """
+
+    def __init__(self, resource_fields):
+        self.resource_fields = resource_fields
+        # the fields are compiled when the resource is created
+        compile_serializer(resource_fields)
+
+    def __call__(self, f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            rv = f(*args, **kwargs)
+
+            if isinstance(rv, tuple):
+                data, code, headers = unpack(rv)
+                return serialize(data, self.resource_fields), code, headers
+
+            return serialize(rv, self.resource_fields)
+
+        return wrapper
+
+
+def output_json(data, code, headers=None):
+    """Create the JSON response of a resource
+
+    The text of the serialized data is written as is. Any other data is
+    serialized by flask-restful.
+    """
+    if not isinstance(data, EncodedJSON):
+        return dumps_json(data, code, headers)
+
+    # flask-restful ends the JSON text with a new line
+    response = make_response(data.text + "\n", code)
+    response.headers.extend(headers or {})
+
+    return response
@@ -0,0 +1,76 @@
+import json
+
+from flask import request
+from flask_restful import Resource
+from flask_restful_swagger import registry
+from flask_restful_swagger.swagger import SwaggerEndpoint
+
+from pagetags.api.routes import API_ROUTES
+
+
+API_VERSION = "1"
+SWAGGER_VERSION = "1.2"
+# the path of the API specification. The specification is also served
+# with the .json extension
+SPEC_PATH = "/api/spec"
+SPEC_DESCRIPTION = "Auto generated API docs by flask-restful-swagger"
+
+
+def build_spec():
+    """Create the Swagger specification of the API resources
+
+    The specification is identical to the one that is created by
+    flask-restful-swagger when the resources are registered, except for
+    the base path that depends on the request.
+
+    :rtype: dict
+    :returns: the specification
+    """
+    return {
+        "apiVersion": API_VERSION,
+        "swaggerVersion": SWAGGER_VERSION,
+        "spec_endpoint_path": SPEC_PATH,
+        "resourcePath": "/",
+        "produces": ["application/json"],
+        "description": SPEC_DESCRIPTION,
+        "apis": [
+            SwaggerEndpoint(resource, path).__dict__
+            for resource, path in API_ROUTES
+        ],
+        # the models are registered when pagetags.api.models is imported
+        "models": registry["models"]
+    }
+
+
+def write_spec(spec, f):
+    """Write a specification as JSON
+
+    :param dict spec: the specification
+    :param f: the output file
+    """
+    json.dump(spec, f, indent=2, separators=(",", ": "), sort_keys=True)
+    f.write("\n")
+
+
+def load_spec(path):
+    """Read a specification that was created by the build_api_spec command
+
+    :param str path: the specification file
+    :rtype: dict
+    :returns: the specification
+    """
+    with open(path) as f:
+        return json.load(f)
+
+
+class ApiSpecResource(Resource):
+    """The precomputed API specification"""
+
+    def __init__(self, spec):
+        self.spec = spec
+
+    def get(self):
+        spec = dict(self.spec)
+        spec["basePath"] = request.url_root.rstrip("/")
+
+        return spec
@@ -1,6 +1,14 @@
 from argparse import ArgumentTypeError
+from datetime import datetime
 
-from pagetags.models import Post, Url
+from pagetags.models import Post, Url, Tag, Category
+from pagetags.pagination import Cursor, SearchCursor
+
+
+try:
+    string_types = basestring
+except NameError:
+    string_types = str
 
 
 def post_title(title):
@@ -35,3 +43,124 @@ def post_url(url):
         raise ArgumentTypeError("The url length is over the maximum allowed")
 
     return url
+
+
+def cursor(value):
+    """Pagination cursor argument type
+
+    :param str value: the encoded cursor
+    :rtype: Cursor
+    :returns: the decoded cursor
+    """
+    try:
+        return Cursor.decode(value)
+    except ValueError:
+        raise ArgumentTypeError("Invalid cursor")
+
+
+def search_cursor(value):
+    """Search results cursor argument type
+
+    :param str value: the encoded cursor
+    :rtype: SearchCursor
+    :returns: the decoded cursor
+    """
+    try:
+        return SearchCursor.decode(value)
+    except ValueError:
+        raise ArgumentTypeError("Invalid cursor")
+
+
+def search_text(text):
+    """Search text argument type
+
+    :param str text: the search text
+    :rtype: str
+    :returns: the search text
+    """
+    text = text.strip()
+
+    if len(text) == 0:
+        raise ArgumentTypeError("A search text is required")
+
+    return text
+
+
+TIMESTAMP_FORMATS = ["%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d"]
+
+
+def timestamp(value):
+    """Timestamp argument type
+
+    :param str value: the timestamp in ISO 8601 format without a timezone,
+        for example 2016-10-05T10:20:30 or 2016-10-05
+    :rtype: datetime
+    :returns: the timestamp
+    """
+    for timestamp_format in TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(value.strip(), timestamp_format)
+        except ValueError:
+            pass
+
+    raise ArgumentTypeError("Invalid timestamp")
+
+
+def tag_names(value):
+    """Comma separated tag names argument type
+
+    :param str value: the tag names separated by commas
+    :rtype: list
+    :returns: the tag names
+    """
+    names = [name.strip() for name in value.split(",")]
+    names = [name for name in names if name]
+
+    if len(names) == 0:
+        raise ArgumentTypeError("At least one tag is required")
+
+    return names
+
+
+def new_post(post):
+    """New post argument type
+
+    This is used to validate the items of a bulk post creation request.
+
+    :param dict post: the post with the title, url, tags and categories keys
+    :rtype: dict
+    :returns: the validated post
+    """
+    if not isinstance(post, dict):
+        raise ArgumentTypeError("A post object is required")
+
+    for field in ["title", "url", "tags", "categories"]:
+        if field not in post:
+            raise ArgumentTypeError("The {} field is required".format(field))
+
+    if not isinstance(post["title"], string_types):
+        raise ArgumentTypeError("The title must be a string")
+
+    if not isinstance(post["url"], string_types):
+        raise ArgumentTypeError("The url must be a string")
+
+    for field, max_length in [("tags", Tag.NAME_LENGTH),
+                              ("categories", Category.NAME_LENGTH)]:
+        values = post[field]
+
+        if (not isinstance(values, list) or
+                not all(isinstance(value, string_types) for value in values)):
+            msg = "The {} field must be a list of strings"
+            raise ArgumentTypeError(msg.format(field))
+
+        if any(len(value) == 0 or len(value) > max_length
+               for value in values):
+            msg = "The {} field contains a name with invalid length"
+            raise ArgumentTypeError(msg.format(field))
+
+    return {
+        "title": post_title(post["title"]),
+        "url": post_url(post["url"]),
+        "tags": post["tags"],
+        "categories": post["categories"]
+    }
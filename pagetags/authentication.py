@@ -2,8 +2,88 @@ from flask_jwt import _default_jwt_payload_handler, _default_request_handler
 import arrow
 import jwt
 from flask import request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 
 from pagetags.models import User, db
+from pagetags.cache import TTLCache, FileInvalidationSignal
+
+
+class IdentityCache(object):
+    """Per process cache of the users that have been authenticated using
+    JWT tokens
+
+    The cache is cleared when another process sends the invalidation
+    signal. The signal is sent when the jti of a user changes or a user is
+    deleted.
+    """
+
+    def __init__(self):
+        self.cache = TTLCache(max_size=0)
+        self.invalidation_signal = None
+
+    def init_app(self, app):
+        self.cache = TTLCache(
+            max_size=app.config["JWT_IDENTITY_CACHE_SIZE"],
+            ttl=app.config["JWT_IDENTITY_CACHE_TTL"]
+        )
+
+        invalidation_file = app.config["JWT_IDENTITY_CACHE_INVALIDATION_FILE"]
+        if invalidation_file is not None:
+            self.invalidation_signal = FileInvalidationSignal(
+                invalidation_file)
+        else:
+            self.invalidation_signal = None
+
+    @property
+    def hits(self):
+        return self.cache.hits
+
+    @property
+    def misses(self):
+        return self.cache.misses
+
+    def get(self, user_id, jti):
+        """Retrieve a cached user
+
+        :param int user_id: the user id
+        :param str jti: the jti of the user
+        :rtype: User
+        :returns: the user or None if the user is not cached
+        """
+        if (self.invalidation_signal is not None and
+                self.invalidation_signal.received()):
+            self.cache.clear()
+
+        user = self.cache.get(user_id)
+
+        if user is None or user.jti != jti:
+            return None
+
+        return user
+
+    def add(self, user):
+        """Cache a user
+
+        :param User user: the user. The user must be detached from the
+            session because the cached object is used by many requests
+        """
+        self.cache.set(user.id, user)
+
+    def invalidate(self, user_ids):
+        """Remove the given users from the cache of this process and notify
+        the other processes
+
+        :param user_ids: the ids of the users
+        """
+        for user_id in user_ids:
+            self.cache.delete(user_id)
+
+        if self.invalidation_signal is not None:
+            self.invalidation_signal.send()
+
+
+identity_cache = IdentityCache()
 
 
 def load_user(user_id):
@@ -18,7 +98,45 @@ def identity(payload):
     user_id = payload["identity"]
     jti = payload["jti"]
 
-    return User.authenticate_using_jti(db.session, user_id, jti)
+    user = identity_cache.get(user_id, jti)
+    if user is not None:
+        return user
+
+    user = User.authenticate_using_jti(db.session, user_id, jti)
+    if user is not None:
+        db.session.expunge(user)
+        identity_cache.add(user)
+
+    return user
+
+
+@event.listens_for(Session, "after_flush")
+def find_changed_identities(session, flush_context):
+    """Keep the ids of the users whose jti changed or that were deleted, so
+    that they are removed from the identity cache after the commit"""
+    user_ids = session.info.setdefault("changed_identities", set())
+
+    for obj in session.dirty:
+        if (isinstance(obj, User) and
+                db.inspect(obj).attrs.jti.history.has_changes()):
+            user_ids.add(obj.id)
+
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            user_ids.add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_changed_identities(session):
+    user_ids = session.info.pop("changed_identities", None)
+
+    if user_ids:
+        identity_cache.invalidate(user_ids)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def discard_changed_identities(session, previous_transaction):
+    session.info.pop("changed_identities", None)
 
 
 def payload_handler(identity):
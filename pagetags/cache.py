@@ -0,0 +1,492 @@
+from collections import OrderedDict
+from functools import wraps
+from hashlib import sha1
+from threading import Lock
+from time import time, sleep
+from uuid import uuid4
+import os
+
+from flask import request, session, make_response, current_app
+from flask_login import current_user
+
+
+class TTLCache(object):
+    """A thread safe least recently used cache whose entries expire after a
+    fixed amount of time"""
+
+    def __init__(self, max_size=1000, ttl=60, timer=time):
+        """Create a new cache
+
+        :param int max_size: the maximum number of entries in the cache
+        :param float ttl: the number of seconds an entry is valid
+        :param timer: the function that returns the current time
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.timer = timer
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        """Retrieve an entry from the cache
+
+        :param key: the key of the entry
+        :param default: the value to return if the entry doesn't exist or has
+            expired
+        :returns: the cached value or the default value
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+
+            if entry is None or entry[0] <= self.timer():
+                self.misses += 1
+                return default
+
+            # reinsert the entry so that it becomes the most recently used
+            self._entries[key] = entry
+            self.hits += 1
+
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        """Add an entry to the cache
+
+        The least recently used entry is evicted if the cache is full.
+
+        :param key: the key of the entry
+        :param value: the value to cache
+        :param float ttl: the number of seconds the entry is valid or None to
+            use the default ttl of the cache
+        """
+        with self._lock:
+            self._set(key, value, ttl)
+
+    def _set(self, key, value, ttl):
+        if self.max_size <= 0:
+            return
+
+        expires_at = self.timer() + (self.ttl if ttl is None else ttl)
+
+        self._entries.pop(key, None)
+        self._entries[key] = (expires_at, value)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def add(self, key, value, ttl=None):
+        """Add an entry to the cache if it doesn't exist or has expired
+
+        :param key: the key of the entry
+        :param value: the value to cache
+        :param float ttl: the number of seconds the entry is valid or None to
+            use the default ttl of the cache
+        :rtype: bool
+        :returns: True if the entry was added
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry[0] > self.timer():
+                return False
+
+            self._set(key, value, ttl)
+
+        return True
+
+    def delete(self, key):
+        """Remove an entry from the cache
+
+        :param key: the key of the entry
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove all the entries from the cache"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class FileInvalidationSignal(object):
+    """Invalidation signal that is shared by many processes using a file
+
+    The processes that send the signal write a new random token to the file.
+    The processes that receive it check whether the token has changed since
+    the last check. The token is compared instead of the modification time of
+    the file, because the signals that are sent within the resolution of the
+    modification time would otherwise be missed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._token = self._read_token()
+
+    def _read_token(self):
+        try:
+            with open(self.path) as f:
+                return f.read()
+        except (IOError, OSError):
+            return None
+
+    def send(self):
+        """Notify the other processes"""
+        token = uuid4().hex
+
+        # the token is replaced atomically, so that the other processes
+        # never read a partially written token
+        temporary_path = "%s.%s.tmp" % (self.path, token)
+        with open(temporary_path, "w") as f:
+            f.write(token)
+        os.rename(temporary_path, self.path)
+
+        self._token = token
+
+    def received(self):
+        """Check whether the signal has been sent since the last check
+
+        :rtype: bool
+        :returns: True if the signal has been sent
+        """
+        token = self._read_token()
+
+        if token == self._token:
+            return False
+
+        self._token = token
+
+        return True
+
+
+class LocalCacheClient(object):
+    """In process cache that implements the subset of the python-memcached
+    client interface that is used by ResponseCache
+
+    It is used when a single server process is running and as a stand-in for
+    memcached in development and testing.
+    """
+
+    def __init__(self, max_size=1000):
+        self.cache = TTLCache(max_size=max_size)
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def get_multi(self, keys):
+        values = {}
+
+        for key in keys:
+            value = self.cache.get(key)
+            if value is not None:
+                values[key] = value
+
+        return values
+
+    def set(self, key, value, time=0):
+        self.cache.set(key, value, ttl=time or float("inf"))
+
+        return True
+
+    def add(self, key, value, time=0):
+        return self.cache.add(key, value, ttl=time or float("inf"))
+
+    def delete(self, key):
+        self.cache.delete(key)
+
+        return True
+
+    def delete_multi(self, keys):
+        for key in keys:
+            self.cache.delete(key)
+
+        return True
+
+
+class ResponseCache(object):
+    """Cache of the responses of the API resources
+
+    Every cached response depends on a list of named dependencies, for
+    example the tag whose posts it contains. Every dependency has a version
+    that is part of the response key. Invalidating a dependency changes its
+    version, so the responses that depend on it are never retrieved again
+    and expire. This way the responses can be invalidated without knowing
+    their keys, which also works with caches that are shared by many
+    processes.
+    """
+
+    # the prefix of the TTL settings
+    settings_prefix = "RESPONSE_CACHE"
+
+    def __init__(self):
+        self.client = None
+        self.key_prefix = ""
+        self.default_ttl = 0
+        self.ttls = {}
+        self.hits = 0
+        self.misses = 0
+
+    def init_app(self, app):
+        backend = app.config["RESPONSE_CACHE_BACKEND"]
+
+        if backend is None:
+            self.client = None
+        elif backend == "local":
+            self.client = LocalCacheClient(app.config["RESPONSE_CACHE_SIZE"])
+        elif backend == "memcached":
+            try:
+                import memcache
+            except ImportError:
+                raise RuntimeError(
+                    "python-memcached is required by the memcached response "
+                    "cache backend")
+
+            self.client = memcache.Client(
+                app.config["RESPONSE_CACHE_MEMCACHED_SERVERS"])
+        else:
+            raise ValueError("unknown response cache backend %s" % backend)
+
+        self.key_prefix = app.config["RESPONSE_CACHE_KEY_PREFIX"]
+        self.default_ttl = app.config[self.settings_prefix + "_DEFAULT_TTL"]
+        self.ttls = app.config[self.settings_prefix + "_TTLS"]
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, kind, value):
+        # memcached keys can't contain whitespace or be longer than 250
+        # characters
+        digest = sha1(value.encode("utf-8")).hexdigest()
+
+        return "%s:%s:%s" % (self.key_prefix, kind, digest)
+
+    def _dependency_key(self, dependency):
+        return self._key("dependency", u"%s" % dependency)
+
+    def _dependency_versions(self, dependencies):
+        keys = [self._dependency_key(dependency)
+                for dependency in dependencies]
+
+        versions = self.client.get_multi(keys)
+
+        for key in keys:
+            if key not in versions:
+                versions[key] = uuid4().hex
+                self.client.set(key, versions[key])
+
+        return [versions[key] for key in keys]
+
+    def cached(self, name, dependencies):
+        """Decorator that caches the responses of a resource method
+
+        The responses are cached by the resource name, the method arguments
+        and the query string arguments. Responses with a status code are not
+        cached.
+
+        :param str name: the resource name. It is used to look up the TTL of
+            the responses in the RESPONSE_CACHE_TTLS setting
+        :param dependencies: a function that accepts the keyword arguments of
+            the method and returns the names of the dependencies of the
+            response
+        """
+        def decorator(f):
+            @wraps(f)
+            def wrapper(*args, **kwargs):
+                ttl = self.ttls.get(name, self.default_ttl)
+
+                if self.client is None or not ttl:
+                    return f(*args, **kwargs)
+
+                versions = self._dependency_versions(dependencies(**kwargs))
+                key = self._key(
+                    "response:%s" % name,
+                    repr((
+                        versions,
+                        sorted(kwargs.items()),
+                        sorted(request.args.items(multi=True))
+                    ))
+                )
+
+                response = self.client.get(key)
+                if response is not None:
+                    self.hits += 1
+                    return response
+
+                self.misses += 1
+
+                response = f(*args, **kwargs)
+
+                if not isinstance(response, tuple):
+                    self.client.set(key, response, time=ttl)
+
+                return response
+
+            return wrapper
+
+        return decorator
+
+    def invalidate(self, dependencies):
+        """Invalidate the responses that depend on the given dependencies
+
+        :param dependencies: the dependency names
+        """
+        if self.client is None:
+            return
+
+        self.client.delete_multi(
+            [self._dependency_key(dependency) for dependency in dependencies])
+
+
+class PageCache(ResponseCache):
+    """Cache of the HTML pages that are viewed by anonymous users
+
+    The pages are cached by the view name and the request path. A page whose
+    dependencies have been invalidated, or that has expired, is rendered
+    again by a single request. While that happens the other requests
+    receive the stale page if stale-while-revalidate is enabled, or wait for
+    the page to be rendered, so that a cache miss doesn't cause every
+    request to query the database.
+    """
+
+    settings_prefix = "PAGE_CACHE"
+
+    def __init__(self):
+        super(PageCache, self).__init__()
+
+        self.max_stale = 0
+        self.lock_timeout = 0
+        self.stale_while_revalidate = False
+        self.stale_hits = 0
+
+    def init_app(self, app):
+        super(PageCache, self).init_app(app)
+
+        self.max_stale = app.config["PAGE_CACHE_MAX_STALE"]
+        self.lock_timeout = app.config["PAGE_CACHE_LOCK_TIMEOUT"]
+        self.stale_while_revalidate = \
+            app.config["PAGE_CACHE_STALE_WHILE_REVALIDATE"]
+        self.stale_hits = 0
+
+    def _page_response(self, page):
+        return current_app.response_class(
+            page["body"], mimetype=page["mimetype"])
+
+    def _render(self, f, args, kwargs, key, versions, ttl):
+        response = make_response(f(*args, **kwargs))
+
+        if response.status_code == 200:
+            page = {
+                "versions": versions,
+                "created_at": time(),
+                "body": response.get_data(),
+                "mimetype": response.mimetype
+            }
+
+            self.client.set(key, page, time=ttl + self.max_stale)
+
+        return response
+
+    def _wait_for_page(self, key, versions):
+        deadline = time() + self.lock_timeout
+
+        while time() < deadline:
+            sleep(0.05)
+
+            page = self.client.get(key)
+            if page is not None and page["versions"] == versions:
+                return page
+
+        return None
+
+    def cached(self, name, dependencies):
+        """Decorator that caches the pages that a view renders for anonymous
+        users
+
+        :param str name: the view name. It is used to look up the TTL of the
+            pages in the PAGE_CACHE_TTLS setting
+        :param dependencies: a function that accepts the keyword arguments of
+            the view and returns the names of the dependencies of the page
+        """
+        def decorator(f):
+            @wraps(f)
+            def wrapper(*args, **kwargs):
+                ttl = self.ttls.get(name, self.default_ttl)
+
+                if (self.client is None or not ttl or
+                        current_user.is_authenticated or
+                        "_flashes" in session):
+                    return f(*args, **kwargs)
+
+                versions = self._dependency_versions(dependencies(**kwargs))
+                key = self._key("page:%s" % name, request.full_path)
+
+                page = self.client.get(key)
+                if (page is not None and page["versions"] == versions and
+                        page["created_at"] + ttl > time()):
+                    self.hits += 1
+                    return self._page_response(page)
+
+                self.misses += 1
+
+                lock_key = key + ":lock"
+                if self.client.add(lock_key, 1, time=self.lock_timeout):
+                    try:
+                        return self._render(
+                            f, args, kwargs, key, versions, ttl)
+                    finally:
+                        self.client.delete(lock_key)
+
+                # another request is rendering the page
+                if page is not None and self.stale_while_revalidate:
+                    self.stale_hits += 1
+                    return self._page_response(page)
+
+                page = self._wait_for_page(key, versions)
+                if page is not None:
+                    return self._page_response(page)
+
+                return f(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+
+class FragmentCache(object):
+    """Per process cache of rendered template fragments"""
+
+    def __init__(self):
+        self.cache = TTLCache(max_size=0)
+
+    def init_app(self, app):
+        self.cache = TTLCache(
+            max_size=app.config["FRAGMENT_CACHE_SIZE"],
+            ttl=app.config["FRAGMENT_CACHE_TTL"]
+        )
+
+    @property
+    def hits(self):
+        return self.cache.hits
+
+    @property
+    def misses(self):
+        return self.cache.misses
+
+    def render(self, key, render):
+        """Retrieve a fragment from the cache or render it
+
+        :param key: the fragment key. It must change when the content of the
+            fragment changes
+        :param render: the function that renders the fragment
+        :returns: the fragment
+        """
+        fragment = self.cache.get(key)
+
+        if fragment is None:
+            fragment = render()
+            self.cache.set(key, fragment)
+
+        return fragment
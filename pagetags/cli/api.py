@@ -0,0 +1,18 @@
+from flask_script import Command, Option
+
+from pagetags.api.spec import build_spec, write_spec
+
+
+class BuildApiSpec(Command):
+    """Create the Swagger specification of the API
+
+    The specification is served from the file when API_SPEC_FILE is set.
+    """
+
+    option_list = (
+        Option("--output", dest="output_path", required=True),
+    )
+
+    def run(self, output_path):
+        with open(output_path, "w") as f:
+            write_spec(build_spec(), f)
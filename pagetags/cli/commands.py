@@ -3,7 +3,7 @@ import os
 from flask_script import Manager
 
 from pagetags.main import create_app
-from pagetags.cli import users, database, tokens
+from pagetags.cli import users, database, tokens, posts, profiles, api
 
 
 def main():
@@ -21,9 +21,20 @@ def main():
     tokens_manager = Manager(help="Token management commands")
     tokens_manager.add_command("create", tokens.CreateToken())
 
+    profiles_manager = Manager(help="Request profile commands")
+    profiles_manager.add_command("list", profiles.ListProfiles())
+    profiles_manager.add_command("summary", profiles.SummarizeProfiles())
+
     manager = Manager(app)
     manager.add_command("initdb", database.InitDB())
+    manager.add_command("update_post_counts", database.UpdatePostCounts())
+    manager.add_command("seed", database.SeedDatabase())
+    manager.add_command("export", posts.ExportPosts())
+    manager.add_command("import", posts.ImportPosts())
+    manager.add_command("worker", posts.Worker())
+    manager.add_command("build_api_spec", api.BuildApiSpec())
     manager.add_command("users", users_manager)
     manager.add_command("tokens", tokens_manager)
+    manager.add_command("profiles", profiles_manager)
 
     manager.run()
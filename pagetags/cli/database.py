@@ -1,6 +1,12 @@
-from flask_script import Command
+from datetime import datetime
+import sys
 
-from pagetags import db
+from flask_script import Command, Option
+
+from pagetags import db, argtypes
+from pagetags.models import Tag, Category
+from pagetags.dataset import generate_posts
+from pagetags.importer import import_posts
 
 
 class InitDB(Command):
@@ -8,3 +14,64 @@ class InitDB(Command):
 
     def run(self):
         db.create_all()
+
+
+class UpdatePostCounts(Command):
+    """Recompute the post counts of the tags and categories"""
+
+    def run(self):
+        Tag.recompute_post_counts(db.session)
+        Category.recompute_post_counts(db.session)
+
+        db.session.commit()
+
+
+class SeedDatabase(Command):
+    """Add synthetic posts to the database
+
+    The tags and categories of the posts follow Zipf's law. The posts are
+    added using the import command, so an interrupted run continues from the
+    last imported batch.
+    """
+
+    option_list = (
+        Option("--posts", dest="post_count", type=int, default=1000000),
+        Option("--tags", dest="tag_count", type=int, default=50000),
+        Option("--categories", dest="category_count", type=int, default=200),
+        Option("--urls", dest="url_count", type=int,
+               help="the number of distinct urls. Defaults to the number of "
+                    "posts"),
+        Option("--exponent", type=float, default=1.0,
+               help="the exponent of the Zipf distributions"),
+        Option("--seed", type=int, default=0,
+               help="the seed of the random number generator"),
+        Option("--start", type=argtypes.timestamp,
+               default=datetime(2016, 1, 1),
+               help="the time at which the first post is added"),
+        Option("--batch_size", type=int, default=10000)
+    )
+
+    def run(self, post_count, tag_count, category_count, url_count, exponent,
+            seed, start, batch_size):
+        posts = generate_posts(
+            post_count,
+            tag_count=tag_count,
+            category_count=category_count,
+            url_count=url_count,
+            exponent=exponent,
+            start=start,
+            seed=seed
+        )
+
+        def progress(result):
+            sys.stderr.write(
+                "added {} of {} posts\n".format(result.imported, post_count))
+
+        name = "seed:{}:{}:{}:{}:{}:{}:{}".format(
+            post_count, tag_count, category_count, url_count, exponent, seed,
+            start.strftime("%Y-%m-%dT%H:%M:%S"))
+
+        result = import_posts(
+            db.session, posts, name, batch_size=batch_size, progress=progress)
+
+        print("added {} posts".format(result.imported))
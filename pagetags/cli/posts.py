@@ -0,0 +1,127 @@
+from time import time
+import os
+import sys
+
+from flask_script import Command, Option
+from flask import current_app
+
+from pagetags import db, argtypes
+from pagetags.models import Post
+from pagetags.ndjson import to_ndjson, read_ndjson
+from pagetags.importer import import_posts, open_csv, read_csv
+from pagetags.post_queue import post_queue
+
+
+class ExportPosts(Command):
+    """Export the posts as newline delimited JSON"""
+
+    option_list = (
+        Option("--output", help="the output file. Defaults to stdout"),
+        Option("--tag"),
+        Option("--category"),
+        Option("--added_after", type=argtypes.timestamp),
+        Option("--added_before", type=argtypes.timestamp)
+    )
+
+    def run(self, output, tag, category, added_after, added_before):
+        posts = Post.export(
+            db.session,
+            tag=tag,
+            category=category,
+            added_after=added_after,
+            added_before=added_before,
+            batch_size=current_app.config["EXPORT_BATCH_SIZE"]
+        )
+
+        f = open(output, "w") if output else sys.stdout
+
+        try:
+            for line in to_ndjson(posts):
+                f.write(line)
+        finally:
+            if output:
+                f.close()
+
+
+class ImportPosts(Command):
+    """Import posts from a newline delimited JSON or CSV file
+
+    The posts are imported in batches. An interrupted import continues after
+    the last imported batch when it is executed again with the same name.
+    """
+
+    option_list = (
+        Option("--input", dest="input_path", required=True),
+        Option("--format", dest="input_format", choices=("ndjson", "csv"),
+               help="the input format. Defaults to csv for files with the "
+                    ".csv extension and to ndjson for the other files"),
+        Option("--name", help="the import name that is used in order to "
+                              "resume the import. Defaults to the file name"),
+        Option("--batch_size", type=int),
+        Option("--restart", action="store_true", default=False,
+               help="import all the posts of the file even if the import "
+                    "has already been executed")
+    )
+
+    def run(self, input_path, input_format, name, batch_size, restart):
+        if input_format is None:
+            is_csv = os.path.splitext(input_path)[1].lower() == ".csv"
+            input_format = "csv" if is_csv else "ndjson"
+
+        name = name or os.path.basename(input_path)
+        batch_size = batch_size or current_app.config["IMPORT_BATCH_SIZE"]
+
+        started_at = time()
+
+        def progress(result):
+            elapsed = max(time() - started_at, 0.001)
+
+            msg = "processed {} records: imported({}) invalid({}) " \
+                  "posts/s({:.1f})"
+            sys.stderr.write(msg.format(
+                result.position,
+                result.imported,
+                result.invalid,
+                result.imported / elapsed
+            ) + "\n")
+
+        def invalid_record(position, error):
+            sys.stderr.write(
+                "invalid record {}: {}\n".format(position, error))
+
+        if input_format == "csv":
+            f = open_csv(input_path)
+            records = read_csv(f)
+        else:
+            f = open(input_path)
+            records = read_ndjson(f)
+
+        with f:
+            result = import_posts(
+                db.session,
+                records,
+                name,
+                batch_size=batch_size,
+                restart=restart,
+                progress=progress,
+                invalid_record=invalid_record
+            )
+
+        print("imported {} posts".format(result.imported))
+
+
+class Worker(Command):
+    """Create the posts that have been added to the post queue"""
+
+    option_list = (
+        Option("--batch_size", type=int),
+        Option("--once", action="store_true", default=False,
+               help="exit when the queue is empty")
+    )
+
+    def run(self, batch_size, once):
+        if not post_queue.enabled:
+            print("The post queue is not enabled")
+            return
+
+        post_queue.run_worker(db.session, batch_size=batch_size, once=once)
@@ -0,0 +1,72 @@
+import os
+import sys
+
+from flask import current_app
+from flask_script import Command, Option
+
+from pagetags.profiling import list_profiles, load_stats
+
+
+def profile_directory():
+    directory = current_app.config["PROFILING_DIRECTORY"]
+
+    if directory is None or not os.path.isdir(directory):
+        print("There are no profiles")
+        return None
+
+    return directory
+
+
+class ListProfiles(Command):
+    """List the stored request profiles"""
+
+    option_list = (
+        Option("--endpoint", help="list only the profiles of this endpoint"),
+    )
+
+    def run(self, endpoint):
+        directory = profile_directory()
+        if directory is None:
+            return
+
+        for profile in list_profiles(directory, endpoint):
+            print("{name}\t{created_at}\t{endpoint}\t{method}\t{status}\t"
+                  "{duration_ms:.1f}ms\t{trigger}\t{path}".format(**profile))
+
+
+class SummarizeProfiles(Command):
+    """Print the functions that took the most time in the stored request
+    profiles
+
+    The given profiles, or all the profiles of an endpoint, are combined.
+    """
+
+    option_list = (
+        Option("names", nargs="*", help="the profile names"),
+        Option("--endpoint", help="summarize all the profiles of this "
+                                  "endpoint"),
+        Option("--sort", default="cumulative",
+               help="the pstats sort key, for example cumulative or tottime"),
+        Option("--limit", type=int, default=30,
+               help="the number of functions")
+    )
+
+    def run(self, names, endpoint, sort, limit):
+        directory = profile_directory()
+        if directory is None:
+            return
+
+        if not names:
+            if endpoint is None:
+                print("Either profile names or an endpoint are required")
+                return
+
+            names = [profile["name"]
+                     for profile in list_profiles(directory, endpoint)]
+
+        if not names:
+            print("There are no profiles")
+            return
+
+        stats = load_stats(directory, names, stream=sys.stdout)
+        stats.sort_stats(sort).print_stats(limit)
@@ -0,0 +1,79 @@
+from functools import wraps
+from hashlib import sha1
+
+from flask import request, make_response, current_app
+from flask_login import current_user
+from werkzeug.http import http_date, quote_etag
+
+from pagetags.serializers import EncodedJSON
+
+
+def _etag(changed_at, per_user):
+    values = [changed_at.isoformat(), request.full_path]
+
+    if per_user:
+        values.append(current_user.get_id() or "")
+
+    return sha1(u"|".join(values).encode("utf-8")).hexdigest()
+
+
+def _not_modified(etag):
+    # If-Modified-Since isn't supported. Its resolution is one second, so the
+    # changes that are made in the same second as the previous response would
+    # be missed, and the change time of some content, like the time of the
+    # last changed url, decreases when the content is deleted. The ETag
+    # depends on the exact change time
+    return request.if_none_match.contains(etag)
+
+
+def _validator_headers(etag, changed_at):
+    return {
+        "ETag": quote_etag(etag),
+        "Last-Modified": http_date(changed_at)
+    }
+
+
+def conditional(changed_at, per_user=False):
+    """Decorator that adds support for conditional GET requests to a view or
+    to a resource method
+
+    The last change time of the content is retrieved before the view is
+    called. If the client already has the current version of the content
+    a 304 response is returned without calling the view.
+
+    :param changed_at: a function that accepts the keyword arguments of the
+        view and returns the last time the content changed or None if it
+        isn't known. Views whose content change time isn't known are called
+        without conditional request support
+    :param bool per_user: the content depends on the logged in user
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            content_changed_at = changed_at(**kwargs)
+
+            if content_changed_at is None:
+                return f(*args, **kwargs)
+
+            etag = _etag(content_changed_at, per_user)
+            headers = _validator_headers(etag, content_changed_at)
+
+            if _not_modified(etag):
+                return current_app.response_class(status=304, headers=headers)
+
+            rv = f(*args, **kwargs)
+
+            # the resource methods return the data that Flask-RESTful
+            # serializes
+            if isinstance(rv, (dict, EncodedJSON)):
+                return rv, 200, headers
+
+            response = make_response(rv)
+            if response.status_code == 200:
+                response.headers.extend(headers)
+
+            return response
+
+        return wrapper
+
+    return decorator
@@ -3,8 +3,116 @@ PROPAGATE_EXCEPTIONS = True
 FRONT_PAGE_ITEM_COUNT = 10
 TAG_POSTS_PER_PAGE = 10
 
+BULK_POSTS_MAX_COUNT = 5000
+
+# the Swagger specification file that is created by the build_api_spec
+# command. When it is set the specification is served from the file and the
+# API resources are registered without the swagger documentation endpoints
+API_SPEC_FILE = None
+
+# the number of posts that are read from the database at once by the post
+# export
+EXPORT_BATCH_SIZE = 1000
+
+# the number of posts that are imported and committed at once by the import
+# command
+IMPORT_BATCH_SIZE = 1000
+
+# count and time the SQL queries of every request. The query count and time
+# are added to the X-Query-Count and Server-Timing response headers if
+# SQL_INSTRUMENTATION_HEADERS is enabled
+SQL_INSTRUMENTATION_ENABLED = False
+SQL_INSTRUMENTATION_HEADERS = True
+# the requests that take at least this number of milliseconds or execute at
+# least SLOW_REQUEST_QUERY_COUNT queries are logged when the SQL
+# instrumentation is enabled. Set them to None in order to disable logging
+SLOW_REQUEST_DURATION = 500
+SLOW_REQUEST_QUERY_COUNT = 50
+
+# serve the Prometheus metrics of the requests, the database connection pool,
+# the caches and the created posts at /metrics. This requires
+# prometheus_client. When the application is served by many processes, set
+# the PROMETHEUS_MULTIPROC_DIR environment variable to an empty directory
+# that is shared by them in order to aggregate their metrics
+METRICS_ENABLED = False
+# the upper bounds, in seconds, of the request duration histogram buckets
+METRICS_REQUEST_DURATION_BUCKETS = [
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+]
+
+# profile the requests that carry the PROFILING_HEADER header with the
+# PROFILING_TOKEN value and a PROFILING_SAMPLE_RATE fraction of the other
+# requests. The profiles are stored in PROFILING_DIRECTORY and they can be
+# inspected using the profiles command
+PROFILING_ENABLED = False
+PROFILING_DIRECTORY = None
+PROFILING_HEADER = "X-Pagetags-Profile"
+# the header is ignored when the token is None
+PROFILING_TOKEN = None
+PROFILING_SAMPLE_RATE = 0.0
+# the oldest profiles are deleted when there are more than this number of
+# profiles. Set it to None in order to keep all of them
+PROFILING_MAX_PROFILES = 1000
+
+# the backend of the post creation queue. When it is set the posts that are
+# created using the API are added to the queue and they are created by the
+# worker command. Set it to "database" in order to store the queue in the
+# application database or to None in order to create the posts immediately
+POST_QUEUE_BACKEND = None
+# the maximum number of queued posts that the worker creates in a single
+# transaction
+POST_QUEUE_BATCH_SIZE = 100
+# the number of seconds the worker waits when the queue is empty
+POST_QUEUE_POLL_INTERVAL = 1.0
+
+# the users that are authenticated using JWT tokens are cached by every
+# process. Set the size to 0 in order to disable the cache
+JWT_IDENTITY_CACHE_SIZE = 1000
+# the changes to the users that are made by other processes, for example a
+# password change that revokes the tokens of the user, take effect when the
+# cached users expire, unless the invalidation file is set. Increase the TTL
+# only together with the invalidation file
+JWT_IDENTITY_CACHE_TTL = 5
+# the file that is used to notify the other processes that the cache must
+# be cleared. It must be writable by the server processes and the cli tool
+JWT_IDENTITY_CACHE_INVALIDATION_FILE = None
+
 ERROR_404_HELP = False
 
 # exp has been removed because we want to be able to create tokens without
 # expiration data
 JWT_REQUIRED_CLAIMS = ['iat', 'nbf']
+
+# the responses of the read only API resources are cached. The available
+# backends are local, which caches the responses in every process, and
+# memcached, which requires python-memcached. The local cache is invalidated
+# only in the process that changed the posts, so it must not be used when the
+# application is served by many processes or when posts are created by the
+# import and worker commands. The cache is disabled when the backend is None
+RESPONSE_CACHE_BACKEND = None
+RESPONSE_CACHE_SIZE = 1000
+RESPONSE_CACHE_MEMCACHED_SERVERS = ["127.0.0.1:11211"]
+RESPONSE_CACHE_KEY_PREFIX = "pagetags"
+RESPONSE_CACHE_DEFAULT_TTL = 60
+# the TTL of the responses of specific resources. A TTL of 0 disables the
+# cache for the resource
+RESPONSE_CACHE_TTLS = {}
+
+# the pages that are viewed by anonymous users are cached using the response
+# cache backend
+PAGE_CACHE_DEFAULT_TTL = 60
+# the TTL of the pages of specific views. A TTL of 0 disables the cache for
+# the view
+PAGE_CACHE_TTLS = {}
+# the number of seconds an expired or invalidated page is kept in order to be
+# served while it is rendered again by another request
+PAGE_CACHE_MAX_STALE = 300
+PAGE_CACHE_STALE_WHILE_REVALIDATE = True
+# the maximum number of seconds a request waits for another request to
+# render a page that is not in the cache
+PAGE_CACHE_LOCK_TIMEOUT = 5
+
+# the rendered posts are cached by every process. Set the size to 0 in order
+# to disable the cache
+FRAGMENT_CACHE_SIZE = 10000
+FRAGMENT_CACHE_TTL = 3600
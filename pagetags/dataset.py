@@ -0,0 +1,123 @@
+from bisect import bisect
+from datetime import datetime, timedelta
+import random
+
+
+WORDS = [
+    "python", "flask", "database", "postgresql", "sqlite", "cache", "index",
+    "query", "performance", "benchmark", "release", "security", "testing",
+    "deployment", "docker", "linux", "network", "storage", "memory", "api",
+    "search", "server", "client", "design", "review", "tutorial", "guide",
+    "introduction", "advanced", "notes", "update", "bug", "feature",
+    "profiling", "scaling", "monitoring", "logging", "metrics", "queue",
+    "worker"
+]
+
+
+class ZipfDistribution(object):
+    """Sample the integers 0 to size - 1 with probabilities that follow
+    Zipf's law, so that a few values are very common and most of them are
+    rare"""
+
+    def __init__(self, size, exponent=1.0):
+        self.size = size
+
+        total = 0.0
+        self._cumulative_weights = []
+        for rank in range(1, size + 1):
+            total += 1.0 / (rank ** exponent)
+            self._cumulative_weights.append(total)
+
+    def sample(self, rng):
+        """Sample a value
+
+        :param rng: the random number generator
+        :rtype: int
+        :returns: the value
+        """
+        value = rng.random() * self._cumulative_weights[-1]
+
+        return min(bisect(self._cumulative_weights, value), self.size - 1)
+
+    def sample_distinct(self, rng, count):
+        """Sample distinct values
+
+        :param rng: the random number generator
+        :param int count: the number of values
+        :rtype: set
+        :returns: the values
+        """
+        count = min(count, self.size)
+
+        values = set()
+        while len(values) < count:
+            values.add(self.sample(rng))
+
+        return values
+
+
+def tag_name(index):
+    return "tag_%d" % index
+
+
+def category_name(index):
+    return "category_%d" % index
+
+
+def url(index):
+    return "http://www.example.com/page_%d" % index
+
+
+def generate_posts(post_count, tag_count=50000, category_count=200,
+                   url_count=None, max_tags=5, max_categories=2,
+                   exponent=1.0, start=datetime(2016, 1, 1), days=365,
+                   seed=0):
+    """Generate synthetic posts
+
+    The tags and categories of the posts follow Zipf's law and the posts
+    are added at increasing times that are spread over the given number of
+    days after the start time. The same seed and start time always generate
+    the same posts.
+
+    :param int post_count: the number of posts
+    :param int tag_count: the number of distinct tags
+    :param int category_count: the number of distinct categories
+    :param int url_count: the number of distinct urls or None to use as many
+        urls as posts
+    :param int max_tags: the maximum number of tags of a post
+    :param int max_categories: the maximum number of categories of a post
+    :param float exponent: the exponent of the Zipf distributions
+    :param datetime start: the time at which the first post is added
+    :param int days: the number of days over which the posts are added
+    :param int seed: the seed of the random number generator
+    :rtype: generator
+    :returns: the posts as dictionaries with the title, url, tags, categories
+        and added_at keys that can be imported using import_posts
+    """
+    rng = random.Random(seed)
+
+    tags = ZipfDistribution(tag_count, exponent)
+    categories = ZipfDistribution(category_count, exponent)
+    url_count = url_count or post_count
+
+    interval = timedelta(days=days).total_seconds() / max(post_count, 1)
+
+    for i in range(post_count):
+        title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 8)))
+        added_at = start + timedelta(seconds=int(i * interval))
+
+        yield {
+            "title": title,
+            "url": url(rng.randrange(url_count)),
+            "tags": sorted(
+                tag_name(index)
+                for index in tags.sample_distinct(
+                    rng, rng.randint(1, max_tags))
+            ),
+            "categories": sorted(
+                category_name(index)
+                for index in categories.sample_distinct(
+                    rng, rng.randint(0, max_categories))
+            ),
+            "added_at": added_at.strftime("%Y-%m-%dT%H:%M:%S")
+        }
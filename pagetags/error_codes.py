@@ -3,6 +3,11 @@ CATEGORY_NOT_FOUND = 1001
 
 POST_CREATION_DATABASE_ERROR = 2000
 POST_UPDATE_DATABASE_ERROR = 2001
+BULK_POST_CREATION_DATABASE_ERROR = 2002
+BULK_POST_LIMIT_EXCEEDED = 2003
+INVALID_POST = 2004
+POST_QUEUE_DATABASE_ERROR = 2005
 
 URL_DOES_NOT_EXIST = 3000
 POST_DOES_NOT_EXIST = 3001
+RECEIPT_DOES_NOT_EXIST = 3002
@@ -1,13 +1,13 @@
-from flask_admin import Admin
-
 from pagetags import login_manager
 from pagetags.models import db
 from pagetags.authentication import (load_user, authenticate, identity,
-                                     payload_handler, request_handler)
-from pagetags import jwt
-from pagetags.admin import (UserModelView, AuthenticatedIndexView,
-                            TagModelView, UrlModelView, PostModelView,
-                            CategoryModelView)
+                                     payload_handler, request_handler,
+                                     identity_cache)
+from pagetags.post_queue import post_queue
+from pagetags.instrumentation import query_instrumentation
+from pagetags.metrics import metrics
+from pagetags.profiling import request_profiler
+from pagetags import jwt, response_cache, page_cache, fragment_cache
 
 
 def initialize_extensions(app):
@@ -21,6 +21,26 @@ def initialize_extensions(app):
     jwt.jwt_payload_callback = payload_handler
     jwt.request_callback = request_handler
     jwt.init_app(app)
+    identity_cache.init_app(app)
+
+    response_cache.init_app(app)
+    page_cache.init_app(app)
+    fragment_cache.init_app(app)
+
+    post_queue.init_app(app)
+
+    query_instrumentation.init_app(app)
+    metrics.init_app(app)
+    request_profiler.init_app(app)
+
+
+def initialize_admin(app):
+    # Flask-Admin is imported only by the applications that serve the admin
+    # views, in order to reduce the startup time of the other applications
+    from flask_admin import Admin
+    from pagetags.admin import (UserModelView, AuthenticatedIndexView,
+                                TagModelView, UrlModelView, PostModelView,
+                                CategoryModelView)
 
     admin = Admin(app, name='admin', template_mode='bootstrap3',
                   index_view=AuthenticatedIndexView())
@@ -0,0 +1,506 @@
+from argparse import ArgumentTypeError
+from collections import namedtuple
+from datetime import datetime
+from io import BytesIO
+import csv
+import io
+
+from pagetags import db, argtypes
+from pagetags.models import (
+    Url, Tag, Category, Post, PostCategory, ImportCheckpoint, post_tags,
+    IN_CLAUSE_CHUNK_SIZE, SEARCH_CONFIGURATION
+)
+from pagetags.metrics import metrics
+
+
+try:
+    text_type = unicode
+except NameError:
+    text_type = str
+
+
+CSV_COLUMNS = ["title", "url", "tags", "categories", "added_at"]
+
+
+ImportProgress = namedtuple(
+    "ImportProgress", ["position", "imported", "invalid"])
+
+
+def open_csv(path):
+    """Open a CSV file for reading
+
+    :param str path: the file path
+    :returns: the file object
+    """
+    # the csv module of python 2 reads bytes
+    if text_type is str:
+        return io.open(path, newline="", encoding="utf-8")
+
+    return open(path, "rb")
+
+
+def _text(value):
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+
+    return value
+
+
+def _names(value):
+    if value is None:
+        return None
+
+    names = [name.strip() for name in value.split(",")]
+
+    return [name for name in names if name]
+
+
+def read_csv(f):
+    """Read the posts of a CSV file
+
+    The file must have a header with the title, url, tags and categories
+    columns and optionally the added_at column. The tags and categories are
+    separated by commas.
+
+    :param f: the file object
+    :rtype: generator
+    :returns: the posts as dictionaries
+    """
+    for row in csv.DictReader(f):
+        record = {
+            column: _text(value)
+            for column, value in row.items()
+            if column in CSV_COLUMNS
+        }
+
+        for column in ["tags", "categories"]:
+            if column in record:
+                record[column] = _names(record[column])
+
+        if not record.get("added_at"):
+            record.pop("added_at", None)
+
+        yield record
+
+
+def parse_post(record):
+    """Validate a post record of an import
+
+    :param dict record: the post with the title, url, tags and categories
+        keys and optionally the added_at key
+    :rtype: dict
+    :returns: the validated post. The added_at value is None if the record
+        doesn't have one
+    :raises ArgumentTypeError: if the post is invalid
+    """
+    post = argtypes.new_post(record)
+
+    post["tags"] = sorted(set(post["tags"]))
+    post["categories"] = sorted(set(post["categories"]))
+
+    added_at = record.get("added_at")
+    if added_at is None:
+        post["added_at"] = None
+    elif isinstance(added_at, argtypes.string_types):
+        post["added_at"] = argtypes.timestamp(added_at)
+    else:
+        raise ArgumentTypeError("The added_at field must be a string")
+
+    return post
+
+
+def _copy_value(value):
+    if value is None:
+        return u"\\N"
+    elif isinstance(value, datetime):
+        return text_type(value.isoformat())
+
+    value = text_type(value)
+
+    for character, escaped in [(u"\\", u"\\\\"), (u"\t", u"\\t"),
+                               (u"\n", u"\\n"), (u"\r", u"\\r")]:
+        value = value.replace(character, escaped)
+
+    return value
+
+
+def _copy_rows(cursor, table, columns, rows):
+    data = BytesIO()
+    for row in rows:
+        line = u"\t".join(_copy_value(value) for value in row) + u"\n"
+        data.write(line.encode("utf-8"))
+
+    data.seek(0)
+
+    cursor.copy_expert(
+        "COPY %s (%s) FROM STDIN" % (table, ", ".join(columns)), data)
+
+
+POSTGRESQL_STAGING_TABLES = [
+    """
+    CREATE TEMPORARY TABLE import_posts (
+        position integer NOT NULL,
+        post_id integer,
+        title varchar(256) NOT NULL,
+        url varchar(1024) NOT NULL,
+        added_at timestamp
+    ) ON COMMIT DROP
+    """,
+    """
+    CREATE TEMPORARY TABLE import_post_tags (
+        position integer NOT NULL,
+        name varchar(100) NOT NULL
+    ) ON COMMIT DROP
+    """,
+    """
+    CREATE TEMPORARY TABLE import_post_categories (
+        position integer NOT NULL,
+        name varchar(40) NOT NULL
+    ) ON COMMIT DROP
+    """
+]
+
+
+POSTGRESQL_MERGE_STATEMENTS = [
+    """
+    UPDATE import_posts
+    SET post_id = nextval(pg_get_serial_sequence('posts', 'id'))
+    """,
+    """
+    INSERT INTO urls (url, added_at, changed_at)
+    SELECT DISTINCT url, :now, :now FROM import_posts
+    ON CONFLICT (url) DO UPDATE SET changed_at = excluded.changed_at
+    """,
+    """
+    INSERT INTO tags (name, post_count, changed_at)
+    SELECT name, count(*), :now FROM import_post_tags GROUP BY name
+    ON CONFLICT (name) DO UPDATE
+    SET post_count = tags.post_count + excluded.post_count,
+        changed_at = excluded.changed_at
+    """,
+    """
+    INSERT INTO categories (name, added_at, post_count, changed_at)
+    SELECT name, :now, count(*), :now FROM import_post_categories
+    GROUP BY name
+    ON CONFLICT (name) DO UPDATE
+    SET post_count = categories.post_count + excluded.post_count,
+        changed_at = excluded.changed_at
+    """,
+    """
+    INSERT INTO posts (id, url_id, title, added_at, changed_at, search_vector)
+    SELECT import_posts.post_id, urls.id, import_posts.title,
+           coalesce(import_posts.added_at, :now), :now,
+           to_tsvector(:configuration,
+                       import_posts.title || ' ' || import_posts.url)
+    FROM import_posts JOIN urls ON urls.url = import_posts.url
+    """,
+    """
+    INSERT INTO post_tags (post_id, tag_id)
+    SELECT import_posts.post_id, tags.id
+    FROM import_post_tags
+    JOIN import_posts ON import_posts.position = import_post_tags.position
+    JOIN tags ON tags.name = import_post_tags.name
+    """,
+    """
+    INSERT INTO post_categories (post_id, category_id, assigned_at)
+    SELECT import_posts.post_id, categories.id, :now
+    FROM import_post_categories
+    JOIN import_posts
+        ON import_posts.position = import_post_categories.position
+    JOIN categories ON categories.name = import_post_categories.name
+    """
+]
+
+
+def _copy_batch(session, posts, now):
+    """Import a batch of posts into a PostgreSQL database
+
+    The posts are copied into temporary staging tables using COPY and they
+    are merged into the urls, tags, categories, posts, post_tags and
+    post_categories tables using one statement per table.
+    """
+    for statement in POSTGRESQL_STAGING_TABLES:
+        session.execute(statement)
+
+    cursor = session.connection().connection.cursor()
+
+    try:
+        _copy_rows(
+            cursor,
+            "import_posts",
+            ["position", "title", "url", "added_at"],
+            [
+                (position, post["title"], post["url"], post["added_at"])
+                for position, post in enumerate(posts)
+            ]
+        )
+
+        for field in ["tags", "categories"]:
+            _copy_rows(
+                cursor,
+                "import_post_%s" % field,
+                ["position", "name"],
+                [
+                    (position, name)
+                    for position, post in enumerate(posts)
+                    for name in post[field]
+                ]
+            )
+    finally:
+        cursor.close()
+
+    for statement in POSTGRESQL_MERGE_STATEMENTS:
+        session.execute(
+            statement, {"now": now, "configuration": SEARCH_CONFIGURATION})
+
+
+def _upsert_statement(sql):
+    return db.text(sql).bindparams(db.bindparam("now", type_=db.DateTime))
+
+
+SQLITE_URL_UPSERT = _upsert_statement(
+    """
+    INSERT INTO urls (url, added_at, changed_at) VALUES (:url, :now, :now)
+    ON CONFLICT (url) DO UPDATE SET changed_at = excluded.changed_at
+    """
+)
+
+SQLITE_TAG_UPSERT = _upsert_statement(
+    """
+    INSERT INTO tags (name, post_count, changed_at)
+    VALUES (:name, :post_count, :now)
+    ON CONFLICT (name) DO UPDATE
+    SET post_count = post_count + excluded.post_count,
+        changed_at = excluded.changed_at
+    """
+)
+
+SQLITE_CATEGORY_UPSERT = _upsert_statement(
+    """
+    INSERT INTO categories (name, added_at, post_count, changed_at)
+    VALUES (:name, :now, :post_count, :now)
+    ON CONFLICT (name) DO UPDATE
+    SET post_count = post_count + excluded.post_count,
+        changed_at = excluded.changed_at
+    """
+)
+
+
+def _name_counts(posts, field):
+    counts = {}
+    for post in posts:
+        for name in post[field]:
+            counts[name] = counts.get(name, 0) + 1
+
+    return counts
+
+
+def _ids(session, column, values):
+    values = list(values)
+    model = column.class_
+
+    ids = {}
+    for i in range(0, len(values), IN_CLAUSE_CHUNK_SIZE):
+        chunk = values[i:i + IN_CLAUSE_CHUNK_SIZE]
+
+        ids.update(
+            session.query(column, model.id).filter(column.in_(chunk)).all())
+
+    return ids
+
+
+def _executemany_batch(session, posts, now):
+    """Import a batch of posts into a SQLite database
+
+    Every table is updated using a single executemany call.
+    """
+    urls = sorted({post["url"] for post in posts})
+    session.execute(
+        SQLITE_URL_UPSERT, [{"url": url, "now": now} for url in urls])
+
+    tag_counts = _name_counts(posts, "tags")
+    if tag_counts:
+        session.execute(
+            SQLITE_TAG_UPSERT,
+            [
+                {"name": name, "post_count": count, "now": now}
+                for name, count in sorted(tag_counts.items())
+            ]
+        )
+
+    category_counts = _name_counts(posts, "categories")
+    if category_counts:
+        session.execute(
+            SQLITE_CATEGORY_UPSERT,
+            [
+                {"name": name, "post_count": count, "now": now}
+                for name, count in sorted(category_counts.items())
+            ]
+        )
+
+    url_ids = _ids(session, Url.url, urls)
+    tag_ids = _ids(session, Tag.name, tag_counts)
+    category_ids = _ids(session, Category.name, category_counts)
+
+    # the database is locked by the upserts, so the post ids that follow the
+    # current maximum id can't be used by another transaction
+    first_post_id = session.query(
+        db.func.coalesce(db.func.max(Post.id), 0)).scalar() + 1
+
+    post_ids = range(first_post_id, first_post_id + len(posts))
+
+    session.execute(
+        Post.__table__.insert(),
+        [
+            {
+                "id": post_id,
+                "url_id": url_ids[post["url"]],
+                "title": post["title"],
+                "added_at": post["added_at"] or now,
+                "changed_at": now
+            }
+            for post_id, post in zip(post_ids, posts)
+        ]
+    )
+
+    session.execute(
+        db.text(
+            "INSERT INTO posts_search (rowid, title, url) "
+            "VALUES (:post_id, :title, :url)"
+        ),
+        [
+            {"post_id": post_id, "title": post["title"], "url": post["url"]}
+            for post_id, post in zip(post_ids, posts)
+        ]
+    )
+
+    post_tag_rows = [
+        {"post_id": post_id, "tag_id": tag_ids[name]}
+        for post_id, post in zip(post_ids, posts)
+        for name in post["tags"]
+    ]
+    if post_tag_rows:
+        session.execute(post_tags.insert(), post_tag_rows)
+
+    post_category_rows = [
+        {
+            "post_id": post_id,
+            "category_id": category_ids[name],
+            "assigned_at": now
+        }
+        for post_id, post in zip(post_ids, posts)
+        for name in post["categories"]
+    ]
+    if post_category_rows:
+        session.execute(PostCategory.__table__.insert(), post_category_rows)
+
+
+def _invalidated_responses(posts):
+    dependencies = {"posts", "tags", "categories"}
+
+    for post in posts:
+        dependencies.add(u"url:%s" % post["url"])
+        dependencies.update(u"tag:%s" % name for name in post["tags"])
+        dependencies.update(
+            u"category:%s" % name for name in post["categories"])
+
+    return dependencies
+
+
+def import_batch(session, posts):
+    """Import a batch of validated posts
+
+    PostgreSQL databases are loaded using COPY and SQLite databases using
+    executemany. The post counts and change times of the urls, tags and
+    categories are updated and the cached responses that depend on them are
+    invalidated after the commit.
+
+    :param session: the database session
+    :param list posts: the posts that were returned by parse_post
+    """
+    if not posts:
+        return
+
+    dialect_name = session.get_bind().dialect.name
+    now = datetime.utcnow()
+
+    if dialect_name == "postgresql":
+        _copy_batch(session, posts, now)
+    elif dialect_name == "sqlite":
+        _executemany_batch(session, posts, now)
+    else:
+        raise ValueError("unsupported database %s" % dialect_name)
+
+    session.info.setdefault("invalidated_responses", set())\
+                .update(_invalidated_responses(posts))
+
+
+def _commit_batch(session, name, posts, position, previous_result):
+    import_batch(session, posts)
+    ImportCheckpoint.save(session, name, position)
+
+    session.commit()
+
+    metrics.count_posts("import", len(posts))
+
+    processed = position - previous_result.position
+
+    return ImportProgress(
+        position,
+        previous_result.imported + len(posts),
+        previous_result.invalid + processed - len(posts)
+    )
+
+
+def import_posts(session, records, name, batch_size=1000, restart=False,
+                 progress=None, invalid_record=None):
+    """Import posts in batches
+
+    Every batch is imported and committed together with the number of
+    records that have been processed. An import that is interrupted
+    continues after the last committed batch when it runs again with the
+    same name.
+
+    :param session: the database session
+    :param records: an iterable of post records
+    :param str name: the import name
+    :param int batch_size: the number of records of every batch
+    :param bool restart: ignore the records that were processed by a
+        previous run of the import
+    :param progress: a function that is called with an ImportProgress object
+        after every batch
+    :param invalid_record: a function that is called with the position and
+        the error of every invalid record
+    :rtype: ImportProgress
+    :returns: the import result
+    """
+    start = 0 if restart else ImportCheckpoint.get_position(session, name)
+
+    result = ImportProgress(start, 0, 0)
+    posts = []
+    position = 0
+
+    for position, record in enumerate(records, 1):
+        if position <= start:
+            continue
+
+        try:
+            posts.append(parse_post(record))
+        except ArgumentTypeError as e:
+            if invalid_record is not None:
+                invalid_record(position, str(e))
+
+        if position - result.position == batch_size:
+            result = _commit_batch(session, name, posts, position, result)
+            posts = []
+
+            if progress is not None:
+                progress(result)
+
+    if position > result.position or restart:
+        result = _commit_batch(session, name, posts, position, result)
+
+        if progress is not None:
+            progress(result)
+
+    return result
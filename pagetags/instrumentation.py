@@ -0,0 +1,153 @@
+from timeit import default_timer
+
+from flask import g, request, current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+# the maximum length of the slowest statement in the slow request log
+STATEMENT_LOG_LENGTH = 500
+
+
+class QueryStatistics(object):
+    """The SQL queries that were executed while handling a request"""
+
+    def __init__(self):
+        self.started_at = default_timer()
+        self.count = 0
+        self.duration = 0.0
+        self.slowest_duration = 0.0
+        self.slowest_statement = None
+
+    def add(self, statement, duration):
+        """Add an executed query
+
+        :param str statement: the SQL statement
+        :param float duration: the execution time in seconds
+        """
+        self.count += 1
+        self.duration += duration
+
+        if self.slowest_statement is None or duration > self.slowest_duration:
+            self.slowest_duration = duration
+            self.slowest_statement = statement
+
+    @property
+    def request_duration(self):
+        return default_timer() - self.started_at
+
+
+def _query_statistics():
+    if not has_app_context():
+        return None
+
+    return g.get("query_statistics")
+
+
+def _record_query(context, statement):
+    statistics = _query_statistics()
+    started_at = getattr(context, "_query_started_at", None)
+
+    if statistics is not None and started_at is not None:
+        context._query_started_at = None
+        statistics.add(statement, default_timer() - started_at)
+
+
+# the start time is kept on the execution context of the statement, so that
+# it is discarded together with the context when the statement fails
+@event.listens_for(Engine, "before_cursor_execute")
+def start_query_timer(conn, cursor, statement, parameters, context,
+                      executemany):
+    if context is not None and _query_statistics() is not None:
+        context._query_started_at = default_timer()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def record_query(conn, cursor, statement, parameters, context, executemany):
+    _record_query(context, statement)
+
+
+@event.listens_for(Engine, "handle_error")
+def record_failed_query(exception_context):
+    _record_query(
+        exception_context.execution_context, exception_context.statement)
+
+
+class QueryInstrumentation(object):
+    """Record the number and the duration of the SQL queries of every
+    request
+
+    The statistics are added to the X-Query-Count and Server-Timing response
+    headers and the requests that are slower or execute more queries than
+    the configured thresholds are logged.
+    """
+
+    def __init__(self):
+        self.headers = False
+        self.slow_request_duration = None
+        self.slow_request_query_count = None
+
+    def init_app(self, app):
+        if not app.config["SQL_INSTRUMENTATION_ENABLED"]:
+            return
+
+        self.headers = app.config["SQL_INSTRUMENTATION_HEADERS"]
+        self.slow_request_duration = app.config["SLOW_REQUEST_DURATION"]
+        self.slow_request_query_count = app.config["SLOW_REQUEST_QUERY_COUNT"]
+
+        app.before_request(self.start_request)
+        app.after_request(self.finish_request)
+        app.teardown_request(self.discard_statistics)
+
+    def start_request(self):
+        g.query_statistics = QueryStatistics()
+
+    def _is_slow(self, statistics, request_duration):
+        if (self.slow_request_duration is not None and
+                request_duration * 1000 >= self.slow_request_duration):
+            return True
+
+        return (self.slow_request_query_count is not None and
+                statistics.count >= self.slow_request_query_count)
+
+    def finish_request(self, response):
+        statistics = g.get("query_statistics")
+        if statistics is None:
+            return response
+
+        request_duration = statistics.request_duration
+
+        if self.headers:
+            response.headers["X-Query-Count"] = str(statistics.count)
+            response.headers.add(
+                "Server-Timing",
+                'db;dur=%.3f;desc="%d queries", app;dur=%.3f' % (
+                    statistics.duration * 1000,
+                    statistics.count,
+                    request_duration * 1000
+                )
+            )
+
+        if self._is_slow(statistics, request_duration):
+            msg = "slow request: method(%s) path(%s) status(%d) " \
+                  "duration(%.1fms) queries(%d) query_duration(%.1fms) " \
+                  "slowest_query_duration(%.1fms) slowest_query(%s)"
+            current_app.logger.warning(
+                msg,
+                request.method,
+                request.full_path,
+                response.status_code,
+                request_duration * 1000,
+                statistics.count,
+                statistics.duration * 1000,
+                statistics.slowest_duration * 1000,
+                (statistics.slowest_statement or "")[:STATEMENT_LOG_LENGTH]
+            )
+
+        return response
+
+    def discard_statistics(self, exception):
+        g.pop("query_statistics", None)
+
+
+query_instrumentation = QueryInstrumentation()
@@ -1,12 +1,12 @@
 import logging.config
 
 from flask import Flask
-from flask_restful import Api
-from flask_restful_swagger import swagger
 
-from pagetags.api.routes import add_api_routes
-from pagetags.views.routes import add_view_routes
-from pagetags.extensions import initialize_extensions
+from pagetags.extensions import initialize_extensions, initialize_admin
+
+
+# the parts of the application that can be selected when it is created
+COMPONENTS = ("api", "views", "admin")
 
 
 def initialize_logging(app):
@@ -15,14 +15,67 @@ def initialize_logging(app):
         logging.config.dictConfig(logging_configuration)
 
 
-def create_app(settings_file, environment_type=None):
+def add_api(app):
+    # the API resources and the swagger documentation are imported only by
+    # the applications that serve the API
+    from flask_restful import Api
+
+    from pagetags.api.routes import add_api_routes
+    from pagetags.api.serializers import output_json
+    from pagetags.api.spec import (ApiSpecResource, load_spec, API_VERSION,
+                                   SPEC_PATH)
+
+    spec_file = app.config["API_SPEC_FILE"]
+
+    if spec_file is None:
+        from flask_restful_swagger import swagger
+
+        api = swagger.docs(
+            Api(app), apiVersion=API_VERSION, api_spec_url=SPEC_PATH)
+    else:
+        # the resources are registered without the swagger documentation
+        # endpoints and the specification is served from the file
+        api = Api(app)
+        api.add_resource(
+            ApiSpecResource,
+            SPEC_PATH,
+            SPEC_PATH + ".json",
+            resource_class_kwargs={"spec": load_spec(spec_file)}
+        )
+
+    # the responses that have been created by the compiled serializers are
+    # written without serializing them again
+    api.representation("application/json")(output_json)
+
+    add_api_routes(api)
+
+
+def add_views(app):
+    from pagetags.views.routes import add_view_routes
+
+    add_view_routes(app)
+
+
+def create_app(settings_file, environment_type=None, components=None):
     """Create the application object
 
     :param settings_file: the path to the configuration file
     :param environment_type: the environment type. Available options are
         development, production and testing
+    :param components: the parts of the application that are served. The
+        available components are api, views and admin. The admin component
+        requires the views component. Defaults to all the components
     :return: the Flask application object
     """
+    components = COMPONENTS if components is None else components
+
+    for component in components:
+        if component not in COMPONENTS:
+            raise ValueError("unknown application component %s" % component)
+
+    if "admin" in components and "views" not in components:
+        raise ValueError("the admin component requires the views component")
+
     app = Flask(__name__)
 
     app.config.from_object("pagetags.configuration.default")
@@ -42,9 +95,14 @@ def create_app(settings_file, environment_type=None):
     initialize_logging(app)
 
     initialize_extensions(app)
-    add_view_routes(app)
 
-    api = swagger.docs(Api(app), apiVersion="1")
-    add_api_routes(api)
+    if "admin" in components:
+        initialize_admin(app)
+
+    if "views" in components:
+        add_views(app)
+
+    if "api" in components:
+        add_api(app)
 
     return app
@@ -0,0 +1,243 @@
+import atexit
+import os
+from timeit import default_timer
+
+from flask import g, request, current_app, Response
+
+from pagetags import db, response_cache, page_cache, fragment_cache
+from pagetags.authentication import identity_cache
+
+
+# the environment variables that enable the multi-process mode of
+# prometheus_client
+MULTIPROCESS_DIRECTORY_VARIABLES = [
+    "PROMETHEUS_MULTIPROC_DIR", "prometheus_multiproc_dir"
+]
+
+
+def multiprocess_directory():
+    """The directory that the processes store their metrics in or None if
+    the multi-process mode isn't enabled"""
+    for variable in MULTIPROCESS_DIRECTORY_VARIABLES:
+        directory = os.environ.get(variable)
+        if directory:
+            return directory
+
+    return None
+
+
+def endpoint_name(app, endpoint):
+    """The name of an endpoint that is used as a metric label
+
+    The API resources are named after their class, for example
+    PostsResource, and the views after their module and function, for
+    example views.tags.tag.
+    """
+    view = app.view_functions.get(endpoint)
+    if view is None:
+        return "unknown"
+
+    view_class = getattr(view, "view_class", None)
+    if view_class is not None:
+        return view_class.__name__
+
+    module = view.__module__
+    if module.startswith("pagetags."):
+        module = module[len("pagetags."):]
+
+    return "%s.%s" % (module, view.__name__)
+
+
+class Metrics(object):
+    """Prometheus metrics of the requests, the database connection pool, the
+    caches and the created posts
+
+    The metrics are served by the /metrics endpoint. When the application is
+    served by many processes the PROMETHEUS_MULTIPROC_DIR environment
+    variable must be set to a directory that is shared by the processes, so
+    that the endpoint returns the aggregated metrics of all of them.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.registry = None
+        self.caches = {}
+        self._cache_counts = {}
+        self._endpoint_names = {}
+
+    def init_app(self, app):
+        self.enabled = app.config["METRICS_ENABLED"]
+        if not self.enabled:
+            return
+
+        try:
+            import prometheus_client
+        except ImportError:
+            raise RuntimeError("prometheus_client is required by the metrics")
+
+        self.registry = prometheus_client.CollectorRegistry()
+
+        self.request_duration = prometheus_client.Histogram(
+            "pagetags_request_duration_seconds",
+            "The time it took to handle the requests",
+            ["endpoint", "method"],
+            buckets=app.config["METRICS_REQUEST_DURATION_BUCKETS"],
+            registry=self.registry
+        )
+
+        self.requests = prometheus_client.Counter(
+            "pagetags_requests",
+            "The number of handled requests",
+            ["endpoint", "method", "status"],
+            registry=self.registry
+        )
+
+        self.pool_checked_out = prometheus_client.Gauge(
+            "pagetags_db_pool_checked_out_connections",
+            "The number of database connections that are in use",
+            multiprocess_mode="livesum",
+            registry=self.registry
+        )
+
+        self.pool_overflow = prometheus_client.Gauge(
+            "pagetags_db_pool_overflow_connections",
+            "The number of database connections that exceed the pool size",
+            multiprocess_mode="livesum",
+            registry=self.registry
+        )
+
+        self.cache_hits = prometheus_client.Counter(
+            "pagetags_cache_hits",
+            "The number of cache hits",
+            ["cache"],
+            registry=self.registry
+        )
+
+        self.cache_misses = prometheus_client.Counter(
+            "pagetags_cache_misses",
+            "The number of cache misses",
+            ["cache"],
+            registry=self.registry
+        )
+
+        self.posts = prometheus_client.Counter(
+            "pagetags_ingested_posts",
+            "The number of created, queued and imported posts",
+            ["source"],
+            registry=self.registry
+        )
+
+        self.caches = {
+            "response": response_cache,
+            "page": page_cache,
+            "fragment": fragment_cache,
+            "identity": identity_cache
+        }
+        self._cache_counts = {}
+        self._endpoint_names = {}
+
+        self._exposition_registry = self.registry
+        self._exposition = prometheus_client.generate_latest
+        self.content_type = prometheus_client.CONTENT_TYPE_LATEST
+
+        if multiprocess_directory() is not None:
+            from prometheus_client import multiprocess
+
+            self._exposition_registry = prometheus_client.CollectorRegistry()
+            multiprocess.MultiProcessCollector(self._exposition_registry)
+
+            # remove the live gauges of the process when it exits. The
+            # process id is read at exit, because the application can be
+            # loaded before the worker processes are forked
+            atexit.register(
+                lambda: multiprocess.mark_process_dead(os.getpid()))
+
+        app.add_url_rule("/metrics", "metrics", self.view)
+
+        app.before_request(self.start_request)
+        app.after_request(self.finish_request)
+        # the requests that fail with an unhandled exception don't run the
+        # after request functions
+        app.teardown_request(self.finish_failed_request)
+
+    def _endpoint_name(self, app, endpoint):
+        name = self._endpoint_names.get(endpoint)
+        if name is None:
+            name = endpoint_name(app, endpoint)
+            self._endpoint_names[endpoint] = name
+
+        return name
+
+    def start_request(self):
+        g.metrics_request_started_at = default_timer()
+
+    def _record_request(self, status_code):
+        started_at = g.pop("metrics_request_started_at", None)
+        if started_at is None or request.endpoint == "metrics":
+            return
+
+        endpoint = self._endpoint_name(current_app, request.endpoint)
+
+        self.request_duration.labels(endpoint, request.method)\
+                             .observe(default_timer() - started_at)
+        self.requests.labels(endpoint, request.method, str(status_code)).inc()
+
+        self._update_pool()
+        self._update_caches()
+
+    def finish_request(self, response):
+        self._record_request(response.status_code)
+
+        return response
+
+    def finish_failed_request(self, exception):
+        # the requests that have been recorded by finish_request are skipped
+        if exception is not None:
+            self._record_request(500)
+
+    def _update_pool(self):
+        pool = db.engine.pool
+
+        # only the queue pool, that is used by PostgreSQL, reports its
+        # connections
+        if hasattr(pool, "checkedout"):
+            self.pool_checked_out.set(pool.checkedout())
+            self.pool_overflow.set(max(pool.overflow(), 0))
+
+    def _update_caches(self):
+        # the caches count their hits and misses themselves. Only the
+        # change since the last request is added to the counters
+        for name, cache in self.caches.items():
+            for counter, count in [(self.cache_hits, cache.hits),
+                                   (self.cache_misses, cache.misses)]:
+                key = (name, counter)
+                previous_count = self._cache_counts.get(key, 0)
+
+                # the count is reset when the cache is initialized again
+                increment = count - previous_count
+                if increment < 0:
+                    increment = count
+
+                if increment > 0:
+                    counter.labels(name).inc(increment)
+
+                self._cache_counts[key] = count
+
+    def count_posts(self, source, count=1):
+        """Count ingested posts
+
+        :param str source: the source of the posts, for example api, bulk,
+            queue, worker or import
+        :param int count: the number of posts
+        """
+        if self.enabled and count > 0:
+            self.posts.labels(source).inc(count)
+
+    def view(self):
+        return Response(
+            self._exposition(self._exposition_registry),
+            content_type=self.content_type
+        )
+
+
+metrics = Metrics()
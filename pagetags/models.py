@@ -1,17 +1,133 @@
 from datetime import datetime
 from uuid import uuid4
+import json
 
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import UserMixin
-from sqlalchemy.orm import validates
+from sqlalchemy import event
+from sqlalchemy.orm import validates, Session
+from sqlalchemy.dialects.postgresql import (
+    insert as postgresql_insert, TSVECTOR
+)
+
+from pagetags import db, response_cache, page_cache
+from pagetags.pagination import KeysetPage, SearchPage, paginate
+
+
+IN_CLAUSE_CHUNK_SIZE = 500
+
+SEARCH_CONFIGURATION = "english"
+
+
+def get_by_column_values(session, column, values):
+    """Retrieve the objects whose column value is in the given values
+
+    The values are queried in chunks so that the number of bound parameters
+    stays below the database limits.
+
+    :param session: the database session
+    :param column: the model column to filter on
+    :param values: the values to look for
+    :rtype: list
+    :returns: the retrieved objects
+    """
+    values = list(values)
+    model = column.class_
+
+    objects = []
+    for i in range(0, len(values), IN_CLAUSE_CHUNK_SIZE):
+        chunk = values[i:i + IN_CLAUSE_CHUNK_SIZE]
+
+        objects.extend(session.query(model).filter(column.in_(chunk)).all())
+
+    return objects
+
+
+def insert_missing_names(session, model, names, **values):
+    """Insert the rows for the names that don't exist and retrieve the
+    objects for all the given names
+
+    On PostgreSQL every chunk of names is resolved in a single round trip
+    using INSERT ... ON CONFLICT DO NOTHING RETURNING combined with a select
+    of the existing rows. On SQLite INSERT OR IGNORE is used followed by a
+    select. Concurrent transactions that insert the same names don't cause
+    unique constraint violations.
 
-from pagetags import db
+    :param session: the database session
+    :param model: the model class. It must have a unique name column
+    :param names: the names to resolve
+    :param values: the values of the other columns of the inserted rows
+    :rtype: dict
+    :returns: the model objects keyed by their name
+    """
+    names = list(set(names))
+    if not names:
+        return {}
+
+    table = model.__table__
+    dialect_name = session.get_bind().dialect.name
+
+    session.flush()
+
+    objects = []
+    for i in range(0, len(names), IN_CLAUSE_CHUNK_SIZE):
+        chunk = names[i:i + IN_CLAUSE_CHUNK_SIZE]
+        rows = [dict(values, name=name) for name in chunk]
+
+        if dialect_name == "postgresql":
+            inserted = postgresql_insert(table)\
+                .values(rows)\
+                .on_conflict_do_nothing(index_elements=[table.c.name])\
+                .returning(*table.c)\
+                .cte("inserted")
+
+            statement = db.union_all(
+                db.select(list(inserted.c)),
+                db.select(list(table.c)).where(table.c.name.in_(chunk))
+            )
+
+            objects.extend(
+                session.query(model).from_statement(statement).all())
+        elif dialect_name == "sqlite":
+            session.execute(table.insert().prefix_with("OR IGNORE"), rows)
+
+            objects.extend(
+                session.query(model).filter(model.name.in_(chunk)).all())
+        else:
+            existing_objects = session.query(model)\
+                                      .filter(model.name.in_(chunk))\
+                                      .all()
+
+            existing_names = {obj.name for obj in existing_objects}
+
+            objects.extend(existing_objects)
+            objects.extend(
+                model.create(session, name)
+                for name in chunk
+                if name not in existing_names
+            )
+
+    name_objects = {obj.name: obj for obj in objects}
+
+    # a row that was inserted by a concurrent transaction after this
+    # statement started is not visible to it, so it is selected again
+    missing_names = set(names).difference(name_objects)
+    if missing_names:
+        name_objects.update({
+            obj.name: obj
+            for obj in get_by_column_values(
+                session, model.name, missing_names)
+        })
+
+    return name_objects
 
 
 post_tags = db.Table(
     "post_tags",
     db.Column("post_id", db.Integer, nullable=False),
     db.Column("tag_id", db.Integer, nullable=False),
+    db.PrimaryKeyConstraint("post_id", "tag_id", name="pk_post_tags"),
+    db.Index("ix_post_tags__tag_id__post_id", "tag_id", "post_id"),
     db.ForeignKeyConstraint(
         ["post_id"], ["posts.id"],
         name="fk_post_id__posts",
@@ -97,8 +213,13 @@ class Tag(db.Model):
         db.UniqueConstraint("name", name="uq_tags__name")
     )
 
+    NAME_LENGTH = 100
+
     id = db.Column(db.Integer, nullable=False)
-    name = db.Column(db.String(100), nullable=False)
+    name = db.Column(db.String(NAME_LENGTH), nullable=False)
+    post_count = db.Column(
+        db.Integer, nullable=False, default=0, server_default="0")
+    changed_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     posts = db.relationship(
         'Post',
@@ -110,6 +231,17 @@ class Tag(db.Model):
     def get_by_name(cls, session, name):
         return session.query(cls).filter_by(name=name).one_or_none()
 
+    @classmethod
+    def get_changed_at(cls, session, name):
+        """Retrieve the last time the posts of a tag changed
+
+        :param session: the database session
+        :param str name: the tag name
+        :rtype: datetime
+        :returns: the change time or None if the tag doesn't exist
+        """
+        return session.query(cls.changed_at).filter_by(name=name).scalar()
+
     @classmethod
     def create(cls, session, name):
         tag = cls(name=name)
@@ -127,30 +259,61 @@ class Tag(db.Model):
 
         return tag
 
+    @classmethod
+    def get_or_create_many(cls, session, names):
+        """Retrieve the tags with the given names creating the ones that
+        don't exist
+
+        :param session: the database session
+        :param names: the tag names
+        :rtype: dict
+        :returns: the tag objects keyed by their name
+        """
+        return insert_missing_names(session, cls, names)
+
     @classmethod
     def get_tags_by_page(cls, page, per_page=10):
         # TODO: pass the session as argument
 
-        return cls.query\
-                  .order_by(db.asc(cls.name))\
-                  .paginate(page=page, per_page=per_page)
+        query = cls.query.order_by(db.asc(cls.name))
+
+        return paginate(query, page, per_page)
 
     def get_posts_by_page(self, page, per_page=10):
-        return Post.query\
-                   .filter(Post.tags.contains(self))\
-                   .order_by(db.desc(Post.added_at))\
-                   .paginate(page=page, per_page=per_page, error_out=False)
+        query = Post.with_related(Post.query)\
+                    .filter(Post.tags.contains(self))\
+                    .order_by(db.desc(Post.added_at), db.desc(Post.id))
+
+        return paginate(query, page, per_page, error_out=False)
+
+    def get_posts_after(self, session, after=None, per_page=10):
+        query = session.query(Post).filter(Post.tags.contains(self))
+
+        return Post.get_page_after(query, after, per_page)
 
     def get_posts(self, session):
         return session.query(Post)\
                       .filter(Post.tags.contains(self))\
                       .all()
 
-    def post_count(self, session, ):
+    def count_posts(self, session):
         return session.query(Post) \
                       .filter(Post.tags.contains(self)) \
                       .count()
 
+    @classmethod
+    def recompute_post_counts(cls, session):
+        """Recompute the post count of every tag
+
+        :param session: the database session
+        """
+        post_count = db.select([db.func.count()])\
+                       .where(post_tags.c.tag_id == cls.id)\
+                       .as_scalar()
+
+        session.query(cls).update(
+            {cls.post_count: post_count}, synchronize_session=False)
+
     def __unicode__(self):
         return self.name
 
@@ -160,7 +323,9 @@ class Url(db.Model):
 
     __table_args__ = (
         db.PrimaryKeyConstraint("id", name="pk_urls"),
-        db.UniqueConstraint("url", name="uq_urls__url")
+        db.UniqueConstraint("url", name="uq_urls__url"),
+        db.Index("ix_urls__added_at", "added_at"),
+        db.Index("ix_urls__changed_at", "changed_at")
     )
 
     URL_LENGTH = 1024
@@ -168,6 +333,7 @@ class Url(db.Model):
     id = db.Column(db.Integer, nullable=False)
     url = db.Column(db.String(URL_LENGTH), nullable=False)
     added_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    changed_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     posts = db.relationship(
         "Post",
@@ -187,6 +353,29 @@ class Url(db.Model):
     def get_by_url(cls, session, url):
         return session.query(cls).filter_by(url=url).one_or_none()
 
+    @classmethod
+    def get_changed_at(cls, session, url):
+        """Retrieve the last time the posts of a url changed
+
+        :param session: the database session
+        :param str url: the url
+        :rtype: datetime
+        :returns: the change time or None if the url doesn't exist
+        """
+        return session.query(cls.changed_at).filter_by(url=url).scalar()
+
+    @classmethod
+    def get_last_changed_at(cls, session):
+        """Retrieve the last time any post changed
+
+        Every post has a url, so this is the latest change time of the urls.
+
+        :param session: the database session
+        :rtype: datetime
+        :returns: the change time or None if there are no urls
+        """
+        return session.query(db.func.max(cls.changed_at)).scalar()
+
     @classmethod
     def get_latest(cls, session, count=20):
         return session.query(cls)\
@@ -202,6 +391,28 @@ class Url(db.Model):
 
         return url_object
 
+    @classmethod
+    def get_or_create_many(cls, session, urls):
+        """Retrieve the url objects for the given urls creating the ones that
+        don't exist
+
+        :param session: the database session
+        :param urls: the urls
+        :rtype: dict
+        :returns: the url objects keyed by their url
+        """
+        urls = set(urls)
+
+        url_objects = {
+            url_object.url: url_object
+            for url_object in get_by_column_values(session, cls.url, urls)
+        }
+
+        for url in urls.difference(url_objects):
+            url_objects[url] = cls.create(session, url)
+
+        return url_objects
+
     @classmethod
     def get_posts(cls, session, url):
         url_object = cls.get_by_url(session, url)
@@ -214,10 +425,16 @@ class Url(db.Model):
     def get_posts_by_page(self, page, per_page=10):
         # TODO: pass the session as argument
 
-        return Post.query\
-                   .filter(Post.url == self)\
-                   .order_by(db.desc(Post.added_at))\
-                   .paginate(page=page, per_page=per_page, error_out=False)
+        query = Post.with_related(Post.query)\
+                    .filter(Post.url == self)\
+                    .order_by(db.desc(Post.added_at), db.desc(Post.id))
+
+        return paginate(query, page, per_page, error_out=False)
+
+    def get_posts_after(self, session, after=None, per_page=10):
+        query = session.query(Post).filter(Post.url == self)
+
+        return Post.get_page_after(query, after, per_page)
 
     @validates("url")
     def validate_url(self, key, url):
@@ -249,6 +466,10 @@ class Post(db.Model):
     url_id = db.Column(db.Integer, nullable=False)
     title = db.Column(db.String(TITLE_LENGTH), nullable=False)
     added_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    changed_at = db.Column(db.DateTime, default=datetime.utcnow)
+    search_vector = db.deferred(
+        db.Column(db.Text().with_variant(TSVECTOR(), "postgresql"))
+    )
 
     url = db.relationship(
         "Url",
@@ -270,10 +491,13 @@ class Post(db.Model):
     def create(cls, session, title, url, tags, categories):
         url_object = Url.get_or_create(session, url)
 
-        tag_collection = [Tag.get_or_create(session, tag) for tag in tags]
+        tag_objects = Tag.get_or_create_many(session, tags)
+        tag_collection = [tag_objects[tag] for tag in sorted(tag_objects)]
+
+        category_objects = Category.get_or_create_many(session, categories)
         category_collection = [
-            Category.get_or_create(session, category)
-            for category in categories
+            category_objects[category]
+            for category in sorted(category_objects)
         ]
 
         post = cls(
@@ -288,6 +512,50 @@ class Post(db.Model):
 
         return post
 
+    @classmethod
+    def create_many(cls, session, posts):
+        """Create many posts at once
+
+        The urls, tags and categories of all the posts are retrieved or
+        created using a fixed number of queries.
+
+        :param session: the database session
+        :param list posts: the posts to create. Every post is a dictionary
+            with the title, url, tags and categories keys
+        :rtype: list
+        :returns: the created post objects in the order they were given
+        """
+        url_objects = Url.get_or_create_many(
+            session, [post["url"] for post in posts])
+
+        tag_objects = Tag.get_or_create_many(
+            session, [tag for post in posts for tag in post["tags"]])
+
+        category_objects = Category.get_or_create_many(
+            session,
+            [category for post in posts for category in post["categories"]]
+        )
+
+        added_at = datetime.utcnow()
+
+        post_objects = [
+            cls(
+                title=post["title"],
+                url=url_objects[post["url"]],
+                tags=[tag_objects[tag] for tag in sorted(set(post["tags"]))],
+                added_at=added_at,
+                categories=[
+                    category_objects[category]
+                    for category in sorted(set(post["categories"]))
+                ]
+            )
+            for post in posts
+        ]
+
+        session.add_all(post_objects)
+
+        return post_objects
+
     @classmethod
     def get_latest(cls, session, count=20):
         return session.query(cls)\
@@ -308,9 +576,273 @@ class Post(db.Model):
     def get_latest_by_page(cls, page, per_page=10):
         # TODO: pass the session as argument
 
-        return cls.query\
-                  .order_by(db.desc(cls.added_at))\
-                  .paginate(page=page, per_page=per_page)
+        query = cls.with_related(cls.query)\
+                   .order_by(db.desc(cls.added_at), db.desc(cls.id))
+
+        return paginate(query, page, per_page)
+
+    @classmethod
+    def with_related(cls, query):
+        """Load the url, tags and categories of the posts that are selected
+        by the query
+
+        The related objects of all the selected posts are loaded using a
+        fixed number of queries instead of one query per post.
+
+        :param query: the query that selects the posts
+        :returns: the query with the eager loading options applied
+        """
+        return query.options(
+            db.joinedload(cls.url),
+            db.subqueryload(cls.tags),
+            db.subqueryload(cls.categories)
+        )
+
+    @classmethod
+    def get_latest_after(cls, session, after=None, per_page=10):
+        return cls.get_page_after(session.query(cls), after, per_page)
+
+    @classmethod
+    def get_by_tags_after(cls, session, tags, match_all=True, after=None,
+                          per_page=10):
+        """Retrieve the posts that have all or any of the given tags
+
+        The matching posts are selected with a single grouped query over the
+        post_tags table.
+
+        :param session: the database session
+        :param tags: the tag names
+        :param bool match_all: retrieve the posts that have all the tags if
+            True or any of them if False
+        :param Cursor after: the position after which the posts are
+            retrieved or None to retrieve the first page
+        :param int per_page: the number of posts to retrieve
+        :rtype: KeysetPage
+        :returns: the page of posts
+        """
+        tags = set(tags)
+
+        post_ids = db.select([post_tags.c.post_id])\
+                     .select_from(post_tags.join(
+                         Tag.__table__, Tag.id == post_tags.c.tag_id))\
+                     .where(Tag.name.in_(tags))\
+                     .group_by(post_tags.c.post_id)
+
+        if match_all:
+            post_ids = post_ids.having(db.func.count() == len(tags))
+
+        query = session.query(cls).filter(cls.id.in_(post_ids))
+
+        return cls.get_page_after(query, after, per_page)
+
+    @classmethod
+    def get_page_after(cls, query, after, per_page):
+        """Retrieve the posts that follow the given cursor
+
+        The posts are ordered by (added_at, id) in descending order so that
+        retrieving any page costs the same as retrieving the first one.
+
+        :param query: the query that selects the posts
+        :param Cursor after: the position after which the posts are
+            retrieved or None to retrieve the first page
+        :param int per_page: the number of posts to retrieve
+        :rtype: KeysetPage
+        :returns: the page of posts
+        """
+        if after is not None:
+            query = query.filter(
+                db.tuple_(cls.added_at, cls.id) <
+                db.tuple_(after.added_at, after.id)
+            )
+
+        posts = cls.with_related(query)\
+                   .order_by(db.desc(cls.added_at), db.desc(cls.id))\
+                   .limit(per_page + 1)\
+                   .all()
+
+        return KeysetPage(
+            posts[:per_page], per_page, has_next=len(posts) > per_page)
+
+    @classmethod
+    def search(cls, session, text, after=None, per_page=10):
+        """Search for the posts whose title or url contain all the words of
+        the given text
+
+        PostgreSQL databases use the search_vector column of the posts.
+        SQLite databases use the posts_search FTS5 table. The other databases
+        match the words using LIKE and the posts aren't ranked, so they are
+        ordered only by id.
+
+        :param session: the database session
+        :param str text: the search text
+        :param SearchCursor after: the position after which the posts are
+            retrieved or None to retrieve the first page
+        :param int per_page: the number of posts to retrieve
+        :rtype: SearchPage
+        :returns: the page of posts ordered by relevance
+        """
+        dialect = session.get_bind().dialect.name
+
+        if dialect == "postgresql":
+            search_query = db.func.plainto_tsquery(SEARCH_CONFIGURATION, text)
+            # ts_rank returns a real. The score is used as double precision,
+            # so that the score of the cursor is converted back to the same
+            # value
+            score = db.cast(
+                db.func.ts_rank(cls.search_vector, search_query), db.Float)
+
+            query = session.query(cls, score)\
+                           .filter(cls.search_vector.op("@@")(search_query))
+        elif dialect == "sqlite":
+            results = db.text(
+                "SELECT rowid AS post_id, -bm25(posts_search) AS score "
+                "FROM posts_search WHERE posts_search MATCH :search_query"
+            ).columns(post_id=db.Integer, score=db.Float)\
+             .bindparams(search_query=_fts5_query(text))\
+             .alias("search_results")
+            score = results.c.score
+
+            query = session.query(cls, score)\
+                           .join(results, results.c.post_id == cls.id)
+        else:
+            return cls._search_using_like(session, text, after, per_page)
+
+        if after is not None:
+            query = query.filter(
+                db.tuple_(score, cls.id) < db.tuple_(after.score, after.id))
+
+        results = cls.with_related(query)\
+                     .order_by(db.desc(score), db.desc(cls.id))\
+                     .limit(per_page + 1)\
+                     .all()
+
+        return SearchPage(
+            [post for post, _ in results[:per_page]],
+            [post_score for _, post_score in results[:per_page]],
+            per_page,
+            has_next=len(results) > per_page
+        )
+
+    @classmethod
+    def _search_using_like(cls, session, text, after, per_page):
+        query = session.query(cls).join(Url, Url.id == cls.url_id)
+
+        for word in text.split():
+            pattern = u"%%%s%%" % _escape_like(word)
+            query = query.filter(db.or_(
+                cls.title.ilike(pattern, escape="\\"),
+                Url.url.ilike(pattern, escape="\\")
+            ))
+
+        if after is not None:
+            query = query.filter(cls.id < after.id)
+
+        posts = cls.with_related(query)\
+                   .order_by(db.desc(cls.id))\
+                   .limit(per_page + 1)\
+                   .all()
+
+        return SearchPage(
+            posts[:per_page],
+            [0.0] * len(posts[:per_page]),
+            per_page,
+            has_next=len(posts) > per_page
+        )
+
+    def search_document(self):
+        """The text that is indexed for the full-text search of the post
+
+        :rtype: str
+        :returns: the post title and url
+        """
+        return u"%s %s" % (self.title, self.url.url)
+
+    @classmethod
+    def export(cls, session, tag=None, category=None, added_after=None,
+               added_before=None, batch_size=1000):
+        """Retrieve all the posts that match the given filters
+
+        The posts are read using a server side cursor and the tags and
+        categories are retrieved for every batch of posts, so that the memory
+        usage doesn't depend on the number of posts.
+
+        :param session: the database session
+        :param str tag: retrieve the posts that have this tag
+        :param str category: retrieve the posts that have this category
+        :param datetime added_after: retrieve the posts that were added at or
+            after this time
+        :param datetime added_before: retrieve the posts that were added
+            before this time
+        :param int batch_size: the number of posts that are read at once
+        :rtype: generator
+        :returns: the posts as dictionaries with the id, title, url, tags,
+            categories and added_at keys ordered by id
+        """
+        query = session.query(cls.id, cls.title, Url.url, cls.added_at)\
+                       .join(Url, Url.id == cls.url_id)
+
+        if tag is not None:
+            query = query.filter(cls.tags.any(Tag.name == tag))
+
+        if category is not None:
+            query = query.filter(cls.categories.any(Category.name == category))
+
+        if added_after is not None:
+            query = query.filter(cls.added_at >= added_after)
+
+        if added_before is not None:
+            query = query.filter(cls.added_at < added_before)
+
+        rows = query.order_by(cls.id)\
+                    .execution_options(stream_results=True)\
+                    .yield_per(batch_size)
+
+        batch = []
+        for row in rows:
+            batch.append(row)
+
+            if len(batch) == batch_size:
+                for post in cls._export_batch(session, batch):
+                    yield post
+
+                batch = []
+
+        for post in cls._export_batch(session, batch):
+            yield post
+
+    @classmethod
+    def _export_batch(cls, session, rows):
+        if not rows:
+            return []
+
+        post_ids = [row.id for row in rows]
+
+        tags = {}
+        tag_rows = session.query(post_tags.c.post_id, Tag.name)\
+                          .join(Tag, Tag.id == post_tags.c.tag_id)\
+                          .filter(post_tags.c.post_id.in_(post_ids))
+        for post_id, name in tag_rows:
+            tags.setdefault(post_id, []).append(name)
+
+        categories = {}
+        category_rows = session.query(PostCategory.post_id, Category.name)\
+                               .join(Category,
+                                     Category.id == PostCategory.category_id)\
+                               .filter(PostCategory.post_id.in_(post_ids))
+        for post_id, name in category_rows:
+            categories.setdefault(post_id, []).append(name)
+
+        return [
+            {
+                "id": row.id,
+                "title": row.title,
+                "url": row.url,
+                "tags": sorted(tags.get(row.id, [])),
+                "categories": sorted(categories.get(row.id, [])),
+                "added_at": row.added_at
+            }
+            for row in rows
+        ]
 
     @classmethod
     def get_by_id(cls, session, post_id):
@@ -330,14 +862,114 @@ class Post(db.Model):
 
         self.url = url_object
 
-        tag_collection = [Tag.get_or_create(session, tag) for tag in tags]
+        tag_objects = Tag.get_or_create_many(session, tags)
 
-        self.tags = tag_collection
+        self.tags = [tag_objects[tag] for tag in sorted(tag_objects)]
 
     def __unicode__(self):
         return self.title
 
 
+db.Index(
+    "ix_posts__added_at__id",
+    Post.__table__.c.added_at.desc(),
+    Post.__table__.c.id.desc()
+)
+
+db.Index(
+    "ix_posts__search_vector",
+    Post.__table__.c.search_vector,
+    postgresql_using="gin"
+)
+
+event.listen(
+    Post.__table__,
+    "after_create",
+    db.DDL(
+        "CREATE VIRTUAL TABLE posts_search USING fts5(title, url)"
+    ).execute_if(dialect="sqlite")
+)
+
+event.listen(
+    Post.__table__,
+    "before_drop",
+    db.DDL("DROP TABLE IF EXISTS posts_search").execute_if(dialect="sqlite")
+)
+
+
+def _fts5_query(text):
+    # every word is quoted so that the FTS5 query syntax characters in the
+    # search text are matched literally
+    return u" ".join(
+        u'"%s"' % word.replace(u'"', u'""') for word in text.split())
+
+
+def _escape_like(text):
+    # the LIKE wildcards in the search text are matched literally
+    return text.replace(u"\\", u"\\\\")\
+               .replace(u"%", u"\\%")\
+               .replace(u"_", u"\\_")
+
+
+def _search_document_changed(post):
+    state = db.inspect(post)
+
+    return (state.attrs.title.history.has_changes() or
+            state.attrs.url.history.has_changes())
+
+
+@event.listens_for(Post, "before_insert")
+@event.listens_for(Post, "before_update")
+def update_search_vector(mapper, connection, target):
+    """Update the search_vector column of the posts that are stored in a
+    PostgreSQL database"""
+    if connection.dialect.name != "postgresql":
+        return
+
+    if _search_document_changed(target):
+        target.search_vector = db.func.to_tsvector(
+            SEARCH_CONFIGURATION, target.search_document())
+
+
+@event.listens_for(Post, "after_insert")
+@event.listens_for(Post, "after_update")
+def update_search_table(mapper, connection, target):
+    """Update the posts_search table of the posts that are stored in a
+    SQLite database"""
+    if connection.dialect.name != "sqlite":
+        return
+
+    if not _search_document_changed(target):
+        return
+
+    connection.execute(
+        db.text("DELETE FROM posts_search WHERE rowid = :post_id"),
+        post_id=target.id
+    )
+    connection.execute(
+        db.text(
+            "INSERT INTO posts_search (rowid, title, url) "
+            "VALUES (:post_id, :title, :url)"
+        ),
+        post_id=target.id,
+        title=target.title,
+        url=target.url.url
+    )
+
+
+@event.listens_for(Post, "after_delete")
+def delete_from_search_table(mapper, connection, target):
+    """Remove the deleted posts from the posts_search table of a SQLite
+    database"""
+    if connection.dialect.name != "sqlite":
+        return
+
+    connection.execute(
+        db.text("DELETE FROM posts_search WHERE rowid = :post_id"),
+        post_id=target.id
+    )
+
+
 class Category(db.Model):
     __tablename__ = "categories"
 
@@ -346,9 +978,14 @@ class Category(db.Model):
         db.UniqueConstraint("name", name="uq_categories__name")
     )
 
+    NAME_LENGTH = 40
+
     id = db.Column(db.Integer, nullable=False)
-    name = db.Column(db.String(40), nullable=False)
+    name = db.Column(db.String(NAME_LENGTH), nullable=False)
     added_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    post_count = db.Column(
+        db.Integer, nullable=False, default=0, server_default="0")
+    changed_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     posts = db.relationship(
         "Post",
@@ -375,28 +1012,71 @@ class Category(db.Model):
 
         return category
 
+    @classmethod
+    def get_or_create_many(cls, session, names):
+        """Retrieve the categories with the given names creating the ones that
+        don't exist
+
+        :param session: the database session
+        :param names: the category names
+        :rtype: dict
+        :returns: the category objects keyed by their name
+        """
+        return insert_missing_names(
+            session, cls, names, added_at=datetime.utcnow())
+
     @classmethod
     def get_by_page(cls, page_num, per_page=10):
         # TODO: pass the session as argument
-        return cls.query \
-                  .order_by(db.desc(cls.name)) \
-                  .paginate(page=page_num, per_page=per_page)
+        query = cls.query.order_by(db.desc(cls.name))
+
+        return paginate(query, page_num, per_page)
 
     @classmethod
     def get_by_name(cls, session, name):
         return session.query(cls).filter_by(name=name).one_or_none()
 
+    @classmethod
+    def get_changed_at(cls, session, name):
+        """Retrieve the last time the posts of a category changed
+
+        :param session: the database session
+        :param str name: the category name
+        :rtype: datetime
+        :returns: the change time or None if the category doesn't exist
+        """
+        return session.query(cls.changed_at).filter_by(name=name).scalar()
+
     @classmethod
     def all(cls, session):
         return session.query(cls).order_by(cls.name).all()
 
+    @classmethod
+    def recompute_post_counts(cls, session):
+        """Recompute the post count of every category
+
+        :param session: the database session
+        """
+        post_count = db.select([db.func.count()])\
+                       .where(PostCategory.category_id == cls.id)\
+                       .as_scalar()
+
+        session.query(cls).update(
+            {cls.post_count: post_count}, synchronize_session=False)
+
     def get_posts_by_page(self, page, per_page=10):
         # TODO: pass the session as argument
 
-        return Post.query\
-                   .filter(Post.categories.contains(self))\
-                   .order_by(db.desc(Post.added_at))\
-                   .paginate(page=page, per_page=per_page, error_out=False)
+        query = Post.with_related(Post.query)\
+                    .filter(Post.categories.contains(self))\
+                    .order_by(db.desc(Post.added_at), db.desc(Post.id))
+
+        return paginate(query, page, per_page, error_out=False)
+
+    def get_posts_after(self, session, after=None, per_page=10):
+        query = session.query(Post).filter(Post.categories.contains(self))
+
+        return Post.get_page_after(query, after, per_page)
 
     def __unicode__(self):
         return self.name
@@ -410,6 +1090,10 @@ class PostCategory(db.Model):
             "post_id", "category_id",
             name="pk_post_categories"
         ),
+        db.Index(
+            "ix_post_categories__category_id__post_id",
+            "category_id", "post_id"
+        ),
         db.ForeignKeyConstraint(
             ["post_id"], ["posts.id"],
             name="fk_post_categories__post_id__posts",
@@ -449,3 +1133,376 @@ class PostCategory(db.Model):
         session.add(post_category)
 
         return post_category
+
+
+class QueuedPost(db.Model):
+    """A post that is waiting to be created by the post queue worker"""
+
+    __tablename__ = "queued_posts"
+
+    __table_args__ = (
+        db.PrimaryKeyConstraint("id", name="pk_queued_posts"),
+        db.UniqueConstraint("receipt", name="uq_queued_posts__receipt"),
+        db.Index("ix_queued_posts__status__id", "status", "id"),
+        db.ForeignKeyConstraint(
+            ["post_id"], ["posts.id"],
+            name="fk_queued_posts__post_id__posts",
+            ondelete="SET NULL",
+            onupdate="CASCADE"
+        )
+    )
+
+    QUEUED = "queued"
+    CREATED = "created"
+    FAILED = "failed"
+
+    id = db.Column(db.Integer, nullable=False)
+    receipt = db.Column(db.String(32), nullable=False)
+    status = db.Column(db.String(10), nullable=False)
+    title = db.Column(db.String(Post.TITLE_LENGTH), nullable=False)
+    url = db.Column(db.String(Url.URL_LENGTH), nullable=False)
+    tags = db.Column(db.Text, nullable=False)
+    categories = db.Column(db.Text, nullable=False)
+    added_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    processed_at = db.Column(db.DateTime)
+    post_id = db.Column(db.Integer)
+    error = db.Column(db.Text)
+
+    post = db.relationship("Post")
+
+    @classmethod
+    def create(cls, session, post):
+        """Add a post to the queue
+
+        :param session: the database session
+        :param dict post: the post with the title, url, tags and categories
+            keys
+        :rtype: QueuedPost
+        :returns: the queued post object
+        """
+        queued_post = cls(
+            receipt=uuid4().hex,
+            status=cls.QUEUED,
+            title=post["title"],
+            url=post["url"],
+            tags=json.dumps(post["tags"]),
+            categories=json.dumps(post["categories"]),
+            added_at=datetime.utcnow()
+        )
+
+        session.add(queued_post)
+
+        return queued_post
+
+    @classmethod
+    def get_by_receipt(cls, session, receipt):
+        return session.query(cls).filter_by(receipt=receipt).one_or_none()
+
+    @classmethod
+    def get_queued(cls, session, count, receipt=None):
+        """Retrieve and lock the oldest posts that haven't been processed
+
+        The posts that are locked by other workers are skipped on PostgreSQL.
+
+        :param session: the database session
+        :param int count: the maximum number of posts to retrieve
+        :param str receipt: retrieve only the post with this receipt
+        :rtype: list
+        :returns: the queued post objects
+        """
+        query = session.query(cls).filter_by(status=cls.QUEUED)
+
+        if receipt is not None:
+            query = query.filter_by(receipt=receipt)
+
+        return query.order_by(cls.id)\
+                    .limit(count)\
+                    .with_for_update(skip_locked=True)\
+                    .all()
+
+    def to_post(self):
+        """The post that will be created
+
+        :rtype: dict
+        :returns: the post with the title, url, tags and categories keys
+        """
+        return {
+            "title": self.title,
+            "url": self.url,
+            "tags": json.loads(self.tags),
+            "categories": json.loads(self.categories)
+        }
+
+    def mark_created(self, post):
+        self.status = self.CREATED
+        self.post = post
+        self.processed_at = datetime.utcnow()
+
+    def mark_failed(self, error):
+        self.status = self.FAILED
+        self.error = error
+        self.processed_at = datetime.utcnow()
+
+
+class ImportCheckpoint(db.Model):
+    """The number of records of an import that have been processed
+
+    It is saved in the transaction that imports every batch of records, so
+    that an interrupted import can be resumed without importing any record
+    twice.
+    """
+
+    __tablename__ = "import_checkpoints"
+
+    __table_args__ = (
+        db.PrimaryKeyConstraint("name", name="pk_import_checkpoints"),
+    )
+
+    NAME_LENGTH = 256
+
+    name = db.Column(db.String(NAME_LENGTH), nullable=False)
+    position = db.Column(db.Integer, nullable=False)
+    updated_at = db.Column(
+        db.DateTime, nullable=False, default=datetime.utcnow)
+
+    @classmethod
+    def get_position(cls, session, name):
+        """Retrieve the number of records of an import that have been
+        processed
+
+        :param session: the database session
+        :param str name: the import name
+        :rtype: int
+        :returns: the number of processed records
+        """
+        position = session.query(cls.position).filter_by(name=name).scalar()
+
+        return position or 0
+
+    @classmethod
+    def save(cls, session, name, position):
+        """Save the number of records of an import that have been processed
+
+        :param session: the database session
+        :param str name: the import name
+        :param int position: the number of processed records
+        :rtype: ImportCheckpoint
+        :returns: the checkpoint object
+        """
+        checkpoint = session.query(cls).get(name)
+
+        if checkpoint is None:
+            checkpoint = cls(name=name)
+            session.add(checkpoint)
+
+        checkpoint.position = position
+        checkpoint.updated_at = datetime.utcnow()
+
+        return checkpoint
+
+
+def _add_post_count_changes(changes, objects, delta):
+    for obj in objects or ():
+        if obj is not None:
+            changes[obj] = changes.get(obj, 0) + delta
+
+
+@event.listens_for(Session, "before_flush")
+def update_post_counts(session, flush_context, instances):
+    """Update the post counts of the tags and categories whose posts are
+    about to be created, changed or deleted
+
+    The counts of the existing tags and categories are updated using
+    UPDATE ... SET post_count = post_count + delta statements, so that
+    concurrent transactions don't overwrite each other's changes.
+    """
+    changes = {}
+
+    for obj in session.new:
+        if isinstance(obj, Post):
+            for attribute in ["tags", "categories"]:
+                history = db.inspect(obj).attrs[attribute].history
+                _add_post_count_changes(changes, history.added, 1)
+        elif isinstance(obj, PostCategory):
+            _add_post_count_changes(changes, [obj.category], 1)
+
+    for obj in session.dirty:
+        if isinstance(obj, Post):
+            for attribute in ["tags", "categories"]:
+                history = db.inspect(obj).attrs[attribute].history
+                _add_post_count_changes(changes, history.added, 1)
+                _add_post_count_changes(changes, history.deleted, -1)
+
+    for obj in session.deleted:
+        if isinstance(obj, Post):
+            # the post categories are deleted by the cascade to the
+            # PostCategory objects of the post
+            history = db.inspect(obj).attrs.tags.load_history()
+            _add_post_count_changes(changes, history.unchanged, -1)
+            _add_post_count_changes(changes, history.deleted, -1)
+        elif isinstance(obj, PostCategory):
+            _add_post_count_changes(changes, [obj.category], -1)
+
+    for obj, delta in changes.items():
+        if delta == 0 or obj in session.deleted:
+            continue
+
+        if obj in session.new:
+            obj.post_count = (obj.post_count or 0) + delta
+        else:
+            obj.post_count = type(obj).post_count + delta
+
+
+def _post_related_objects(post):
+    """Retrieve the url, tags and categories that the post has or had before
+    it was changed"""
+    state = db.inspect(post)
+
+    related_objects = []
+    for attribute in ["url", "tags", "categories"]:
+        related_objects.extend(
+            obj
+            for obj in state.attrs[attribute].load_history().sum()
+            if obj is not None
+        )
+
+    return related_objects
+
+
+def _response_dependency(obj):
+    if isinstance(obj, Url):
+        return u"url:%s" % obj.url
+    elif isinstance(obj, Tag):
+        return u"tag:%s" % obj.name
+
+    return u"category:%s" % obj.name
+
+
+def _post_response_dependencies(post, changed_collections=()):
+    state = db.inspect(post)
+
+    dependencies = set(changed_collections)
+    dependencies.add("posts")
+
+    if post.id is not None:
+        dependencies.add("post:%d" % post.id)
+
+    for attribute in ["tags", "categories"]:
+        if state.attrs[attribute].history.has_changes():
+            dependencies.add(attribute)
+
+    dependencies.update(
+        _response_dependency(obj) for obj in _post_related_objects(post))
+
+    return dependencies
+
+
+@event.listens_for(Session, "before_flush")
+def find_invalidated_responses(session, flush_context, instances):
+    """Keep the dependencies of the cached API responses and pages that are
+    affected by the changes of the posts, tags and categories, so that they
+    are invalidated after the commit"""
+    dependencies = session.info.setdefault("invalidated_responses", set())
+
+    for obj in session.new:
+        if isinstance(obj, Post):
+            dependencies.update(_post_response_dependencies(obj))
+        elif isinstance(obj, Tag):
+            dependencies.add("tags")
+
+    for obj in session.dirty:
+        if isinstance(obj, Post):
+            dependencies.update(_post_response_dependencies(obj))
+
+    for obj in session.deleted:
+        if isinstance(obj, Post):
+            dependencies.update(
+                _post_response_dependencies(obj, ["tags", "categories"]))
+
+    for obj in session.new | session.dirty | session.deleted:
+        if isinstance(obj, PostCategory):
+            dependencies.add("categories")
+            if obj.category is not None:
+                dependencies.add(_response_dependency(obj.category))
+            if obj.post is not None:
+                dependencies.update(_post_response_dependencies(obj.post))
+        elif isinstance(obj, Category):
+            dependencies.update(["categories", u"category:%s" % obj.name])
+        elif isinstance(obj, Tag) and obj not in session.new:
+            dependencies.update(["tags", u"tag:%s" % obj.name])
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_responses(session):
+    dependencies = session.info.pop("invalidated_responses", None)
+
+    if dependencies:
+        response_cache.invalidate(dependencies)
+        page_cache.invalidate(dependencies)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def discard_invalidated_responses(session, previous_transaction):
+    session.info.pop("invalidated_responses", None)
+
+
+def _renamed_object_post_ids(obj):
+    """Create the query of the posts that show the name of a renamed url, tag
+    or category, or return None if the object wasn't renamed"""
+    if isinstance(obj, Url):
+        attribute = "url"
+        post_ids = db.select([Post.id]).where(Post.url_id == obj.id)
+    elif isinstance(obj, Tag):
+        attribute = "name"
+        post_ids = db.select([post_tags.c.post_id])\
+                     .where(post_tags.c.tag_id == obj.id)
+    else:
+        attribute = "name"
+        post_ids = db.select([PostCategory.post_id])\
+                     .where(PostCategory.category_id == obj.id)
+
+    if not db.inspect(obj).attrs[attribute].history.has_changes():
+        return None
+
+    return post_ids
+
+
+@event.listens_for(Session, "before_flush")
+def update_changed_at(session, flush_context, instances):
+    """Update the change time of the posts that are about to be changed and
+    of the urls, tags and categories whose posts are about to be created,
+    changed or deleted
+
+    The posts of a renamed url, tag or category are also updated, so that
+    their cached fragments are rendered again."""
+    changed_at = datetime.utcnow()
+
+    for obj in session.dirty:
+        if isinstance(obj, (Url, Tag, Category)):
+            post_ids = _renamed_object_post_ids(obj)
+            if post_ids is not None:
+                session.execute(
+                    Post.__table__.update()
+                                  .where(Post.id.in_(post_ids))
+                                  .values(changed_at=changed_at)
+                )
+
+    for obj in session.new | session.dirty | session.deleted:
+        if isinstance(obj, Post):
+            related_objects = _post_related_objects(obj)
+        elif isinstance(obj, PostCategory):
+            related_objects = [obj.category]
+            if obj.post is not None:
+                related_objects.extend(_post_related_objects(obj.post))
+                related_objects.append(obj.post)
+        else:
+            continue
+
+        if (isinstance(obj, Post) and obj in session.dirty and
+                session.is_modified(obj)):
+            related_objects.append(obj)
+
+        for related_object in related_objects:
+            if (related_object is not None and
+                    related_object not in session.deleted):
+                related_object.changed_at = changed_at
@@ -0,0 +1,54 @@
+from datetime import datetime
+import json
+
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+
+    raise TypeError("%r is not JSON serializable" % value)
+
+
+def dumps(record):
+    """Serialize a record to a line of newline delimited JSON
+
+    :param dict record: the record
+    :rtype: str
+    :returns: the JSON document followed by a newline
+    """
+    return json.dumps(record, default=_default, sort_keys=True) + "\n"
+
+
+def to_ndjson(records):
+    """Serialize the records to newline delimited JSON
+
+    :param records: an iterable of records
+    :rtype: generator
+    :returns: a line for every record
+    """
+    for record in records:
+        yield dumps(record)
+
+
+def read_ndjson(f):
+    """Read the records of a newline delimited JSON file
+
+    The empty lines are skipped.
+
+    :param f: the file object
+    :rtype: generator
+    :returns: the records
+    :raises ValueError: if a line isn't valid JSON
+    """
+    for line_number, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            yield json.loads(line)
+        except ValueError:
+            raise ValueError("invalid JSON in line %d" % line_number)
@@ -0,0 +1,215 @@
+from base64 import urlsafe_b64encode, urlsafe_b64decode
+from binascii import Error as BinasciiError
+from collections import namedtuple
+from datetime import datetime
+
+from flask import abort
+
+
+CURSOR_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+
+def encode_cursor_values(*values):
+    """Encode the cursor values to an opaque string
+
+    :param values: the cursor values
+    :rtype: str
+    :returns: the encoded values
+    """
+    value = "|".join(values)
+
+    return urlsafe_b64encode(value.encode("ascii")).decode("ascii")\
+                                                    .rstrip("=")
+
+
+def decode_cursor_values(value, count):
+    """Decode the values of a cursor created by encode_cursor_values
+
+    :param str value: the encoded cursor
+    :param int count: the expected number of values
+    :rtype: list
+    :returns: the cursor values
+    :raises ValueError: if the cursor is invalid
+    """
+    padding = "=" * (-len(value) % 4)
+
+    try:
+        decoded = urlsafe_b64decode(
+            (value + padding).encode("ascii")).decode("ascii")
+    except (TypeError, BinasciiError, UnicodeError):
+        raise ValueError("invalid cursor")
+
+    values = decoded.split("|")
+    if len(values) != count:
+        raise ValueError("invalid cursor")
+
+    return values
+
+
+class Cursor(namedtuple("Cursor", ["added_at", "id"])):
+    """The position of a post in a listing ordered by (added_at, id)"""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_post(cls, post):
+        """Create the cursor that points to the given post
+
+        :param Post post: the post
+        :rtype: Cursor
+        :returns: the cursor object
+        """
+        return cls(post.added_at, post.id)
+
+    def encode(self):
+        """Encode the cursor to an opaque string
+
+        :rtype: str
+        :returns: the encoded cursor
+        """
+        return encode_cursor_values(
+            self.added_at.strftime(CURSOR_DATETIME_FORMAT), str(self.id))
+
+    @classmethod
+    def decode(cls, value):
+        """Decode a cursor that was created by Cursor.encode
+
+        :param str value: the encoded cursor
+        :rtype: Cursor
+        :returns: the cursor object
+        :raises ValueError: if the cursor is invalid
+        """
+        added_at, post_id = decode_cursor_values(value, 2)
+
+        return cls(
+            datetime.strptime(added_at, CURSOR_DATETIME_FORMAT),
+            int(post_id)
+        )
+
+
+class SearchCursor(namedtuple("SearchCursor", ["score", "id"])):
+    """The position of a post in search results ordered by (score, id)"""
+
+    __slots__ = ()
+
+    def encode(self):
+        """Encode the cursor to an opaque string
+
+        :rtype: str
+        :returns: the encoded cursor
+        """
+        return encode_cursor_values(repr(float(self.score)), str(self.id))
+
+    @classmethod
+    def decode(cls, value):
+        """Decode a cursor that was created by SearchCursor.encode
+
+        :param str value: the encoded cursor
+        :rtype: SearchCursor
+        :returns: the cursor object
+        :raises ValueError: if the cursor is invalid
+        """
+        score, post_id = decode_cursor_values(value, 2)
+
+        return cls(float(score), int(post_id))
+
+
+def next_cursor(paginator):
+    """Create the cursor for the page that follows the given page
+
+    :param paginator: a page of posts, either a KeysetPage or an OffsetPage
+    :rtype: str
+    :returns: the encoded cursor or None if this is the last page
+    """
+    if not paginator.has_next or not paginator.items:
+        return None
+
+    return Cursor.from_post(paginator.items[-1]).encode()
+
+
+class KeysetPage(object):
+    """A page of posts retrieved using keyset pagination"""
+
+    def __init__(self, items, per_page, has_next):
+        self.items = items
+        self.per_page = per_page
+        self.has_next = has_next
+
+    @property
+    def next_cursor(self):
+        """The encoded cursor for the next page or None if this is the last
+        page"""
+        return next_cursor(self)
+
+
+class OffsetPage(object):
+    """A page of items retrieved using LIMIT and OFFSET
+
+    It is used instead of the Flask-SQLAlchemy Pagination object, because
+    the total number of items isn't needed in order to find out whether there
+    is a next page.
+    """
+
+    def __init__(self, items, page, per_page, has_next):
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.has_next = has_next
+
+    @property
+    def has_prev(self):
+        return self.page > 1
+
+    @property
+    def prev_num(self):
+        return self.page - 1 if self.has_prev else None
+
+    @property
+    def next_num(self):
+        return self.page + 1 if self.has_next else None
+
+
+def paginate(query, page, per_page, error_out=True):
+    """Retrieve a page of the results of a query without counting them
+
+    One more item than the page size is retrieved in order to find out
+    whether there is a next page.
+
+    :param query: the query
+    :param int page: the page number starting from 1
+    :param int per_page: the number of items per page
+    :param bool error_out: abort with a 404 error if the page number or size
+        is invalid or if the page is empty and it isn't the first one
+    :rtype: OffsetPage
+    :returns: the page
+    """
+    if error_out and (page < 1 or per_page < 0):
+        abort(404)
+
+    items = query.limit(per_page + 1)\
+                 .offset(max(page - 1, 0) * per_page)\
+                 .all()
+
+    if error_out and not items and page != 1:
+        abort(404)
+
+    return OffsetPage(
+        items[:per_page], page, per_page, has_next=len(items) > per_page)
+
+
+class SearchPage(KeysetPage):
+    """A page of search results"""
+
+    def __init__(self, items, scores, per_page, has_next):
+        super(SearchPage, self).__init__(items, per_page, has_next)
+
+        self.scores = scores
+
+    @property
+    def next_cursor(self):
+        """The encoded cursor for the next page or None if this is the last
+        page"""
+        if not self.has_next or not self.items:
+            return None
+
+        return SearchCursor(self.scores[-1], self.items[-1].id).encode()
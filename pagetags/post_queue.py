@@ -0,0 +1,168 @@
+from time import sleep
+
+from flask import current_app
+from sqlalchemy.exc import SQLAlchemyError
+
+from pagetags.models import Post, QueuedPost
+from pagetags.metrics import metrics
+
+
+# the error of the queued posts that couldn't be created. The receipts are
+# returned to the API clients, so the database error is only logged
+POST_CREATION_ERROR = "failed to create the post"
+
+
+class DatabasePostQueue(object):
+    """Post queue that is stored in the queued_posts table of the
+    application database, so that it doesn't require any other service"""
+
+    def enqueue(self, session, post):
+        return QueuedPost.create(session, post)
+
+    def get_by_receipt(self, session, receipt):
+        return QueuedPost.get_by_receipt(session, receipt)
+
+    def _create_posts(self, session, queued_posts):
+        posts = Post.create_many(
+            session, [queued_post.to_post() for queued_post in queued_posts])
+
+        for queued_post, post in zip(queued_posts, posts):
+            post.added_at = queued_post.added_at
+            queued_post.mark_created(post)
+
+    def process(self, session, batch_size):
+        queued_posts = QueuedPost.get_queued(session, batch_size)
+        if not queued_posts:
+            session.rollback()
+            return 0
+
+        receipts = [queued_post.receipt for queued_post in queued_posts]
+
+        try:
+            self._create_posts(session, queued_posts)
+
+            session.commit()
+
+            metrics.count_posts("worker", len(queued_posts))
+        except SQLAlchemyError:
+            session.rollback()
+
+            msg = "failed to create queued posts, retrying them one at a " \
+                  "time: count(%d)"
+            current_app.logger.exception(msg, len(receipts))
+
+            for receipt in receipts:
+                self._process_one(session, receipt)
+
+        return len(receipts)
+
+    def _process_one(self, session, receipt):
+        queued_posts = QueuedPost.get_queued(session, 1, receipt=receipt)
+        if not queued_posts:
+            # the post has been processed by another worker
+            session.rollback()
+            return
+
+        try:
+            self._create_posts(session, queued_posts)
+
+            session.commit()
+
+            metrics.count_posts("worker")
+        except SQLAlchemyError:
+            session.rollback()
+
+            msg = "failed to create queued post: receipt(%s)"
+            current_app.logger.exception(msg, receipt)
+
+            queued_post = QueuedPost.get_by_receipt(session, receipt)
+            queued_post.mark_failed(POST_CREATION_ERROR)
+
+            session.commit()
+
+
+class PostQueue(object):
+    """Queue of the posts that are created asynchronously
+
+    When a backend is configured the post creation requests are added to the
+    queue and the posts are created in batches by the worker command.
+    """
+
+    def __init__(self):
+        self.backend = None
+        self.batch_size = 100
+        self.poll_interval = 1.0
+
+    def init_app(self, app):
+        backend = app.config["POST_QUEUE_BACKEND"]
+
+        if backend is None:
+            self.backend = None
+        elif backend == "database":
+            self.backend = DatabasePostQueue()
+        else:
+            raise ValueError("unknown post queue backend %s" % backend)
+
+        self.batch_size = app.config["POST_QUEUE_BATCH_SIZE"]
+        self.poll_interval = app.config["POST_QUEUE_POLL_INTERVAL"]
+
+    @property
+    def enabled(self):
+        return self.backend is not None
+
+    def enqueue(self, session, post):
+        """Add a post to the queue
+
+        The post is added when the session is committed.
+
+        :param session: the database session
+        :param dict post: the validated post with the title, url, tags and
+            categories keys
+        :rtype: QueuedPost
+        :returns: the queued post object
+        """
+        return self.backend.enqueue(session, post)
+
+    def get_by_receipt(self, session, receipt):
+        """Retrieve a queued post
+
+        :param session: the database session
+        :param str receipt: the receipt that was returned when the post was
+            queued
+        :rtype: QueuedPost
+        :returns: the queued post object or None if it doesn't exist
+        """
+        return self.backend.get_by_receipt(session, receipt)
+
+    def process(self, session, batch_size=None):
+        """Create a batch of queued posts in a single transaction
+
+        If the transaction fails the posts of the batch are created one at a
+        time and the ones that can't be created are marked as failed.
+
+        :param session: the database session
+        :param int batch_size: the maximum number of posts to create or None
+            to use the POST_QUEUE_BATCH_SIZE setting
+        :rtype: int
+        :returns: the number of processed posts
+        """
+        return self.backend.process(session, batch_size or self.batch_size)
+
+    def run_worker(self, session, batch_size=None, once=False):
+        """Process the queued posts until the worker is stopped
+
+        :param session: the database session
+        :param int batch_size: the maximum number of posts of every batch
+        :param bool once: stop when the queue is empty
+        """
+        while True:
+            if self.process(session, batch_size) > 0:
+                continue
+
+            if once:
+                break
+
+            sleep(self.poll_interval)
+
+
+post_queue = PostQueue()
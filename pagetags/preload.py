@@ -0,0 +1,71 @@
+import gc
+import random
+
+from sqlalchemy.orm import configure_mappers
+
+from pagetags import db, response_cache, page_cache
+
+
+def warm_up(app):
+    """Prepare an application that is loaded before the server forks its
+    worker processes
+
+    The SQLAlchemy mappers are configured, the request parsers are created
+    and the templates are compiled, so that the workers share them instead
+    of creating them on their first requests. The database connections are
+    closed, because they can't be shared by the workers, and the garbage
+    collector is frozen on the Python versions that support it, so that it
+    doesn't write to the shared memory pages of the preloaded objects.
+
+    :param app: the Flask application object
+    """
+    configure_mappers()
+
+    # the request parsers are created when the module is imported
+    import pagetags.reqparsers  # noqa
+
+    for name in app.jinja_loader.list_templates():
+        app.jinja_env.get_template(name)
+
+    db.get_engine(app).dispose()
+
+    gc.collect()
+
+    # gc.freeze is available on Python 3.7 and newer
+    if hasattr(gc, "freeze"):
+        gc.freeze()
+
+
+def reinitialize_worker(app):
+    """Reset the state that a worker process inherits from the process that
+    loaded the application
+
+    :param app: the Flask application object
+    """
+    db.get_engine(app).dispose()
+
+    # the response cache and the page cache have their own memcached clients
+    for cache in [response_cache, page_cache]:
+        disconnect_all = getattr(cache.client, "disconnect_all", None)
+        if disconnect_all is not None:
+            disconnect_all()
+
+    # the workers would otherwise sample the same requests for profiling
+    random.seed()
+
+
+def preload(app):
+    """Warm up an application that is loaded by the uWSGI master process
+    and reinitialize the workers after they are forked
+
+    :param app: the Flask application object
+    """
+    warm_up(app)
+
+    try:
+        from uwsgidecorators import postfork
+    except ImportError:
+        # the application isn't served by uWSGI
+        return
+
+    postfork(lambda: reinitialize_worker(app))
@@ -0,0 +1,256 @@
+from datetime import datetime
+from timeit import default_timer
+import cProfile
+import hmac
+import json
+import os
+import pstats
+import random
+import uuid
+
+from flask import g, request, current_app
+
+from pagetags.metrics import endpoint_name
+
+
+PROFILE_EXTENSION = ".prof"
+METADATA_EXTENSION = ".json"
+
+
+def _write_atomically(path, write):
+    temporary_path = path + ".tmp"
+    write(temporary_path)
+    os.rename(temporary_path, path)
+
+
+def _encode_token(value):
+    if isinstance(value, bytes):
+        return value
+
+    return value.encode("utf-8")
+
+
+def save_profile(directory, profile, metadata):
+    """Store a profile and its metadata
+
+    :param str directory: the profile directory
+    :param profile: the cProfile.Profile object
+    :param dict metadata: the profile metadata
+    :rtype: str
+    :returns: the profile name
+    """
+    name = "%s-%s" % (
+        datetime.utcnow().strftime("%Y%m%dT%H%M%S%f"), uuid.uuid4().hex[:8])
+
+    metadata = dict(metadata, name=name)
+
+    def write_metadata(path):
+        with open(path, "w") as f:
+            json.dump(metadata, f, sort_keys=True)
+
+    # the metadata is written last, so that only the complete profiles are
+    # listed
+    _write_atomically(
+        os.path.join(directory, name + PROFILE_EXTENSION), profile.dump_stats)
+    _write_atomically(
+        os.path.join(directory, name + METADATA_EXTENSION), write_metadata)
+
+    return name
+
+
+def profile_names(directory):
+    """Retrieve the names of the stored profiles
+
+    The names start with the creation time of the profiles, so they are
+    sorted without reading the metadata files.
+
+    :param str directory: the profile directory
+    :rtype: list
+    :returns: the profile names sorted by creation time
+    """
+    return sorted(
+        filename[:-len(METADATA_EXTENSION)]
+        for filename in os.listdir(directory)
+        if filename.endswith(METADATA_EXTENSION)
+    )
+
+
+def list_profiles(directory, endpoint=None):
+    """Retrieve the metadata of the stored profiles
+
+    :param str directory: the profile directory
+    :param str endpoint: return only the profiles of this endpoint
+    :rtype: list
+    :returns: the metadata dictionaries sorted by creation time
+    """
+    profiles = []
+
+    for name in profile_names(directory):
+        try:
+            with open(os.path.join(directory, name + METADATA_EXTENSION)) as f:
+                metadata = json.load(f)
+        except (IOError, OSError):
+            # the profile has been deleted by another process
+            continue
+
+        if endpoint is None or metadata["endpoint"] == endpoint:
+            profiles.append(metadata)
+
+    return profiles
+
+
+def delete_profile(directory, name):
+    """Delete a stored profile
+
+    :param str directory: the profile directory
+    :param str name: the profile name
+    """
+    for extension in [METADATA_EXTENSION, PROFILE_EXTENSION]:
+        try:
+            os.remove(os.path.join(directory, name + extension))
+        except OSError:
+            pass
+
+
+def load_stats(directory, names, stream=None):
+    """Combine stored profiles
+
+    :param str directory: the profile directory
+    :param list names: the profile names
+    :param stream: the stream that the statistics are printed to
+    :rtype: pstats.Stats
+    :returns: the combined statistics
+    """
+    paths = [os.path.join(directory, name + PROFILE_EXTENSION)
+             for name in names]
+
+    stats = pstats.Stats(paths[0], stream=stream)
+    for path in paths[1:]:
+        stats.add(path)
+
+    return stats
+
+
+class RequestProfiler(object):
+    """Profile the requests that carry the profiling header or that are
+    sampled
+
+    The header value must be the configured profiling token. The profiles
+    are stored in the profile directory together with the endpoint, the
+    status and the duration of the request and they can be inspected using
+    the profiles command.
+    """
+
+    def __init__(self):
+        self.directory = None
+        self.header = None
+        self.token = None
+        self.sample_rate = 0.0
+        self.max_profiles = None
+
+    def init_app(self, app):
+        if not app.config["PROFILING_ENABLED"]:
+            return
+
+        self.directory = app.config["PROFILING_DIRECTORY"]
+        if self.directory is None:
+            raise ValueError("the profiling directory has not been set")
+
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+
+        self.header = app.config["PROFILING_HEADER"]
+        self.token = app.config["PROFILING_TOKEN"]
+        self.sample_rate = app.config["PROFILING_SAMPLE_RATE"]
+        self.max_profiles = app.config["PROFILING_MAX_PROFILES"]
+
+        app.before_request(self.start_request)
+        app.after_request(self.finish_request)
+        app.teardown_request(self.discard_profile)
+
+    def _trigger(self):
+        header_value = request.headers.get(self.header)
+
+        if header_value is not None and self.token is not None:
+            if hmac.compare_digest(_encode_token(header_value),
+                                   _encode_token(self.token)):
+                return "header"
+
+            current_app.logger.warning(
+                "invalid profiling token: path(%s)", request.path)
+
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sample"
+
+        return None
+
+    def start_request(self):
+        trigger = self._trigger()
+        if trigger is None:
+            return
+
+        g.profile = cProfile.Profile()
+        g.profile_trigger = trigger
+        g.profile_started_at = default_timer()
+
+        g.profile.enable()
+
+    def finish_request(self, response):
+        profile = g.pop("profile", None)
+        if profile is None:
+            return response
+
+        profile.disable()
+
+        duration = default_timer() - g.profile_started_at
+
+        metadata = {
+            "endpoint": endpoint_name(current_app, request.endpoint),
+            "method": request.method,
+            "path": request.full_path,
+            "status": response.status_code,
+            "duration_ms": duration * 1000,
+            "trigger": g.profile_trigger,
+            "pid": os.getpid(),
+            "created_at": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S")
+        }
+
+        try:
+            name = save_profile(self.directory, profile, metadata)
+        except (IOError, OSError):
+            msg = "failed to store profile: path(%s)"
+            current_app.logger.exception(msg, request.full_path)
+
+            return response
+
+        msg = "stored profile: name(%s) endpoint(%s) duration(%.1fms)"
+        current_app.logger.info(
+            msg, name, metadata["endpoint"], metadata["duration_ms"])
+
+        try:
+            self._delete_old_profiles()
+        except (IOError, OSError):
+            current_app.logger.exception("failed to delete old profiles")
+
+        return response
+
+    def _delete_old_profiles(self):
+        if self.max_profiles is None:
+            return
+
+        names = profile_names(self.directory)
+
+        # the profiles that have already been deleted by another process are
+        # ignored by delete_profile
+        for name in names[:max(len(names) - self.max_profiles, 0)]:
+            delete_profile(self.directory, name)
+
+    def discard_profile(self, exception):
+        # the profile of a request that failed before the response was
+        # created is discarded
+        profile = g.pop("profile", None)
+        if profile is not None:
+            profile.disable()
+
+
+request_profiler = RequestProfiler()
@@ -12,25 +12,52 @@ post.add_argument("tags", required=True, type=list, location="json")
 post.add_argument("categories", required=True, type=list, location="json")
 
 
+bulk_posts = RequestParser()
+bulk_posts.add_argument("posts", required=True, type=list, location="json")
+
+
+export_posts = RequestParser()
+export_posts.add_argument("tag", location="args")
+export_posts.add_argument("category", location="args")
+export_posts.add_argument(
+    "added_after", type=argtypes.timestamp, location="args")
+export_posts.add_argument(
+    "added_before", type=argtypes.timestamp, location="args")
+
+
 url_query = RequestParser()
 url_query.add_argument("url", required=True, location="args")
 url_query.add_argument("page", default=1, type=int, location="args")
 url_query.add_argument("per_page", default=10, type=int, location="args")
+url_query.add_argument("after", type=argtypes.cursor, location="args")
 
 
 posts = RequestParser()
 posts.add_argument("page", default=1, type=int, location="args")
 posts.add_argument("per_page", default=10, type=int, location="args")
+posts.add_argument("after", type=argtypes.cursor, location="args")
 
 
 tag_posts = RequestParser()
 tag_posts.add_argument("page", default=1, type=int, location="args")
 tag_posts.add_argument("per_page", default=10, type=int, location="args")
+tag_posts.add_argument("after", type=argtypes.cursor, location="args")
 
 
 tags_posts = RequestParser()
-tags_posts.add_argument("page", default=1, type=int, location="args")
+tags_posts.add_argument(
+    "tags", required=True, type=argtypes.tag_names, location="args")
+tags_posts.add_argument(
+    "mode", default="all", choices=("all", "any"), location="args")
 tags_posts.add_argument("per_page", default=10, type=int, location="args")
+tags_posts.add_argument("after", type=argtypes.cursor, location="args")
+
+
+search = RequestParser()
+search.add_argument(
+    "q", required=True, type=argtypes.search_text, location="args")
+search.add_argument("per_page", default=10, type=int, location="args")
+search.add_argument("after", type=argtypes.search_cursor, location="args")
 
 
 update_post = RequestParser()
@@ -45,11 +72,14 @@ categories_posts = RequestParser()
 categories_posts.add_argument("page", default=1, type=int, location="args")
 categories_posts.add_argument(
     "per_page", default=10, type=int, location="args")
+categories_posts.add_argument(
+    "after", type=argtypes.cursor, location="args")
 
 
 category_posts = RequestParser()
 category_posts.add_argument("page", default=1, type=int, location="args")
 category_posts.add_argument("per_page", default=10, type=int, location="args")
+category_posts.add_argument("after", type=argtypes.cursor, location="args")
 
 
 categories = RequestParser()
@@ -0,0 +1,9 @@
+class EncodedJSON(object):
+    """JSON text that has been created by a compiled serializer
+
+    It is returned by the resource methods instead of the marshalled data
+    and it is written to the response as is.
+    """
+
+    def __init__(self, text):
+        self.text = text
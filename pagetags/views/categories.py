@@ -1,9 +1,11 @@
 from flask import render_template
 
-from pagetags import reqparsers
+from pagetags import reqparsers, page_cache
 from pagetags.models import db, Category
+from pagetags.conditional import conditional
 
 
+@page_cache.cached("categories", lambda: ["categories"])
 def categories():
     args = reqparsers.categories_posts.parse_args()
 
@@ -15,6 +17,9 @@ def categories():
     return render_template("categories.html", paginator=paginator)
 
 
+@conditional(
+    lambda name: Category.get_changed_at(db.session, name), per_user=True)
+@page_cache.cached("category", lambda name: [u"category:%s" % name])
 def category(name):
     args = reqparsers.category_posts.parse_args()
 
@@ -0,0 +1,23 @@
+from flask import current_app, request
+from jinja2 import Markup
+
+from pagetags import fragment_cache
+
+
+def render_post(post):
+    """Render the markup of a post in a list of posts
+
+    The markup is cached by the post id and the last time the post changed.
+
+    :param Post post: the post
+    :rtype: Markup
+    :returns: the rendered post
+    """
+    key = ("post", request.script_root, post.id, post.changed_at)
+
+    def render():
+        template = current_app.jinja_env.get_template("post_row.html")
+
+        return Markup(template.render(post=post))
+
+    return fragment_cache.render(key, render)
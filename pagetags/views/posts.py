@@ -1,8 +1,13 @@
 from flask import current_app, render_template
 
-from pagetags import models, reqparsers
+from pagetags import models, reqparsers, page_cache
+from pagetags.models import db
+from pagetags.conditional import conditional
 
 
+@conditional(
+    lambda: models.Url.get_last_changed_at(db.session), per_user=True)
+@page_cache.cached("index", lambda: ["posts"])
 def index():
     front_page_item_count = current_app.config["FRONT_PAGE_ITEM_COUNT"]
 
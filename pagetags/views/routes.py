@@ -1,7 +1,9 @@
-from pagetags.views import posts, tags, authentication, categories
+from pagetags.views import posts, tags, authentication, categories, fragments
 
 
 def add_view_routes(app):
+    app.add_template_global(fragments.render_post, "render_post")
+
     app.add_url_rule("/", view_func=posts.index)
     app.add_url_rule("/tag/<name>", view_func=tags.tag)
     app.add_url_rule(
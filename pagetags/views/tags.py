@@ -1,9 +1,13 @@
 from flask import current_app, render_template
 
-from pagetags import models, reqparsers
+from pagetags import models, reqparsers, page_cache
 from pagetags.models import db
+from pagetags.conditional import conditional
 
 
+@conditional(
+    lambda name: models.Tag.get_changed_at(db.session, name), per_user=True)
+@page_cache.cached("tag", lambda name: [u"tag:%s" % name])
 def tag(name):
     args = reqparsers.tag_posts.parse_args()
 
@@ -22,12 +22,16 @@ setup(
         "arrow==0.10.0",
         "flask-restful-swagger==0.19"
     ],
+    extras_require={
+        "metrics": ["prometheus_client==0.12.0"]
+    },
     include_package_data=True,
     zip_safe=False,
     setup_requires=["nose==1.3.7"],
     tests_require=[
         "nose==1.3.7",
-        "mock==2.0.0"
+        "mock==2.0.0",
+        "prometheus_client==0.12.0"
     ],
     test_suite = 'nose.collector',
     entry_points={
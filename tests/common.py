@@ -3,6 +3,7 @@ from unittest import TestCase
 from datetime import datetime
 import json
 
+from sqlalchemy import event
 from sqlalchemy.exc import SQLAlchemyError
 
 from pagetags.main import create_app
@@ -10,13 +11,59 @@ from pagetags import db
 from pagetags.models import User, Post, Category, PostCategory
 
 
+class QueryCounter(object):
+    """Context manager that counts the queries executed by an engine"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    @property
+    def select_count(self):
+        return len([
+            statement
+            for statement in self.statements
+            if statement.lstrip().upper().startswith("SELECT")
+        ])
+
+    def _before_cursor_execute(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(
+            self.engine, "before_cursor_execute", self._before_cursor_execute)
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        event.remove(
+            self.engine, "before_cursor_execute", self._before_cursor_execute)
+
+
+# the PostgreSQL database that is used by the tests of the PostgreSQL
+# specific queries. The tests are skipped when it isn't set. The database is
+# erased
+POSTGRESQL_DATABASE_URI = os.environ.get("PAGETAGS_TEST_POSTGRESQL_URI")
+
+
 class PagetagsTest(TestCase):
+    # the database of the test case. The database of the settings file is
+    # used when it is None
+    database_uri = None
+
     def setUp(self):
         settings_file = os.path.join(
             os.path.dirname(os.path.abspath(__file__)), "settings.py")
 
         self.app = create_app(settings_file, "testing")
 
+        if self.database_uri is not None:
+            self.app.config["SQLALCHEMY_DATABASE_URI"] = self.database_uri
+
         with self.app.app_context():
             try:
                 db.drop_all()
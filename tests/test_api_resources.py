@@ -1,4 +1,5 @@
 from unittest import main
+from datetime import datetime, timedelta
 import json
 import urllib
 
@@ -6,9 +7,11 @@ import jwt
 from mock import patch
 from sqlalchemy.exc import SQLAlchemyError
 
-from pagetags.models import Post, Url
+from pagetags import db, response_cache
+from pagetags.models import Post, Url, Category, PostCategory
+from pagetags.pagination import Cursor
 
-from common import PagetagsTestWithMockData
+from common import PagetagsTestWithMockData, QueryCounter
 
 
 class TagsTest(PagetagsTestWithMockData):
@@ -26,7 +29,10 @@ class TagsTest(PagetagsTestWithMockData):
         self.assertDictEqual(
             response,
             {
-                "tags": ["tag1", "tag2", "tag3", "tag4", "tag5"]
+                "tags": ["tag1", "tag2", "tag3", "tag4", "tag5"],
+                "post_counts": {
+                    "tag1": 4, "tag2": 2, "tag3": 1, "tag4": 1, "tag5": 1
+                }
             }
         )
 
@@ -129,6 +135,38 @@ class TagsTest(PagetagsTestWithMockData):
         self.assertItemsEqual(response["posts"][1]["tags"], ["tag1", "tag2"])
         self.assertIsNotNone(response["posts"][1]["added_at"])
 
+    def test_get_tag_posts_using_cursor(self):
+        token = self.authenticate(
+            self.test_user_username, self.test_user_password)
+
+        endpoint_url = "/api/v1/tag/tag1?%s" % urllib.urlencode(
+            {"per_page": 2})
+
+        response = self.client.get(
+            endpoint_url,
+            headers={"Authorization": "JWT %s" % token}
+        )
+
+        response = json.loads(response.data)
+
+        self.assertEqual(
+            [post["id"] for post in response["posts"]], [4, 3])
+
+        endpoint_url = "/api/v1/tag/tag1?%s" % urllib.urlencode(
+            {"per_page": 2, "after": response["next_cursor"]})
+
+        response = self.client.get(
+            endpoint_url,
+            headers={"Authorization": "JWT %s" % token}
+        )
+
+        response = json.loads(response.data)
+
+        self.assertFalse(response["has_more"])
+        self.assertIsNone(response["next_cursor"])
+        self.assertEqual(
+            [post["id"] for post in response["posts"]], [2, 1])
+
     def test_fail_to_get_page_of_tag_posts_that_does_not_exist(self):
         token = self.authenticate(
             self.test_user_username, self.test_user_password)
@@ -157,6 +195,388 @@ class TagsTest(PagetagsTestWithMockData):
         )
 
 
+class TagsPostsTests(PagetagsTestWithMockData):
+    def test_get_posts_that_have_all_the_tags(self):
+        token = self.authenticate(
+            self.test_user_username, self.test_user_password)
+
+        response = self.client.get(
+            "/api/v1/tags/posts?%s" % urllib.urlencode(
+                {"tags": "tag1, tag2", "per_page": 1}),
+            headers={"Authorization": "JWT %s" % token}
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        data = json.loads(response.data)
+
+        self.assertEqual(data["tags"], ["tag1", "tag2"])
+        self.assertEqual(data["mode"], "all")
+        self.assertTrue(data["has_more"])
+        self.assertEqual(len(data["posts"]), 1)
+        self.assertEqual(data["posts"][0]["id"], 4)
+        self.assertEqual(data["posts"][0]["tags"], ["tag1", "tag2", "tag5"])
+
+        response = self.client.get(
+            "/api/v1/tags/posts?%s" % urllib.urlencode(
+                {"tags": "tag1,tag2", "after": data["next_cursor"]}),
+            headers={"Authorization": "JWT %s" % token}
+        )
+
+        data = json.loads(response.data)
+
+        self.assertFalse(data["has_more"])
+        self.assertIsNone(data["next_cursor"])
+        self.assertEqual([post["id"] for post in data["posts"]], [1])
+
+    def test_get_posts_that_have_any_of_the_tags(self):
+        token = self.authenticate(
+            self.test_user_username, self.test_user_password)
+
+        response = self.client.get(
+            "/api/v1/tags/posts?%s" % urllib.urlencode(
+                {"tags": "tag3,tag4", "mode": "any"}),
+            headers={"Authorization": "JWT %s" % token}
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        data = json.loads(response.data)
+
+        self.assertEqual(data["mode"], "any")
+        self.assertEqual([post["id"] for post in data["posts"]], [3, 2])
+
+    def test_fail_to_get_posts_without_tags(self):
+        token = self.authenticate(
+            self.test_user_username, self.test_user_password)
+
+        response = self.client.get(
+            "/api/v1/tags/posts?%s" % urllib.urlencode({"tags": " , "}),
+            headers={"Authorization": "JWT %s" % token}
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+        data = json.loads(response.data)
+
+        self.assertDictEqual(
+            data,
+            {u'message': {u'tags': u'At least one tag is required'}}
+        )
+
+
+class SearchTests(PagetagsTestWithMockData):
+    def test_search_posts(self):
+        token = self.authenticate(
+            self.test_user_username, self.test_user_password)
+
+        response = self.client.get(
+            "/api/v1/search?%s" % urllib.urlencode(
+                {"q": "page_1", "per_page": 2}),
+            headers={"Authorization": "JWT %s" % token}
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        data = json.loads(response.data)
+
+        self.assertEqual(data["q"], "page_1")
+        self.assertEqual(data["per_page"], 2)
+        self.assertTrue(data["has_more"])
+        self.assertEqual([post["id"] for post in data["posts"]], [3, 2])
+        self.assertEqual(data["posts"][0]["tags"], ["tag1", "tag4"])
+
+        response = self.client.get(
+            "/api/v1/search?%s" % urllib.urlencode(
+                {"q": "page_1", "per_page": 2, "after": data["next_cursor"]}),
+            headers={"Authorization": "JWT %s" % token}
+        )
+
+        data = json.loads(response.data)
+
+        self.assertFalse(data["has_more"])
+        self.assertIsNone(data["next_cursor"])
+        self.assertEqual([post["id"] for post in data["posts"]], [1])
+
+    def test_fail_to_search_without_text(self):
+        token = self.authenticate(
+            self.test_user_username, self.test_user_password)
+
+        response = self.client.get(
+            "/api/v1/search?%s" % urllib.urlencode({"q": "  "}),
+            headers={"Authorization": "JWT %s" % token}
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+        data = json.loads(response.data)
+
+        self.assertDictEqual(
+            data,
+            {u'message': {u'q': u'A search text is required'}}
+        )
+
+    def test_fail_to_search_with_invalid_cursor(self):
+        token = self.authenticate(
+            self.test_user_username, self.test_user_password)
+
+        response = self.client.get(
+            "/api/v1/search?%s" % urllib.urlencode(
+                {"q": "post1", "after": "invalid"}),
+            headers={"Authorization": "JWT %s" % token}
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+        data = json.loads(response.data)
+
+        self.assertDictEqual(
+            data,
+            {u'message': {u'after': u'Invalid cursor'}}
+        )
+
+
+class ResponseCacheTests(PagetagsTestWithMockData):
+    def setUp(self):
+        super(ResponseCacheTests, self).setUp()
+
+        self.app.config["RESPONSE_CACHE_BACKEND"] = "local"
+        response_cache.init_app(self.app)
+
+        self.token = self.authenticate(
+            self.test_user_username, self.test_user_password)
+
+    def get(self, endpoint_url):
+        response = self.client.get(
+            endpoint_url,
+            headers={"Authorization": "JWT %s" % self.token}
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        return json.loads(response.data)
+
+    def test_cached_response(self):
+        data = self.get("/api/v1/tag/tag2")
+
+        with self.app.app_context():
+            engine = db.get_engine(self.app)
+
+        with QueryCounter(engine) as counter:
+            cached_data = self.get("/api/v1/tag/tag2")
+
+        self.assertEqual(cached_data, data)
+        # only the change time of the tag is retrieved
+        self.assertEqual(counter.count, 1)
+        self.assertEqual(response_cache.hits, 1)
+
+    def test_responses_of_the_post_tags_are_invalidated_on_update(self):
+        self.get("/api/v1/tag/tag2")
+        self.get("/api/v1/tag/tag3")
+        self.get("/api/v1/post/1")
+
+        with self.app.app_context():
+            post = Post.get_by_id(db.session, 1)
+            post.update(
+                db.session, "new title", post.url.url, ["tag1", "tag3"])
+            db.session.commit()
+
+        data = self.get("/api/v1/tag/tag2")
+        self.assertEqual([post["id"] for post in data["posts"]], [4])
+
+        data = self.get("/api/v1/tag/tag3")
+        self.assertEqual([post["id"] for post in data["posts"]], [2, 1])
+        self.assertEqual(data["posts"][1]["title"], "new title")
+
+        data = self.get("/api/v1/post/1")
+        self.assertEqual(data["title"], "new title")
+
+        data = self.get("/api/v1/tags")
+        self.assertEqual(data["post_counts"]["tag2"], 1)
+
+    def test_responses_are_invalidated_when_posts_are_created(self):
+        self.get("/api/v1/tag/tag5")
+        self.get("/api/v1/tags")
+        self.get("/api/v1/categories")
+        self.get("/api/v1/url?url=http://www.example.com/page_2")
+
+        with self.app.app_context():
+            Post.create(
+                db.session,
+                "post5",
+                "http://www.example.com/page_2",
+                ["tag5"],
+                ["category_2"]
+            )
+            db.session.commit()
+
+        data = self.get("/api/v1/tag/tag5")
+        self.assertEqual(len(data["posts"]), 2)
+
+        data = self.get("/api/v1/tags")
+        self.assertEqual(data["post_counts"]["tag5"], 2)
+
+        data = self.get("/api/v1/categories")
+        self.assertEqual(data["post_counts"]["category_2"], 1)
+
+        data = self.get("/api/v1/url?url=http://www.example.com/page_2")
+        self.assertEqual(len(data["posts"]), 2)
+
+    def test_unrelated_responses_are_not_invalidated(self):
+        self.get("/api/v1/tag/tag4")
+
+        with self.app.app_context():
+            post = Post.get_by_id(db.session, 1)
+            post.update(db.session, "new title", post.url.url, ["tag1"])
+            db.session.commit()
+
+        self.get("/api/v1/tag/tag4")
+
+        self.assertEqual(response_cache.hits, 1)
+
+    def test_category_responses_are_invalidated(self):
+        self.get("/api/v1/category/category_2")
+
+        with self.app.app_context():
+            PostCategory.create(
+                db.session,
+                Post.get_by_id(db.session, 1),
+                Category.get_by_name(db.session, "category_2")
+            )
+            db.session.commit()
+
+        data = self.get("/api/v1/category/category_2")
+        self.assertEqual([post["id"] for post in data["posts"]], [1])
+
+
+class ConditionalRequestTests(PagetagsTestWithMockData):
+    def setUp(self):
+        super(ConditionalRequestTests, self).setUp()
+
+        self.token = self.authenticate(
+            self.test_user_username, self.test_user_password)
+
+    def get(self, endpoint_url, **headers):
+        headers["Authorization"] = "JWT %s" % self.token
+
+        return self.client.get(endpoint_url, headers=headers)
+
+    def test_posts_are_not_modified(self):
+        response = self.get("/api/v1/posts")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNotNone(response.headers.get("ETag"))
+        self.assertIsNotNone(response.headers.get("Last-Modified"))
+
+        with self.app.app_context():
+            engine = db.get_engine(self.app)
+
+        with QueryCounter(engine) as counter:
+            not_modified_response = self.get(
+                "/api/v1/posts", **{"If-None-Match": response.headers["ETag"]})
+
+        self.assertEqual(not_modified_response.status_code, 304)
+        self.assertEqual(not_modified_response.data, "")
+        self.assertEqual(
+            not_modified_response.headers["ETag"], response.headers["ETag"])
+        self.assertEqual(counter.count, 1)
+
+    def set_urls_changed_at(self, changed_at):
+        with self.app.app_context():
+            for url in db.session.query(Url).order_by(Url.id):
+                url.changed_at = changed_at
+                changed_at += timedelta(milliseconds=100)
+            db.session.commit()
+
+    def test_changes_in_the_same_second(self):
+        self.set_urls_changed_at(datetime(2016, 10, 5, 12, 30, 0, 100000))
+
+        response = self.get("/api/v1/posts")
+
+        with self.app.app_context():
+            url = Url.get_by_url(db.session, "http://www.example.com/page_1")
+            url.changed_at = datetime(2016, 10, 5, 12, 30, 0, 900000)
+            db.session.commit()
+
+        modified_response = self.get(
+            "/api/v1/posts",
+            **{"If-Modified-Since": response.headers["Last-Modified"]}
+        )
+
+        self.assertEqual(modified_response.status_code, 200)
+
+    def test_if_modified_since_is_ignored_when_content_is_deleted(self):
+        self.set_urls_changed_at(datetime(2016, 10, 5, 12, 30, 0))
+
+        response = self.get("/api/v1/posts")
+
+        # the last change time of the urls decreases when the last changed
+        # url is deleted
+        with self.app.app_context():
+            url = db.session.query(Url).order_by(Url.changed_at.desc())\
+                                       .first()
+            db.session.delete(url)
+            db.session.commit()
+
+        modified_response = self.get(
+            "/api/v1/posts",
+            **{"If-Modified-Since": response.headers["Last-Modified"]}
+        )
+
+        self.assertEqual(modified_response.status_code, 200)
+
+    def test_posts_are_modified(self):
+        response = self.get("/api/v1/posts")
+
+        with self.app.app_context():
+            post = Post.get_by_id(db.session, 1)
+            post.update(db.session, "new title", post.url.url, ["tag1"])
+            db.session.commit()
+
+        modified_response = self.get(
+            "/api/v1/posts", **{"If-None-Match": response.headers["ETag"]})
+
+        self.assertEqual(modified_response.status_code, 200)
+        self.assertNotEqual(
+            modified_response.headers["ETag"], response.headers["ETag"])
+
+    def test_etag_depends_on_the_query_arguments(self):
+        response = self.get("/api/v1/posts?per_page=2")
+
+        response = self.get(
+            "/api/v1/posts?per_page=3",
+            **{"If-None-Match": response.headers["ETag"]}
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_tag_posts_are_not_modified(self):
+        response = self.get("/api/v1/tag/tag4")
+
+        with self.app.app_context():
+            Post.create(
+                db.session, "post5", "http://www.example.com/page_5",
+                ["tag5"], []
+            )
+            db.session.commit()
+
+        not_modified_response = self.get(
+            "/api/v1/tag/tag4", **{"If-None-Match": response.headers["ETag"]})
+
+        self.assertEqual(not_modified_response.status_code, 304)
+
+        response = self.get(
+            "/api/v1/tag/tag5", **{"If-None-Match": response.headers["ETag"]})
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_tag_that_does_not_exist(self):
+        response = self.get("/api/v1/tag/tag999")
+
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("ETag", response.headers)
+
+
 class FailtToAccessApPIEndpointWithouTokenTests(PagetagsTestWithMockData):
     def test_fail_to_access_tags_endpoint_without_token(self):
         response = self.client.get("/api/v1/tag/tag1")
@@ -366,6 +786,206 @@ class PostApiTests(PagetagsTestWithMockData):
         )
 
 
+class BulkPostApiTests(PagetagsTestWithMockData):
+    def test_add_posts(self):
+        token = self.authenticate(
+            self.test_user_username, self.test_user_password)
+
+        posts = {
+            "posts": [
+                {
+                    "title": "bulk post 1",
+                    "url": "http://www.example.com/page_1",
+                    "tags": ["tag1", "tag100"],
+                    "categories": ["category_1"]
+                },
+                {
+                    "title": "",
+                    "url": "http://www.example.com/page_3",
+                    "tags": ["tag1"],
+                    "categories": []
+                },
+                {
+                    "title": "bulk post 2",
+                    "url": "http://www.example.com/page_3",
+                    "tags": ["tag100", "tag101"],
+                    "categories": ["category_3"]
+                }
+            ]
+        }
+
+        response = self.client.post(
+            "/api/v1/posts/bulk",
+            headers={"Authorization": "JWT %s" % token,
+                     "Content-Type": "application/json"},
+            data=json.dumps(posts)
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        data = json.loads(response.data)
+
+        self.assertEqual(len(data["posts"]), 3)
+
+        self.assertIsNotNone(data["posts"][0]["id"])
+        self.assertIsNone(data["posts"][0]["error"])
+
+        self.assertDictEqual(
+            data["posts"][1],
+            {
+                "id": None,
+                "error": "A title is required",
+                "error_code": 2004
+            }
+        )
+
+        self.assertIsNotNone(data["posts"][2]["id"])
+
+        with self.app.app_context():
+            post = Post.get_by_id(db.session, data["posts"][0]["id"])
+
+            self.assertEqual(post.title, "bulk post 1")
+            self.assertEqual(post.url.url, "http://www.example.com/page_1")
+            self.assertEqual(post.tag_names(), ["tag1", "tag100"])
+            self.assertEqual(post.category_names(), ["category_1"])
+
+            post = Post.get_by_id(db.session, data["posts"][2]["id"])
+
+            self.assertEqual(post.title, "bulk post 2")
+            self.assertEqual(post.url.url, "http://www.example.com/page_3")
+            self.assertEqual(post.tag_names(), ["tag100", "tag101"])
+            self.assertEqual(post.category_names(), ["category_3"])
+
+    def test_fail_to_add_too_many_posts(self):
+        self.app.config["BULK_POSTS_MAX_COUNT"] = 1
+
+        token = self.authenticate(
+            self.test_user_username, self.test_user_password)
+
+        post = {
+            "title": "bulk post",
+            "url": "http://www.example.com/page_1",
+            "tags": ["tag1"],
+            "categories": []
+        }
+
+        response = self.client.post(
+            "/api/v1/posts/bulk",
+            headers={"Authorization": "JWT %s" % token,
+                     "Content-Type": "application/json"},
+            data=json.dumps({"posts": [post, post]})
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+        data = json.loads(response.data)
+
+        self.assertDictEqual(
+            data,
+            {
+                "error": "too many posts",
+                "error_code": 2003,
+                "max_count": 1
+            }
+        )
+
+    @patch("pagetags.api.resources.posts.db.session.commit")
+    def test_fail_to_add_posts_when_database_commit_fails(self, commit_mock):
+        commit_mock.side_effect = SQLAlchemyError
+
+        token = self.authenticate(
+            self.test_user_username, self.test_user_password)
+
+        post = {
+            "title": "bulk post",
+            "url": "http://www.example.com/page_1",
+            "tags": ["tag1"],
+            "categories": []
+        }
+
+        response = self.client.post(
+            "/api/v1/posts/bulk",
+            headers={"Authorization": "JWT %s" % token,
+                     "Content-Type": "application/json"},
+            data=json.dumps({"posts": [post]})
+        )
+
+        self.assertEqual(response.status_code, 500)
+
+        data = json.loads(response.data)
+
+        self.assertDictEqual(
+            data,
+            {
+                "error": "failed to add posts",
+                "error_code": 2002
+            }
+        )
+
+
+class ExportPostsApiTests(PagetagsTestWithMockData):
+    def test_export_posts(self):
+        token = self.authenticate(
+            self.test_user_username, self.test_user_password)
+
+        response = self.client.get(
+            "/api/v1/posts/export",
+            headers={"Authorization": "JWT %s" % token}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        self.assertTrue(response.is_streamed)
+
+        lines = response.data.decode("utf-8").splitlines()
+        posts = [json.loads(line) for line in lines]
+
+        self.assertEqual([post["id"] for post in posts], [1, 2, 3, 4])
+        self.assertEqual(
+            posts[3],
+            {
+                "id": 4,
+                "title": "post4",
+                "url": "http://www.example.com/page_2",
+                "tags": ["tag1", "tag2", "tag5"],
+                "categories": ["category_1"],
+                "added_at": "2016-10-05T12:33:00"
+            }
+        )
+
+    def test_export_posts_with_filters(self):
+        token = self.authenticate(
+            self.test_user_username, self.test_user_password)
+
+        response = self.client.get(
+            "/api/v1/posts/export?tag=tag1&added_after=2016-10-05T12:31:00"
+            "&added_before=2016-10-05T12:33:00",
+            headers={"Authorization": "JWT %s" % token}
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        lines = response.data.decode("utf-8").splitlines()
+
+        self.assertEqual([json.loads(line)["id"] for line in lines], [2, 3])
+
+    def test_export_posts_with_invalid_timestamp(self):
+        token = self.authenticate(
+            self.test_user_username, self.test_user_password)
+
+        response = self.client.get(
+            "/api/v1/posts/export?added_after=yesterday",
+            headers={"Authorization": "JWT %s" % token}
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_export_posts_requires_authentication(self):
+        response = self.client.get("/api/v1/posts/export")
+
+        self.assertEqual(response.status_code, 401)
+
+
 class UrlAPIEndpointTests(PagetagsTestWithMockData):
     def test_retrieve_postings_by_url(self):
         token = self.authenticate(
@@ -463,6 +1083,33 @@ class UrlAPIEndpointTests(PagetagsTestWithMockData):
         self.assertItemsEqual(response["posts"][0]["tags"], ["tag1", "tag2"])
         self.assertIsNotNone(response["posts"][0]["added_at"])
 
+    def test_retrieve_url_posts_using_cursor(self):
+        token = self.authenticate(
+            self.test_user_username, self.test_user_password)
+
+        url = "http://www.example.com/page_1"
+
+        response = self.client.get(
+            "/api/v1/url?%s" % urllib.urlencode({"url": url, "per_page": 2}),
+            headers={"Authorization": "JWT %s" % token},
+        )
+
+        response = json.loads(response.data)
+
+        response = self.client.get(
+            "/api/v1/url?%s" % urllib.urlencode(
+                {"url": url, "per_page": 2, "after": response["next_cursor"]}),
+            headers={"Authorization": "JWT %s" % token},
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        response = json.loads(response.data)
+
+        self.assertFalse(response["has_more"])
+        self.assertEqual(len(response["posts"]), 1)
+        self.assertEqual(response["posts"][0]["id"], 1)
+
     def test_fail_to_retrieve_posts_for_url_that_does_not_exist(self):
         token = self.authenticate(
             self.test_user_username, self.test_user_password)
@@ -615,6 +1262,54 @@ class APIPostRetrievalTests(PagetagsTestWithMockData):
         self.assertItemsEqual(data["posts"][1]["tags"], ["tag1", "tag2"])
         self.assertIsNotNone(data["posts"][1]["added_at"])
 
+    def test_get_posts_using_cursor(self):
+        token = self.authenticate(
+            self.test_user_username, self.test_user_password)
+
+        response = self.client.get(
+            "/api/v1/posts?%s" % urllib.urlencode({"per_page": 3}),
+            headers={"Authorization": "JWT %s" % token}
+        )
+
+        data = json.loads(response.data)
+
+        self.assertTrue(data["has_more"])
+        self.assertEqual(
+            [post["id"] for post in data["posts"]], [4, 3, 2])
+        self.assertIsNotNone(data["next_cursor"])
+
+        response = self.client.get(
+            "/api/v1/posts?%s" % urllib.urlencode(
+                {"per_page": 3, "after": data["next_cursor"]}),
+            headers={"Authorization": "JWT %s" % token}
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        data = json.loads(response.data)
+
+        self.assertFalse(data["has_more"])
+        self.assertEqual([post["id"] for post in data["posts"]], [1])
+        self.assertIsNone(data["next_cursor"])
+
+    def test_fail_to_get_posts_using_invalid_cursor(self):
+        token = self.authenticate(
+            self.test_user_username, self.test_user_password)
+
+        response = self.client.get(
+            "/api/v1/posts?%s" % urllib.urlencode({"after": "invalid"}),
+            headers={"Authorization": "JWT %s" % token}
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+        data = json.loads(response.data)
+
+        self.assertDictEqual(
+            data,
+            {u'message': {u'after': u'Invalid cursor'}}
+        )
+
     def test_get_error_when_requesting_page_that_does_not_exist(self):
         token = self.authenticate(
             self.test_user_username, self.test_user_password)
@@ -627,6 +1322,70 @@ class APIPostRetrievalTests(PagetagsTestWithMockData):
         self.assertEqual(response.status_code, 404)
 
 
+class CategoriesTests(PagetagsTestWithMockData):
+    def test_get_categories(self):
+        token = self.authenticate(
+            self.test_user_username, self.test_user_password)
+
+        response = self.client.get(
+            "/api/v1/categories",
+            headers={"Authorization": "JWT %s" % token}
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        data = json.loads(response.data)
+
+        self.assertDictEqual(
+            data,
+            {
+                "categories": ["category_2", "category_1"],
+                "post_counts": {"category_1": 1, "category_2": 0}
+            }
+        )
+
+
+class CategoryPostsTests(PagetagsTestWithMockData):
+    def test_get_category_posts(self):
+        token = self.authenticate(
+            self.test_user_username, self.test_user_password)
+
+        response = self.client.get(
+            "/api/v1/category/category_1",
+            headers={"Authorization": "JWT %s" % token}
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        data = json.loads(response.data)
+
+        self.assertEqual(data["category_id"], 1)
+        self.assertEqual(data["category"], "category_1")
+        self.assertFalse(data["has_more"])
+        self.assertIsNone(data["next_cursor"])
+        self.assertEqual([post["id"] for post in data["posts"]], [4])
+
+    def test_get_category_posts_using_cursor(self):
+        token = self.authenticate(
+            self.test_user_username, self.test_user_password)
+
+        with self.app.app_context():
+            after = Cursor.from_post(Post.get_by_id(db.session, 4)).encode()
+
+        response = self.client.get(
+            "/api/v1/category/category_1?%s" % urllib.urlencode(
+                {"after": after}),
+            headers={"Authorization": "JWT %s" % token}
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        data = json.loads(response.data)
+
+        self.assertFalse(data["has_more"])
+        self.assertEqual(data["posts"], [])
+
+
 class AuthenticationTests(PagetagsTestWithMockData):
     def test_authenticate(self):
         request_data = {
@@ -833,7 +1592,10 @@ class APITokenTests(PagetagsTestWithMockData):
         self.assertDictEqual(
             response,
             {
-                "tags": ["tag1", "tag2", "tag3", "tag4", "tag5"]
+                "tags": ["tag1", "tag2", "tag3", "tag4", "tag5"],
+                "post_counts": {
+                    "tag1": 4, "tag2": 2, "tag3": 1, "tag4": 1, "tag5": 1
+                }
             }
         )
 
@@ -0,0 +1,91 @@
+from unittest import TestCase, main
+from tempfile import mkdtemp
+import json
+import os
+import shutil
+
+from flask_restful_swagger import registry
+
+from pagetags.main import create_app
+from pagetags.api.spec import build_spec, write_spec
+
+
+TESTS_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+def apis_by_path(spec):
+    return {api["path"]: api for api in spec["apis"]}
+
+
+class ApiSpecTests(TestCase):
+    def setUp(self):
+        self.directory = mkdtemp()
+
+        self.spec_file = os.path.join(self.directory, "api_spec.json")
+        with open(self.spec_file, "w") as f:
+            write_spec(build_spec(), f)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def create_app(self, spec_file=None):
+        settings_file = os.path.join(self.directory, "settings.py")
+
+        with open(os.path.join(TESTS_DIRECTORY, "settings.py")) as f:
+            settings = f.read()
+
+        with open(settings_file, "w") as f:
+            f.write(settings)
+            f.write("\nAPI_SPEC_FILE = %r\n" % spec_file)
+
+        return create_app(settings_file, "testing")
+
+    def get_spec(self, app):
+        response = app.test_client().get("/api/spec.json")
+
+        self.assertEqual(response.status_code, 200)
+
+        return json.loads(response.data)
+
+    def test_built_spec_is_identical_to_the_runtime_spec(self):
+        # flask-restful-swagger keeps the specification of the applications
+        # in a global registry and serves it only by the first application
+        # of the process
+        self.create_app()
+        runtime_spec = registry["app"]
+
+        with open(self.spec_file) as f:
+            spec = json.load(f)
+
+        self.assertEqual(apis_by_path(runtime_spec), apis_by_path(spec))
+        self.assertEqual(runtime_spec["models"], spec["models"])
+
+        for key in ["apiVersion", "swaggerVersion", "spec_endpoint_path",
+                    "resourcePath", "produces", "description"]:
+            self.assertEqual(runtime_spec[key], spec[key])
+
+    def test_serve_spec_file(self):
+        app = self.create_app(self.spec_file)
+
+        spec = self.get_spec(app)
+
+        self.assertEqual(spec["basePath"], "http://localhost")
+        self.assertIn("/api/v1/posts", apis_by_path(spec))
+        self.assertIn("Post", spec["models"])
+
+    def test_do_not_register_swagger_endpoints(self):
+        app = self.create_app(self.spec_file)
+
+        endpoints = set(rule.endpoint for rule in app.url_map.iter_rules())
+
+        self.assertIn("postsresource", endpoints)
+        self.assertNotIn("/api/v1/posts/help", endpoints)
+        self.assertNotIn("app/registry", endpoints)
+
+        client = app.test_client()
+        self.assertEqual(client.get("/api/spec.html").status_code, 404)
+        self.assertEqual(client.get("/api/v1/tags").status_code, 401)
+
+
+if __name__ == "__main__":
+    main()
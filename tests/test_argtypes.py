@@ -1,8 +1,10 @@
 from unittest import TestCase, main
 from argparse import ArgumentTypeError
+from datetime import datetime
 
 from pagetags import argtypes
-from pagetags.models import Post, Url
+from pagetags.models import Post, Url, Category
+from pagetags.pagination import Cursor, SearchCursor
 
 
 class PostTitleTests(TestCase):
@@ -37,5 +39,131 @@ class PostUrlTests(TestCase):
             ArgumentTypeError, argtypes.post_title, large_post_url)
 
 
+class CursorTests(TestCase):
+    def test_cursor(self):
+        encoded = Cursor(datetime(2016, 10, 5, 12, 30, 0, 15), 4).encode()
+
+        cursor = argtypes.cursor(encoded)
+
+        self.assertEqual(cursor.added_at, datetime(2016, 10, 5, 12, 30, 0, 15))
+        self.assertEqual(cursor.id, 4)
+
+    def test_raise_error_on_invalid_cursor(self):
+        self.assertRaises(ArgumentTypeError, argtypes.cursor, "invalid")
+
+    def test_raise_error_on_cursor_with_invalid_id(self):
+        encoded = Cursor(datetime(2016, 10, 5, 12, 30, 0), "a").encode()
+
+        self.assertRaises(ArgumentTypeError, argtypes.cursor, encoded)
+
+
+class SearchCursorTests(TestCase):
+    def test_search_cursor(self):
+        encoded = SearchCursor(0.123456789, 4).encode()
+
+        cursor = argtypes.search_cursor(encoded)
+
+        self.assertEqual(cursor.score, 0.123456789)
+        self.assertEqual(cursor.id, 4)
+
+    def test_raise_error_on_invalid_search_cursor(self):
+        encoded = Cursor(datetime(2016, 10, 5, 12, 30, 0), 4).encode()
+
+        self.assertRaises(ArgumentTypeError, argtypes.search_cursor, encoded)
+
+
+class SearchTextTests(TestCase):
+    def test_search_text(self):
+        self.assertEqual(argtypes.search_text(" post1 "), "post1")
+
+    def test_raise_error_on_empty_search_text(self):
+        self.assertRaises(ArgumentTypeError, argtypes.search_text, "  ")
+
+
+class TimestampTests(TestCase):
+    def test_timestamp(self):
+        self.assertEqual(
+            argtypes.timestamp("2016-10-05T12:30:15"),
+            datetime(2016, 10, 5, 12, 30, 15)
+        )
+
+    def test_timestamp_with_microseconds(self):
+        self.assertEqual(
+            argtypes.timestamp("2016-10-05T12:30:15.123456"),
+            datetime(2016, 10, 5, 12, 30, 15, 123456)
+        )
+
+    def test_date(self):
+        self.assertEqual(
+            argtypes.timestamp("2016-10-05"), datetime(2016, 10, 5))
+
+    def test_raise_error_on_invalid_timestamp(self):
+        self.assertRaises(
+            ArgumentTypeError, argtypes.timestamp, "05/10/2016 12:30")
+
+
+class TagNamesTests(TestCase):
+    def test_tag_names(self):
+        self.assertEqual(
+            argtypes.tag_names("tag1, tag2,,tag3 "), ["tag1", "tag2", "tag3"])
+
+    def test_raise_error_on_empty_tag_names(self):
+        self.assertRaises(ArgumentTypeError, argtypes.tag_names, " , ")
+
+
+class NewPostTests(TestCase):
+    def test_new_post(self):
+        post = argtypes.new_post({
+            "title": " post title ",
+            "url": "http://www.example.com",
+            "tags": ["tag1"],
+            "categories": ["category_1"]
+        })
+
+        self.assertDictEqual(
+            post,
+            {
+                "title": "post title",
+                "url": "http://www.example.com",
+                "tags": ["tag1"],
+                "categories": ["category_1"]
+            }
+        )
+
+    def test_raise_error_on_post_that_is_not_an_object(self):
+        self.assertRaises(ArgumentTypeError, argtypes.new_post, "post")
+
+    def test_raise_error_on_missing_field(self):
+        self.assertRaises(
+            ArgumentTypeError,
+            argtypes.new_post,
+            {"title": "post title", "url": "http://www.example.com"}
+        )
+
+    def test_raise_error_on_invalid_tags(self):
+        self.assertRaises(
+            ArgumentTypeError,
+            argtypes.new_post,
+            {
+                "title": "post title",
+                "url": "http://www.example.com",
+                "tags": [1],
+                "categories": []
+            }
+        )
+
+    def test_raise_error_on_very_large_category_name(self):
+        self.assertRaises(
+            ArgumentTypeError,
+            argtypes.new_post,
+            {
+                "title": "post title",
+                "url": "http://www.example.com",
+                "tags": [],
+                "categories": ["a" * (Category.NAME_LENGTH + 1)]
+            }
+        )
+
+
 if __name__ == "__main__":
     main()
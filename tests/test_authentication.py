@@ -1,12 +1,17 @@
 from unittest import main, TestCase
+from tempfile import mkdtemp
+from shutil import rmtree
+import os
 
 import arrow
 
+from pagetags import db
 from pagetags.models import User
 from pagetags.authentication import (payload_handler, create_token_payload,
-                                     create_token)
+                                     create_token, identity, identity_cache)
+from pagetags.cache import FileInvalidationSignal
 
-from common import PagetagsTestWithMockData
+from common import PagetagsTestWithMockData, QueryCounter
 
 
 class PayloadHandlerTests(PagetagsTestWithMockData):
@@ -23,6 +28,76 @@ class PayloadHandlerTests(PagetagsTestWithMockData):
             self.assertEqual(payload["jti"], "abcde")
 
 
+class IdentityTests(PagetagsTestWithMockData):
+    def get_identity(self, jti=None):
+        payload = {
+            "identity": self.test_user_id,
+            "jti": jti or self.test_user_jti
+        }
+
+        with self.app.test_request_context():
+            return identity(payload)
+
+    def test_identity_is_cached(self):
+        with self.app.app_context():
+            engine = db.get_engine(self.app)
+
+        with QueryCounter(engine) as counter:
+            user = self.get_identity()
+            self.assertEqual(user.id, self.test_user_id)
+
+            user = self.get_identity()
+            self.assertEqual(user.id, self.test_user_id)
+
+        self.assertEqual(counter.count, 1)
+        self.assertEqual(identity_cache.hits, 1)
+        self.assertEqual(identity_cache.misses, 1)
+
+    def test_identity_with_invalid_jti(self):
+        self.get_identity()
+
+        self.assertIsNone(self.get_identity("invalid"))
+
+    def test_cached_identity_is_invalidated_when_password_changes(self):
+        self.get_identity()
+
+        with self.app.app_context():
+            user = User.get_by_username(db.session, self.test_user_username)
+            user.change_password("new_password")
+            db.session.commit()
+
+            jti = user.jti
+
+        self.assertIsNone(self.get_identity())
+        self.assertEqual(self.get_identity(jti).id, self.test_user_id)
+
+    def test_cached_identity_is_invalidated_when_user_is_deleted(self):
+        self.get_identity()
+
+        with self.app.app_context():
+            User.delete(db.session, self.test_user_username)
+            db.session.commit()
+
+        self.assertIsNone(self.get_identity())
+
+    def test_cache_is_cleared_by_the_invalidation_signal(self):
+        directory = mkdtemp()
+        self.addCleanup(rmtree, directory)
+        path = os.path.join(directory, "signal")
+
+        identity_cache.invalidation_signal = FileInvalidationSignal(path)
+
+        self.get_identity()
+        self.get_identity()
+        self.assertEqual(identity_cache.hits, 1)
+
+        FileInvalidationSignal(path).send()
+
+        self.get_identity()
+        self.assertEqual(identity_cache.hits, 1)
+        self.assertEqual(identity_cache.misses, 2)
+
+
 class TokenPayloadCreationTests(TestCase):
     def test_create_token_payload_without_expiration_date(self):
         user_id = 123
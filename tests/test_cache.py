@@ -0,0 +1,217 @@
+from unittest import main, TestCase
+from tempfile import mkdtemp
+from shutil import rmtree
+import os
+
+from flask import Flask
+
+from pagetags.cache import (
+    TTLCache, FileInvalidationSignal, LocalCacheClient, ResponseCache
+)
+
+
+class FakeTimer(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TTLCacheTests(TestCase):
+    def setUp(self):
+        self.timer = FakeTimer()
+        self.cache = TTLCache(max_size=2, ttl=10, timer=self.timer)
+
+    def test_get(self):
+        self.cache.set("key1", "value1")
+
+        self.assertEqual(self.cache.get("key1"), "value1")
+        self.assertIsNone(self.cache.get("key2"))
+        self.assertEqual(self.cache.get("key2", "default"), "default")
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_entries_expire(self):
+        self.cache.set("key1", "value1")
+        self.cache.set("key2", "value2", ttl=20)
+
+        self.timer.now += 10
+
+        self.assertIsNone(self.cache.get("key1"))
+        self.assertEqual(self.cache.get("key2"), "value2")
+        self.assertEqual(len(self.cache), 1)
+
+    def test_evict_least_recently_used_entry(self):
+        self.cache.set("key1", "value1")
+        self.cache.set("key2", "value2")
+        self.cache.get("key1")
+        self.cache.set("key3", "value3")
+
+        self.assertEqual(self.cache.get("key1"), "value1")
+        self.assertIsNone(self.cache.get("key2"))
+        self.assertEqual(self.cache.get("key3"), "value3")
+
+    def test_delete(self):
+        self.cache.set("key1", "value1")
+        self.cache.set("key2", "value2")
+
+        self.cache.delete("key1")
+        self.assertIsNone(self.cache.get("key1"))
+        self.assertEqual(self.cache.get("key2"), "value2")
+
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_add(self):
+        self.assertTrue(self.cache.add("key1", "value1"))
+        self.assertFalse(self.cache.add("key1", "value2"))
+        self.assertEqual(self.cache.get("key1"), "value1")
+
+        self.timer.now += 10
+
+        self.assertTrue(self.cache.add("key1", "value2"))
+        self.assertEqual(self.cache.get("key1"), "value2")
+
+    def test_disabled_cache(self):
+        cache = TTLCache(max_size=0)
+        cache.set("key1", "value1")
+
+        self.assertIsNone(cache.get("key1"))
+
+
+class FileInvalidationSignalTests(TestCase):
+    def setUp(self):
+        self.directory = mkdtemp()
+        self.path = os.path.join(self.directory, "signal")
+
+    def tearDown(self):
+        rmtree(self.directory)
+
+    def test_receive_signal(self):
+        sender = FileInvalidationSignal(self.path)
+        receiver = FileInvalidationSignal(self.path)
+
+        self.assertFalse(receiver.received())
+
+        sender.send()
+
+        self.assertFalse(sender.received())
+        self.assertTrue(receiver.received())
+        self.assertFalse(receiver.received())
+
+    def test_receive_signals_sent_at_the_same_time(self):
+        sender = FileInvalidationSignal(self.path)
+        receiver = FileInvalidationSignal(self.path)
+
+        sender.send()
+        modified_at = os.stat(self.path).st_mtime
+        self.assertTrue(receiver.received())
+
+        sender.send()
+        # the signal is received even if the modification time of the file
+        # hasn't changed
+        os.utime(self.path, (modified_at, modified_at))
+
+        self.assertTrue(receiver.received())
+        self.assertEqual(os.listdir(self.directory), ["signal"])
+
+
+class LocalCacheClientTests(TestCase):
+    def test_get_multi(self):
+        client = LocalCacheClient()
+        client.set("key1", "value1")
+        client.set("key2", "value2", time=10)
+
+        self.assertEqual(
+            client.get_multi(["key1", "key2", "key3"]),
+            {"key1": "value1", "key2": "value2"}
+        )
+
+    def test_delete_multi(self):
+        client = LocalCacheClient()
+        client.set("key1", "value1")
+        client.set("key2", "value2")
+
+        client.delete_multi(["key1"])
+
+        self.assertIsNone(client.get("key1"))
+        self.assertEqual(client.get("key2"), "value2")
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config.update(
+            RESPONSE_CACHE_BACKEND="local",
+            RESPONSE_CACHE_SIZE=100,
+            RESPONSE_CACHE_KEY_PREFIX="test",
+            RESPONSE_CACHE_DEFAULT_TTL=60,
+            RESPONSE_CACHE_TTLS={"disabled": 0}
+        )
+
+        self.cache = ResponseCache()
+        self.cache.init_app(self.app)
+
+        self.calls = []
+
+    def create_view(self, name):
+        @self.cache.cached(name, lambda tag: [u"tag:%s" % tag])
+        def view(tag):
+            self.calls.append(tag)
+
+            return {"tag": tag, "calls": len(self.calls)}
+
+        return view
+
+    def test_cached_response(self):
+        view = self.create_view("tag_posts")
+
+        with self.app.test_request_context("/?page=1"):
+            self.assertEqual(view(tag="tag1"), {"tag": "tag1", "calls": 1})
+            self.assertEqual(view(tag="tag1"), {"tag": "tag1", "calls": 1})
+            self.assertEqual(view(tag="tag2"), {"tag": "tag2", "calls": 2})
+
+        with self.app.test_request_context("/?page=2"):
+            self.assertEqual(view(tag="tag1"), {"tag": "tag1", "calls": 3})
+
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 3)
+
+    def test_invalidate(self):
+        view = self.create_view("tag_posts")
+
+        with self.app.test_request_context("/"):
+            view(tag="tag1")
+            view(tag="tag2")
+
+            self.cache.invalidate([u"tag:tag1"])
+
+            self.assertEqual(view(tag="tag1"), {"tag": "tag1", "calls": 3})
+            self.assertEqual(view(tag="tag2"), {"tag": "tag2", "calls": 2})
+
+    def test_resource_with_disabled_cache(self):
+        view = self.create_view("disabled")
+
+        with self.app.test_request_context("/"):
+            view(tag="tag1")
+            view(tag="tag1")
+
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(self.cache.hits, 0)
+
+    def test_disabled_cache(self):
+        self.app.config["RESPONSE_CACHE_BACKEND"] = None
+        self.cache.init_app(self.app)
+
+        view = self.create_view("tag_posts")
+
+        with self.app.test_request_context("/"):
+            view(tag="tag1")
+            view(tag="tag1")
+
+        self.assertEqual(len(self.calls), 2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+from unittest import TestCase, main
+from random import Random
+from datetime import datetime
+
+from pagetags.dataset import ZipfDistribution, generate_posts
+from pagetags.importer import parse_post
+
+
+class ZipfDistributionTests(TestCase):
+    def test_sample(self):
+        distribution = ZipfDistribution(100)
+        rng = Random(0)
+
+        counts = [0] * 100
+        for _ in range(10000):
+            counts[distribution.sample(rng)] += 1
+
+        self.assertGreater(counts[0], counts[1])
+        self.assertGreater(counts[1], counts[10])
+        self.assertGreater(counts[10], counts[99])
+
+        # the most common value is sampled about 1 / H(100) of the times
+        self.assertAlmostEqual(counts[0] / 10000.0, 0.19, delta=0.02)
+
+    def test_sample_distinct(self):
+        distribution = ZipfDistribution(5)
+
+        values = distribution.sample_distinct(Random(0), 10)
+
+        self.assertEqual(values, {0, 1, 2, 3, 4})
+
+
+class GeneratePostsTests(TestCase):
+    def test_generate_posts(self):
+        posts = list(generate_posts(
+            100, tag_count=20, category_count=5, url_count=50))
+
+        self.assertEqual(len(posts), 100)
+
+        for post in posts:
+            parse_post(post)
+
+            self.assertTrue(1 <= len(post["tags"]) <= 5)
+            self.assertTrue(0 <= len(post["categories"]) <= 2)
+
+        self.assertLessEqual(len({post["url"] for post in posts}), 50)
+        self.assertLessEqual(
+            len({tag for post in posts for tag in post["tags"]}), 20)
+
+        added_at = [post["added_at"] for post in posts]
+        self.assertEqual(added_at, sorted(added_at))
+
+    def test_generate_the_same_posts_using_the_same_seed(self):
+        posts = [
+            [
+                (post["title"], post["url"], post["tags"], post["categories"],
+                 post["added_at"])
+                for post in generate_posts(20, tag_count=10, seed=seed)
+            ]
+            for seed in [1, 1, 2]
+        ]
+
+        self.assertEqual(posts[0], posts[1])
+        self.assertNotEqual(posts[0], posts[2])
+
+    def test_add_posts_after_the_start_time(self):
+        posts = list(generate_posts(
+            10, tag_count=10, start=datetime(2017, 3, 1), days=10))
+
+        self.assertEqual(posts[0]["added_at"], "2017-03-01T00:00:00")
+        self.assertEqual(posts[-1]["added_at"], "2017-03-10T00:00:00")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+from unittest import TestCase, main
+from argparse import ArgumentTypeError
+from datetime import datetime
+from io import BytesIO, StringIO
+
+from mock import patch
+
+from pagetags import db, response_cache
+from pagetags.models import Post, Tag, Category, Url, ImportCheckpoint
+from pagetags.importer import (
+    import_posts, parse_post, read_csv, text_type, ImportProgress
+)
+from pagetags.ndjson import read_ndjson, to_ndjson
+from common import PagetagsTestWithMockData
+
+
+def csv_file(content):
+    # the csv module of python 2 reads bytes
+    if text_type is str:
+        return StringIO(content)
+
+    return BytesIO(content.encode("utf-8"))
+
+
+class ParsePostTests(TestCase):
+    def test_parse_post(self):
+        post = parse_post({
+            "title": " post title ",
+            "url": "http://www.example.com/page_1",
+            "tags": ["tag2", "tag1", "tag2"],
+            "categories": ["category_1"],
+            "added_at": "2016-10-05T12:30:00"
+        })
+
+        self.assertEqual(
+            post,
+            {
+                "title": "post title",
+                "url": "http://www.example.com/page_1",
+                "tags": ["tag1", "tag2"],
+                "categories": ["category_1"],
+                "added_at": datetime(2016, 10, 5, 12, 30, 0)
+            }
+        )
+
+    def test_parse_post_without_added_at(self):
+        post = parse_post({
+            "title": "post title",
+            "url": "http://www.example.com/page_1",
+            "tags": [],
+            "categories": []
+        })
+
+        self.assertIsNone(post["added_at"])
+
+    def test_raise_error_on_invalid_added_at(self):
+        self.assertRaises(
+            ArgumentTypeError,
+            parse_post,
+            {
+                "title": "post title",
+                "url": "http://www.example.com/page_1",
+                "tags": [],
+                "categories": [],
+                "added_at": 10
+            }
+        )
+
+
+class ReadCsvTests(TestCase):
+    def test_read_csv(self):
+        f = csv_file(
+            u"title,url,tags,categories,added_at\n"
+            u'post1,http://www.example.com/page_1,"tag1, tag2",,'
+            u"2016-10-05T12:30:00\n"
+            u"posté,http://www.example.com/page_2,tag1,category_1,\n"
+        )
+
+        records = list(read_csv(f))
+
+        self.assertEqual(
+            records,
+            [
+                {
+                    "title": "post1",
+                    "url": "http://www.example.com/page_1",
+                    "tags": ["tag1", "tag2"],
+                    "categories": [],
+                    "added_at": "2016-10-05T12:30:00"
+                },
+                {
+                    "title": u"posté",
+                    "url": "http://www.example.com/page_2",
+                    "tags": ["tag1"],
+                    "categories": ["category_1"]
+                }
+            ]
+        )
+
+
+class ReadNdjsonTests(TestCase):
+    def test_read_ndjson(self):
+        f = StringIO(u'{"id": 1}\n\n{"id": 2}\n')
+
+        self.assertEqual(list(read_ndjson(f)), [{"id": 1}, {"id": 2}])
+
+    def test_raise_error_on_invalid_json(self):
+        f = StringIO(u'{"id": 1}\n{"id": \n')
+
+        self.assertRaises(ValueError, list, read_ndjson(f))
+
+
+class ImportPostsTests(PagetagsTestWithMockData):
+    def setUp(self):
+        super(ImportPostsTests, self).setUp()
+
+        self.records = [
+            {
+                "title": "imported post 1",
+                "url": "http://www.example.com/page_1",
+                "tags": ["tag1", "tag100"],
+                "categories": ["category_1"],
+                "added_at": "2016-10-06T10:00:00"
+            },
+            {
+                "title": "",
+                "url": "http://www.example.com/page_3",
+                "tags": [],
+                "categories": []
+            },
+            {
+                "title": "imported post 2",
+                "url": "http://www.example.com/page_3",
+                "tags": ["tag100"],
+                "categories": ["category_3"]
+            }
+        ]
+
+    def test_import_posts(self):
+        with self.app.app_context():
+            result = import_posts(db.session, self.records, "posts.ndjson")
+
+            self.assertEqual(result, ImportProgress(3, 2, 1))
+
+            post = Post.get_by_id(db.session, 5)
+            self.assertEqual(post.title, "imported post 1")
+            self.assertEqual(post.url.url, "http://www.example.com/page_1")
+            self.assertEqual(post.tag_names(), ["tag1", "tag100"])
+            self.assertEqual(post.category_names(), ["category_1"])
+            self.assertEqual(post.added_at, datetime(2016, 10, 6, 10, 0, 0))
+
+            post = Post.get_by_id(db.session, 6)
+            self.assertEqual(post.title, "imported post 2")
+            self.assertEqual(post.url.url, "http://www.example.com/page_3")
+            self.assertEqual(post.tag_names(), ["tag100"])
+            self.assertEqual(post.category_names(), ["category_3"])
+            self.assertIsNotNone(post.added_at)
+
+            self.assertEqual(
+                Tag.get_by_name(db.session, "tag1").post_count, 5)
+            self.assertEqual(
+                Tag.get_by_name(db.session, "tag100").post_count, 2)
+            self.assertEqual(
+                Category.get_by_name(db.session, "category_1").post_count, 2)
+            self.assertEqual(
+                Category.get_by_name(db.session, "category_3").post_count, 1)
+
+            self.assertEqual(
+                ImportCheckpoint.get_position(db.session, "posts.ndjson"), 3)
+
+    def test_imported_posts_are_searchable(self):
+        with self.app.app_context():
+            import_posts(db.session, self.records, "posts.ndjson")
+
+            page = Post.search(db.session, "imported page_3")
+
+            self.assertEqual([post.id for post in page.items], [6])
+
+    def test_import_updates_the_change_time(self):
+        with self.app.app_context():
+            url = "http://www.example.com/page_1"
+            changed_at = Url.get_changed_at(db.session, url)
+
+            import_posts(db.session, self.records, "posts.ndjson")
+
+            self.assertGreater(Url.get_changed_at(db.session, url), changed_at)
+            self.assertIsNotNone(Tag.get_changed_at(db.session, "tag100"))
+
+    def test_import_invalidates_the_cached_responses(self):
+        with self.app.app_context():
+            with patch.object(response_cache, "invalidate") as invalidate:
+                import_posts(db.session, self.records, "posts.ndjson")
+
+            dependencies = invalidate.call_args[0][0]
+
+            self.assertIn("posts", dependencies)
+            self.assertIn("tag:tag100", dependencies)
+            self.assertIn("category:category_3", dependencies)
+            self.assertIn("url:http://www.example.com/page_3", dependencies)
+
+    def test_import_in_batches(self):
+        results = []
+
+        with self.app.app_context():
+            result = import_posts(
+                db.session,
+                self.records,
+                "posts.ndjson",
+                batch_size=2,
+                progress=results.append
+            )
+
+            self.assertEqual(result, ImportProgress(3, 2, 1))
+            self.assertEqual(
+                results, [ImportProgress(2, 1, 1), ImportProgress(3, 2, 1)])
+
+    def test_report_invalid_records(self):
+        errors = []
+
+        with self.app.app_context():
+            import_posts(
+                db.session,
+                self.records,
+                "posts.ndjson",
+                invalid_record=lambda position, error: errors.append(
+                    (position, error))
+            )
+
+            self.assertEqual(errors, [(2, "A title is required")])
+
+    def test_resume_import(self):
+        with self.app.app_context():
+            import_posts(
+                db.session, self.records[:2], "posts.ndjson", batch_size=1)
+
+            result = import_posts(
+                db.session, self.records, "posts.ndjson", batch_size=1)
+
+            self.assertEqual(result, ImportProgress(3, 1, 0))
+            self.assertEqual(
+                [post.title for post in db.session.query(Post)
+                                                  .filter(Post.id > 4)
+                                                  .order_by(Post.id)],
+                ["imported post 1", "imported post 2"]
+            )
+
+    def test_restart_import(self):
+        with self.app.app_context():
+            import_posts(db.session, self.records, "posts.ndjson")
+
+            result = import_posts(
+                db.session, self.records, "posts.ndjson", restart=True)
+
+            self.assertEqual(result, ImportProgress(3, 2, 1))
+            self.assertEqual(
+                Tag.get_by_name(db.session, "tag100").post_count, 4)
+
+    def test_import_exported_posts(self):
+        with self.app.app_context():
+            lines = list(to_ndjson(Post.export(db.session)))
+
+            result = import_posts(
+                db.session,
+                read_ndjson(StringIO(u"".join(lines))),
+                "export.ndjson"
+            )
+
+            self.assertEqual(result, ImportProgress(4, 4, 0))
+
+            post = Post.get_by_id(db.session, 8)
+            self.assertEqual(post.title, "post4")
+            self.assertEqual(post.tag_names(), ["tag1", "tag2", "tag5"])
+            self.assertEqual(post.category_names(), ["category_1"])
+            self.assertEqual(post.added_at, datetime(2016, 10, 5, 12, 33, 0))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+from unittest import main
+import re
+
+from mock import patch
+from sqlalchemy.exc import SQLAlchemyError
+
+from pagetags import db
+from pagetags.instrumentation import query_instrumentation
+from common import PagetagsTestWithMockData, QueryCounter
+
+
+class QueryInstrumentationTests(PagetagsTestWithMockData):
+    def setUp(self):
+        super(QueryInstrumentationTests, self).setUp()
+
+        self.app.config["SQL_INSTRUMENTATION_ENABLED"] = True
+        self.app.config["SLOW_REQUEST_DURATION"] = None
+        self.app.config["SLOW_REQUEST_QUERY_COUNT"] = None
+        query_instrumentation.init_app(self.app)
+
+        with self.app.app_context():
+            self.engine = db.get_engine(self.app)
+
+    def test_query_count_header(self):
+        with QueryCounter(self.engine) as counter:
+            response = self.client.get("/tag/tag1")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.headers["X-Query-Count"], str(counter.count))
+
+    def test_count_failed_queries(self):
+        def failed_query():
+            try:
+                db.session.execute("SELECT * FROM missing_table")
+            except SQLAlchemyError:
+                db.session.rollback()
+
+            db.session.execute("SELECT 1")
+
+            return ""
+
+        self.app.add_url_rule("/failed_query", "failed_query", failed_query)
+
+        response = self.client.get("/failed_query")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["X-Query-Count"], "2")
+
+    def test_server_timing_header(self):
+        response = self.client.get("/")
+
+        server_timing = response.headers["Server-Timing"]
+
+        self.assertRegexpMatches(
+            server_timing,
+            r'^db;dur=\d+\.\d{3};desc="\d+ queries", app;dur=\d+\.\d{3}$'
+        )
+
+        db_duration, app_duration = [
+            float(duration)
+            for duration in re.findall(r"dur=([\d.]+)", server_timing)
+        ]
+
+        self.assertLessEqual(db_duration, app_duration)
+
+    def test_log_slow_requests(self):
+        query_instrumentation.slow_request_query_count = 1
+
+        with patch.object(self.app.logger, "warning") as warning:
+            self.client.get("/tag/tag1")
+
+        self.assertEqual(warning.call_count, 1)
+
+        args = warning.call_args[0]
+        self.assertTrue(args[0].startswith("slow request"))
+        self.assertEqual(args[1:4], ("GET", "/tag/tag1?", 200))
+
+    def test_do_not_log_fast_requests(self):
+        query_instrumentation.slow_request_query_count = 1000
+        query_instrumentation.slow_request_duration = 10000
+
+        with patch.object(self.app.logger, "warning") as warning:
+            self.client.get("/tag/tag1")
+
+        self.assertFalse(warning.called)
+
+    def test_disable_headers(self):
+        query_instrumentation.headers = False
+
+        response = self.client.get("/")
+
+        self.assertNotIn("X-Query-Count", response.headers)
+        self.assertNotIn("Server-Timing", response.headers)
+
+
+class DisabledQueryInstrumentationTests(PagetagsTestWithMockData):
+    def test_instrumentation_is_disabled_by_default(self):
+        response = self.client.get("/")
+
+        self.assertNotIn("X-Query-Count", response.headers)
+        self.assertNotIn("Server-Timing", response.headers)
+
+
+if __name__ == "__main__":
+    main()
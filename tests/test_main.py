@@ -0,0 +1,71 @@
+from unittest import TestCase, main
+import os
+import subprocess
+import sys
+
+from pagetags.main import create_app
+
+
+class CreateAppTests(TestCase):
+    def create_app(self, components=None):
+        settings_file = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "settings.py")
+
+        return create_app(settings_file, "testing", components=components)
+
+    def endpoints(self, app):
+        return set(rule.endpoint for rule in app.url_map.iter_rules())
+
+    def test_create_app_with_all_components(self):
+        endpoints = self.endpoints(self.create_app())
+
+        self.assertIn("postsresource", endpoints)
+        self.assertIn("index", endpoints)
+        self.assertIn("admin.index", endpoints)
+
+    def test_create_api_app(self):
+        endpoints = self.endpoints(self.create_app(["api"]))
+
+        self.assertIn("postsresource", endpoints)
+        self.assertIn("_default_auth_request_handler", endpoints)
+        self.assertNotIn("index", endpoints)
+        self.assertNotIn("admin.index", endpoints)
+
+    def test_create_views_app(self):
+        endpoints = self.endpoints(self.create_app(["views"]))
+
+        self.assertIn("index", endpoints)
+        self.assertIn("login", endpoints)
+        self.assertNotIn("postsresource", endpoints)
+        self.assertNotIn("admin.index", endpoints)
+
+    def test_views_app_does_not_import_the_api(self):
+        # the modules are imported by a new process, because the tests import
+        # every module
+        script = (
+            "import sys\n"
+            "from pagetags.main import create_app\n"
+            "create_app(%r, 'testing', components=['views'])\n"
+            "print(','.join(sorted(name for name in sys.modules\n"
+            "                      if name.startswith('pagetags.api.') and\n"
+            "                      sys.modules[name] is not None)))\n"
+        ) % os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "settings.py")
+
+        project_directory = os.path.dirname(
+            os.path.dirname(os.path.abspath(__file__)))
+
+        output = subprocess.check_output(
+            [sys.executable, "-c", script], cwd=project_directory)
+
+        self.assertEqual(output.strip(), "")
+
+    def test_unknown_component(self):
+        self.assertRaises(ValueError, self.create_app, ["api", "unknown"])
+
+    def test_admin_requires_views(self):
+        self.assertRaises(ValueError, self.create_app, ["api", "admin"])
+
+
+if __name__ == "__main__":
+    main()
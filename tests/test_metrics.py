@@ -0,0 +1,151 @@
+from unittest import main
+import json
+
+from pagetags import db, page_cache
+from pagetags.metrics import metrics, endpoint_name
+from pagetags.importer import import_posts
+from common import PagetagsTestWithMockData
+
+
+class MetricsTests(PagetagsTestWithMockData):
+    def setUp(self):
+        super(MetricsTests, self).setUp()
+
+        self.app.config["METRICS_ENABLED"] = True
+        metrics.init_app(self.app)
+
+    def sample(self, name, **labels):
+        return metrics.registry.get_sample_value(name, labels)
+
+    def test_metrics_endpoint(self):
+        self.client.get("/tag/tag1")
+
+        response = self.client.get("/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith("text/plain"))
+        self.assertIn(
+            'pagetags_requests_total{endpoint="views.tags.tag",method="GET",'
+            'status="200"} 1.0',
+            response.data
+        )
+
+    def test_request_metrics(self):
+        token = self.authenticate(
+            self.test_user_username, self.test_user_password)
+
+        self.client.get(
+            "/api/v1/tags", headers={"Authorization": "JWT %s" % token})
+        self.client.get("/tag/unknown")
+
+        self.assertEqual(
+            self.sample(
+                "pagetags_request_duration_seconds_count",
+                endpoint="TagsResource",
+                method="GET"
+            ),
+            1.0
+        )
+        self.assertEqual(
+            self.sample(
+                "pagetags_requests_total",
+                endpoint="views.tags.tag",
+                method="GET",
+                status="404"
+            ),
+            1.0
+        )
+
+    def test_failed_request_metrics(self):
+        def fail():
+            raise RuntimeError("view failure")
+
+        self.app.add_url_rule("/fail", "fail", fail)
+        self.app.config["PROPAGATE_EXCEPTIONS"] = False
+        self.app.config["PRESERVE_CONTEXT_ON_EXCEPTION"] = False
+
+        response = self.client.get("/fail")
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(
+            self.sample(
+                "pagetags_requests_total",
+                endpoint="test_metrics.fail",
+                method="GET",
+                status="500"
+            ),
+            1.0
+        )
+        self.assertEqual(
+            self.sample(
+                "pagetags_request_duration_seconds_count",
+                endpoint="test_metrics.fail",
+                method="GET"
+            ),
+            1.0
+        )
+
+    def test_cache_metrics(self):
+        self.app.config["RESPONSE_CACHE_BACKEND"] = "local"
+        page_cache.init_app(self.app)
+
+        self.client.get("/")
+        self.client.get("/")
+
+        self.assertEqual(
+            self.sample("pagetags_cache_hits_total", cache="page"), 1.0)
+        self.assertEqual(
+            self.sample("pagetags_cache_misses_total", cache="page"), 1.0)
+
+    def test_ingested_posts(self):
+        token = self.authenticate(
+            self.test_user_username, self.test_user_password)
+
+        self.client.post(
+            "/api/v1/posts",
+            headers={"Authorization": "JWT %s" % token,
+                     "Content-Type": "application/json"},
+            data=json.dumps({
+                "title": "new post",
+                "url": "http://www.example.com/page_3",
+                "tags": ["tag1"],
+                "categories": []
+            })
+        )
+
+        with self.app.app_context():
+            import_posts(
+                db.session,
+                [
+                    {
+                        "title": "imported post %d" % i,
+                        "url": "http://www.example.com/page_3",
+                        "tags": ["tag1"],
+                        "categories": []
+                    }
+                    for i in range(3)
+                ],
+                "test"
+            )
+
+        self.assertEqual(
+            self.sample("pagetags_ingested_posts_total", source="api"), 1.0)
+        self.assertEqual(
+            self.sample("pagetags_ingested_posts_total", source="import"), 3.0)
+
+    def test_endpoint_names(self):
+        self.assertEqual(
+            endpoint_name(self.app, "postsresource"), "PostsResource")
+        self.assertEqual(endpoint_name(self.app, "tag"), "views.tags.tag")
+        self.assertEqual(endpoint_name(self.app, None), "unknown")
+
+
+class DisabledMetricsTests(PagetagsTestWithMockData):
+    def test_metrics_are_disabled_by_default(self):
+        response = self.client.get("/metrics")
+
+        self.assertEqual(response.status_code, 404)
+
+
+if __name__ == "__main__":
+    main()
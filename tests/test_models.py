@@ -1,13 +1,21 @@
-from unittest import main
+from unittest import main, skipUnless
+from datetime import datetime
+
+from mock import patch
 
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from werkzeug.security import check_password_hash
-from flask_sqlalchemy import Pagination
+from werkzeug.exceptions import NotFound
 
 from pagetags.models import User, Tag, Post, Url, Category, PostCategory
 from pagetags import db
+from pagetags.pagination import (
+    Cursor, KeysetPage, SearchCursor, SearchPage, OffsetPage
+)
 
-from common import PagetagsTest, PagetagsTestWithMockData
+from common import (PagetagsTest, PagetagsTestWithMockData,
+                    PagetagsTestsWithUser, QueryCounter,
+                    POSTGRESQL_DATABASE_URI)
 
 
 class UserCreationModelTests(PagetagsTest):
@@ -195,6 +203,58 @@ class TagCreationTests(PagetagsTest):
             self.assertEqual(tag.name, "tag1")
 
 
+class TagBatchCreationTests(PagetagsTest):
+    def test_get_or_create_many(self):
+        with self.app.app_context():
+            Tag.create(db.session, "tag1")
+
+            db.session.commit()
+
+            tags = Tag.get_or_create_many(
+                db.session, ["tag1", "tag2", "tag3", "tag2"])
+
+            self.assertItemsEqual(tags.keys(), ["tag1", "tag2", "tag3"])
+            self.assertEqual(tags["tag1"].id, 1)
+            self.assertIsNotNone(tags["tag2"].id)
+            self.assertIsNotNone(tags["tag3"].id)
+
+            try:
+                db.session.commit()
+            except SQLAlchemyError:
+                db.session.rollback()
+                self.fail("failed to commit transaction")
+
+            self.assertEqual(db.session.query(Tag).count(), 3)
+
+    def test_get_or_create_many_with_pending_tags(self):
+        with self.app.app_context():
+            tag = Tag.create(db.session, "tag1")
+
+            tags = Tag.get_or_create_many(db.session, ["tag1", "tag2"])
+
+            self.assertIs(tags["tag1"], tag)
+
+            try:
+                db.session.commit()
+            except SQLAlchemyError:
+                db.session.rollback()
+                self.fail("failed to commit transaction")
+
+            self.assertEqual(db.session.query(Tag).count(), 2)
+
+    def test_get_or_create_many_without_names(self):
+        with self.app.app_context():
+            self.assertEqual(Tag.get_or_create_many(db.session, []), {})
+
+    def test_get_or_create_many_resolves_names_with_fixed_query_count(self):
+        with self.app.app_context():
+            with QueryCounter(db.get_engine(self.app)) as counter:
+                Tag.get_or_create_many(
+                    db.session, ["tag{}".format(i) for i in range(100)])
+
+            self.assertEqual(counter.count, 2)
+
+
 class UrlCreationTests(PagetagsTest):
     def test_create_url(self):
         with self.app.app_context():
@@ -319,6 +379,25 @@ class PostCreationTests(PagetagsTest):
 
             self.assertItemsEqual(post.tag_names(), ["tag1", "tag2"])
 
+    def test_create_post_with_duplicate_tags(self):
+        with self.app.app_context():
+            post = Post.create(
+                db.session,
+                "post title",
+                "http://www.example.com",
+                ["tag1", "tag2", "tag1"],
+                ["category_1", "category_1"]
+            )
+
+            try:
+                db.session.commit()
+            except SQLAlchemyError:
+                db.session.rollback()
+                self.fail("failed to commit transaction")
+
+            self.assertEqual(post.tag_names(), ["tag1", "tag2"])
+            self.assertEqual(post.category_names(), ["category_1"])
+
     def test_fail_to_create_post_with_empty_title(self):
         with self.app.app_context():
             self.assertRaises(
@@ -346,6 +425,71 @@ class PostCreationTests(PagetagsTest):
             )
 
 
+class PostBulkCreationTests(PagetagsTestWithMockData):
+    def test_create_many(self):
+        with self.app.app_context():
+            posts = Post.create_many(
+                db.session,
+                [
+                    {
+                        "title": "post5",
+                        "url": "http://www.example.com/page_1",
+                        "tags": ["tag1", "tag6"],
+                        "categories": ["category_1"]
+                    },
+                    {
+                        "title": "post6",
+                        "url": "http://www.example.com/page_3",
+                        "tags": ["tag6", "tag6"],
+                        "categories": ["category_3"]
+                    }
+                ]
+            )
+
+            try:
+                db.session.commit()
+            except SQLAlchemyError:
+                db.session.rollback()
+                self.fail("failed to commit transaction")
+
+            self.assertEqual(len(posts), 2)
+
+            self.assertEqual(posts[0].title, "post5")
+            self.assertEqual(posts[0].url.id, 1)
+            self.assertEqual(posts[0].tag_names(), ["tag1", "tag6"])
+            self.assertEqual(posts[0].categories[0].id, 1)
+
+            self.assertEqual(posts[1].title, "post6")
+            self.assertEqual(posts[1].url.url, "http://www.example.com/page_3")
+            self.assertEqual(posts[1].tag_names(), ["tag6"])
+            self.assertEqual(posts[1].category_names(), ["category_3"])
+
+            self.assertIs(posts[0].tags[1], posts[1].tags[0])
+            self.assertEqual(db.session.query(Tag).count(), 6)
+
+    def test_create_many_uses_a_fixed_number_of_queries_to_resolve_names(self):
+        def create_posts(count):
+            with self.app.app_context():
+                posts = [
+                    {
+                        "title": "post",
+                        "url": "http://www.example.com/page_{}".format(i),
+                        "tags": ["tag1", "tag{}".format(i + 100)],
+                        "categories": ["category_{}".format(i)]
+                    }
+                    for i in range(count)
+                ]
+
+                with QueryCounter(db.get_engine(self.app)) as counter:
+                    Post.create_many(db.session, posts)
+
+                db.session.rollback()
+
+                return counter.select_count
+
+        self.assertEqual(create_posts(1), create_posts(20))
+
+
 class UrlPostRetrievalTests(PagetagsTestWithMockData):
     def test_retrieve_url_posts(self):
         with self.app.app_context():
@@ -384,8 +528,8 @@ class PostPaginationTests(PagetagsTestWithMockData):
         with self.app.app_context():
             paginator = Post.get_latest_by_page(page=1, per_page=2)
 
+            self.assertIsInstance(paginator, OffsetPage)
             self.assertEqual(len(paginator.items), 2)
-            self.assertEqual(paginator.pages, 2)
             self.assertEqual(paginator.page, 1)
 
             self.assertEqual(paginator.items[0].title, "post4")
@@ -395,19 +539,586 @@ class PostPaginationTests(PagetagsTestWithMockData):
             self.assertTrue(paginator.has_next)
             self.assertEqual(paginator.next_num, 2)
 
+    def test_get_last_page(self):
+        with self.app.app_context():
+            paginator = Post.get_latest_by_page(page=2, per_page=2)
+
+            self.assertEqual(
+                [post.title for post in paginator.items], ["post2", "post1"])
+            self.assertTrue(paginator.has_prev)
+            self.assertEqual(paginator.prev_num, 1)
+            self.assertFalse(paginator.has_next)
+            self.assertIsNone(paginator.next_num)
+
+    def test_fail_to_get_page_that_does_not_exist(self):
+        with self.app.test_request_context():
+            self.assertRaises(
+                NotFound, Post.get_latest_by_page, page=3, per_page=2)
+
+    def test_posts_are_not_counted(self):
+        with self.app.app_context():
+            with QueryCounter(db.get_engine(self.app)) as counter:
+                Post.get_latest_by_page(page=1, per_page=2)
+
+            self.assertFalse(
+                any("count(" in statement.lower()
+                    for statement in counter.statements),
+                counter.statements
+            )
+
+
+class PostKeysetPaginationTests(PagetagsTestWithMockData):
+    def test_get_latest_after(self):
+        with self.app.app_context():
+            page = Post.get_latest_after(db.session, per_page=3)
+
+            self.assertIsInstance(page, KeysetPage)
+            self.assertEqual(
+                [post.title for post in page.items],
+                ["post4", "post3", "post2"]
+            )
+            self.assertTrue(page.has_next)
+            self.assertIsNotNone(page.next_cursor)
+
+            page = Post.get_latest_after(
+                db.session, Cursor.decode(page.next_cursor), per_page=3)
+
+            self.assertEqual([post.title for post in page.items], ["post1"])
+            self.assertFalse(page.has_next)
+            self.assertIsNone(page.next_cursor)
+
+    def test_posts_with_the_same_added_at_are_ordered_by_id(self):
+        with self.app.app_context():
+            for post in db.session.query(Post).all():
+                post.added_at = datetime(2016, 10, 5, 12, 30, 0)
+
+            db.session.commit()
+
+            page = Post.get_latest_after(db.session, per_page=2)
+
+            self.assertEqual([post.id for post in page.items], [4, 3])
+
+            page = Post.get_latest_after(
+                db.session, Cursor.from_post(page.items[-1]), per_page=2)
+
+            self.assertEqual([post.id for post in page.items], [2, 1])
+            self.assertFalse(page.has_next)
+
+    def test_get_tag_posts_after(self):
+        with self.app.app_context():
+            tag = Tag.get_by_name(db.session, "tag2")
+
+            page = tag.get_posts_after(db.session, per_page=1)
+
+            self.assertEqual([post.title for post in page.items], ["post4"])
+            self.assertTrue(page.has_next)
+
+            page = tag.get_posts_after(
+                db.session, Cursor.decode(page.next_cursor), per_page=1)
+
+            self.assertEqual([post.title for post in page.items], ["post1"])
+            self.assertFalse(page.has_next)
+
+    def test_get_url_posts_after(self):
+        with self.app.app_context():
+            url = Url.get_by_url(db.session, "http://www.example.com/page_1")
+
+            page = url.get_posts_after(
+                db.session, Cursor.from_post(Post.get_by_id(db.session, 3)))
+
+            self.assertEqual(
+                [post.title for post in page.items], ["post2", "post1"])
+            self.assertFalse(page.has_next)
+
+    def test_get_category_posts_after(self):
+        with self.app.app_context():
+            category = Category.get_by_name(db.session, "category_1")
+
+            page = category.get_posts_after(db.session)
+
+            self.assertEqual([post.title for post in page.items], ["post4"])
+            self.assertFalse(page.has_next)
+
+
+class PostListingQueryCountTests(PagetagsTestsWithUser):
+    def setUp(self):
+        super(PostListingQueryCountTests, self).setUp()
+
+        with self.app.app_context():
+            for i in range(12):
+                post = Post.create(
+                    db.session,
+                    "post{}".format(i),
+                    "http://www.example.com/page_1",
+                    ["tag", "tag{}".format(i)],
+                    ["category", "category_{}".format(i)]
+                )
+                post.added_at = datetime(2016, 10, 5, 12, i, 0)
+
+            try:
+                db.session.commit()
+            except SQLAlchemyError:
+                db.session.rollback()
+                self.fail("failed to load mock data")
+
+    def count_listing_queries(self, get_posts):
+        with self.app.app_context():
+            db.session.expire_all()
+
+            with QueryCounter(db.get_engine(self.app)) as counter:
+                posts = get_posts().items
+
+                for post in posts:
+                    post.url.url
+                    post.tag_names()
+                    post.category_names()
+
+            return counter.count
+
+    def assertQueryCountIsConstant(self, get_posts_by_page):
+        query_counts = [
+            self.count_listing_queries(
+                lambda: get_posts_by_page(per_page))
+            for per_page in [1, 5, 10]
+        ]
+
+        self.assertEqual(len(set(query_counts)), 1, query_counts)
+
+    def test_get_latest_by_page(self):
+        self.assertQueryCountIsConstant(
+            lambda per_page: Post.get_latest_by_page(1, per_page))
+
+    def test_get_latest_after(self):
+        self.assertQueryCountIsConstant(
+            lambda per_page: Post.get_latest_after(db.session, None, per_page))
+
+    def test_get_tag_posts_by_page(self):
+        self.assertQueryCountIsConstant(
+            lambda per_page: Tag.get_by_name(db.session, "tag")
+                                .get_posts_by_page(1, per_page))
+
+    def test_get_category_posts_by_page(self):
+        self.assertQueryCountIsConstant(
+            lambda per_page: Category.get_by_name(db.session, "category")
+                                     .get_posts_by_page(1, per_page))
+
+    def test_get_url_posts_by_page(self):
+        self.assertQueryCountIsConstant(
+            lambda per_page: Url.get_by_url(
+                db.session, "http://www.example.com/page_1"
+            ).get_posts_by_page(1, per_page))
+
+
+class PostCountTests(PagetagsTestWithMockData):
+    def assertPostCounts(self, model, expected_post_counts):
+        db.session.expire_all()
+
+        post_counts = {
+            obj.name: obj.post_count for obj in db.session.query(model).all()
+        }
+
+        self.assertDictEqual(post_counts, expected_post_counts)
+
+    def test_post_counts_are_updated_when_posts_are_created(self):
+        with self.app.app_context():
+            self.assertPostCounts(
+                Tag,
+                {"tag1": 4, "tag2": 2, "tag3": 1, "tag4": 1, "tag5": 1}
+            )
+            self.assertPostCounts(
+                Category, {"category_1": 1, "category_2": 0})
+
+            Post.create(
+                db.session, "post5", "http://www.example.com/page_3",
+                ["tag1", "tag6"], ["category_2", "category_3"]
+            )
+            Post.create_many(
+                db.session,
+                [
+                    {
+                        "title": "post6",
+                        "url": "http://www.example.com/page_3",
+                        "tags": ["tag1", "tag6"],
+                        "categories": ["category_2"]
+                    }
+                ]
+            )
+
+            db.session.commit()
+
+            self.assertPostCounts(
+                Tag,
+                {
+                    "tag1": 6, "tag2": 2, "tag3": 1, "tag4": 1, "tag5": 1,
+                    "tag6": 2
+                }
+            )
+            self.assertPostCounts(
+                Category,
+                {"category_1": 1, "category_2": 2, "category_3": 1}
+            )
+
+    def test_post_counts_are_updated_when_posts_are_updated(self):
+        with self.app.app_context():
+            post = Post.get_by_id(db.session, 4)
+
+            post.update(
+                db.session, post.title, post.url.url, ["tag2", "tag6"])
+            post.categories = [db.session.query(Category).get(2)]
+
+            db.session.commit()
+
+            self.assertPostCounts(
+                Tag,
+                {
+                    "tag1": 3, "tag2": 2, "tag3": 1, "tag4": 1, "tag5": 0,
+                    "tag6": 1
+                }
+            )
+            self.assertPostCounts(
+                Category, {"category_1": 0, "category_2": 1})
+
+    def test_post_counts_are_updated_when_posts_are_deleted(self):
+        with self.app.app_context():
+            db.session.delete(Post.get_by_id(db.session, 4))
+
+            db.session.commit()
+
+            self.assertPostCounts(
+                Tag,
+                {"tag1": 3, "tag2": 1, "tag3": 1, "tag4": 1, "tag5": 0}
+            )
+            self.assertPostCounts(
+                Category, {"category_1": 0, "category_2": 0})
+
+    def test_post_counts_are_updated_when_post_categories_are_created(self):
+        with self.app.app_context():
+            PostCategory.create(
+                db.session,
+                post=Post.get_by_id(db.session, 1),
+                category=db.session.query(Category).get(2)
+            )
+
+            db.session.commit()
+
+            self.assertPostCounts(
+                Category, {"category_1": 1, "category_2": 1})
+
+    def test_recompute_post_counts(self):
+        with self.app.app_context():
+            db.session.query(Tag).update({Tag.post_count: 100})
+            db.session.query(Category).update({Category.post_count: 100})
+
+            Tag.recompute_post_counts(db.session)
+            Category.recompute_post_counts(db.session)
+
+            db.session.commit()
+
+            self.assertPostCounts(
+                Tag,
+                {"tag1": 4, "tag2": 2, "tag3": 1, "tag4": 1, "tag5": 1}
+            )
+            self.assertPostCounts(
+                Category, {"category_1": 1, "category_2": 0})
+
+
+class PostsByTagsTests(PagetagsTestWithMockData):
+    def test_get_posts_that_have_all_the_tags(self):
+        with self.app.app_context():
+            page = Post.get_by_tags_after(db.session, ["tag1", "tag2"])
+
+            self.assertEqual([post.id for post in page.items], [4, 1])
+            self.assertFalse(page.has_next)
+
+    def test_get_posts_that_have_any_of_the_tags(self):
+        with self.app.app_context():
+            page = Post.get_by_tags_after(
+                db.session, ["tag3", "tag5"], match_all=False)
+
+            self.assertEqual([post.id for post in page.items], [4, 2])
+
+    def test_no_posts_have_a_tag_that_does_not_exist(self):
+        with self.app.app_context():
+            page = Post.get_by_tags_after(db.session, ["tag2", "tag999"])
+
+            self.assertEqual(page.items, [])
+
+            page = Post.get_by_tags_after(
+                db.session, ["tag2", "tag999"], match_all=False)
+
+            self.assertEqual([post.id for post in page.items], [4, 1])
+
+    def test_get_posts_by_tags_using_cursor(self):
+        with self.app.app_context():
+            page = Post.get_by_tags_after(
+                db.session, ["tag1", "tag1"], per_page=3)
+
+            self.assertEqual([post.id for post in page.items], [4, 3, 2])
+            self.assertTrue(page.has_next)
+
+            page = Post.get_by_tags_after(
+                db.session,
+                ["tag1"],
+                after=Cursor.decode(page.next_cursor),
+                per_page=3
+            )
+
+            self.assertEqual([post.id for post in page.items], [1])
+            self.assertFalse(page.has_next)
+
+
+class PostSearchTests(PagetagsTestWithMockData):
+    def test_search_by_title(self):
+        with self.app.app_context():
+            page = Post.search(db.session, "post2")
+
+            self.assertIsInstance(page, SearchPage)
+            self.assertEqual([post.id for post in page.items], [2])
+            self.assertFalse(page.has_next)
+            self.assertIsNone(page.next_cursor)
+
+    def test_search_by_url(self):
+        with self.app.app_context():
+            page = Post.search(db.session, "www.example.com/page_2")
+
+            self.assertEqual([post.id for post in page.items], [4])
+
+    def test_search_matches_all_the_words(self):
+        with self.app.app_context():
+            page = Post.search(db.session, "post1 page_1")
+
+            self.assertEqual([post.id for post in page.items], [1])
+
+            page = Post.search(db.session, "post1 page_2")
+
+            self.assertEqual(page.items, [])
+
+    def test_search_text_with_query_syntax_characters(self):
+        with self.app.app_context():
+            page = Post.search(db.session, 'post1 OR "post2* NEAR(')
+
+            self.assertEqual(page.items, [])
+
+    def test_search_using_cursor(self):
+        with self.app.app_context():
+            page = Post.search(db.session, "page_1", per_page=2)
+
+            self.assertEqual([post.id for post in page.items], [3, 2])
+            self.assertTrue(page.has_next)
+
+            page = Post.search(
+                db.session,
+                "page_1",
+                after=SearchCursor.decode(page.next_cursor),
+                per_page=2
+            )
+
+            self.assertEqual([post.id for post in page.items], [1])
+            self.assertFalse(page.has_next)
+
+    def test_search_created_post(self):
+        with self.app.app_context():
+            Post.create(
+                db.session,
+                "a new post",
+                "http://www.example.com/page_3",
+                ["tag1"],
+                []
+            )
+            db.session.commit()
+
+            page = Post.search(db.session, "new")
+
+            self.assertEqual([post.title for post in page.items],
+                             ["a new post"])
+
+    def test_search_updated_post(self):
+        with self.app.app_context():
+            post = Post.get_by_id(db.session, 1)
+            post.update(
+                db.session,
+                "updated title",
+                "http://www.example.com/page_3",
+                ["tag1"]
+            )
+            db.session.commit()
+
+            page = Post.search(db.session, "post1")
+            self.assertEqual(page.items, [])
+
+            page = Post.search(db.session, "updated page_3")
+            self.assertEqual([post.id for post in page.items], [1])
+
+    def test_search_does_not_return_deleted_posts(self):
+        with self.app.app_context():
+            db.session.delete(Post.get_by_id(db.session, 4))
+            db.session.commit()
+
+            page = Post.search(db.session, "post4")
+
+            self.assertEqual(page.items, [])
+
+
+class PostLikeSearchTests(PagetagsTestWithMockData):
+    def search(self, text, **kwargs):
+        # the databases that don't have a full-text search index are
+        # searched using LIKE
+        dialect = db.session.get_bind().dialect
+
+        with patch.object(dialect, "name", "mysql"):
+            return Post.search(db.session, text, **kwargs)
+
+    def test_search_by_title_and_url(self):
+        with self.app.app_context():
+            page = self.search("POST1 page_1")
+
+            self.assertEqual([post.id for post in page.items], [1])
+            self.assertEqual(page.scores, [0.0])
+
+            page = self.search("www.example.com/page_2")
+
+            self.assertEqual([post.id for post in page.items], [4])
+
+    def test_search_text_with_like_wildcards(self):
+        with self.app.app_context():
+            page = self.search("post%")
+
+            self.assertEqual(page.items, [])
+
+            page = self.search("page_")
+
+            self.assertEqual([post.id for post in page.items], [4, 3, 2, 1])
+
+    def test_search_using_cursor(self):
+        with self.app.app_context():
+            page = self.search("page_1", per_page=2)
+
+            self.assertEqual([post.id for post in page.items], [3, 2])
+            self.assertTrue(page.has_next)
+
+            page = self.search(
+                "page_1",
+                after=SearchCursor.decode(page.next_cursor),
+                per_page=2
+            )
+
+            self.assertEqual([post.id for post in page.items], [1])
+            self.assertFalse(page.has_next)
+
+
+@skipUnless(POSTGRESQL_DATABASE_URI, "PAGETAGS_TEST_POSTGRESQL_URI isn't set")
+class PostgreSQLPostSearchTests(PagetagsTest):
+    database_uri = POSTGRESQL_DATABASE_URI
+
+    def test_search_using_cursor_with_tied_scores(self):
+        with self.app.app_context():
+            for i in range(7):
+                Post.create(
+                    db.session,
+                    "python post",
+                    "http://www.example.com/page_%d" % i,
+                    ["tag1"],
+                    []
+                )
+            Post.create(
+                db.session,
+                "python python post",
+                "http://www.example.com/page_python",
+                ["tag1"],
+                []
+            )
+            db.session.commit()
+
+            post_ids = []
+            after = None
+
+            while True:
+                page = Post.search(
+                    db.session, "python", after=after, per_page=3)
+                post_ids.extend(post.id for post in page.items)
+
+                if not page.has_next:
+                    break
+
+                after = SearchCursor.decode(page.next_cursor)
+
+            self.assertEqual(len(post_ids), 8)
+            self.assertEqual(len(set(post_ids)), 8)
+            self.assertEqual(post_ids[1:], sorted(post_ids[1:], reverse=True))
+
+
+class PostExportTests(PagetagsTestWithMockData):
+    def test_export_posts(self):
+        with self.app.app_context():
+            posts = list(Post.export(db.session))
+
+            self.assertEqual([post["id"] for post in posts], [1, 2, 3, 4])
+            self.assertEqual(
+                posts[3],
+                {
+                    "id": 4,
+                    "title": "post4",
+                    "url": "http://www.example.com/page_2",
+                    "tags": ["tag1", "tag2", "tag5"],
+                    "categories": ["category_1"],
+                    "added_at": datetime(2016, 10, 5, 12, 33, 0)
+                }
+            )
+            self.assertEqual(posts[0]["categories"], [])
+
+    def test_export_posts_in_batches(self):
+        with self.app.app_context():
+            with QueryCounter(db.get_engine(self.app)) as counter:
+                posts = list(Post.export(db.session, batch_size=3))
+
+            self.assertEqual([post["id"] for post in posts], [1, 2, 3, 4])
+            self.assertEqual(posts[1]["tags"], ["tag1", "tag3"])
+            self.assertEqual(posts[3]["tags"], ["tag1", "tag2", "tag5"])
+
+            # the posts query and the tag and category queries of every batch
+            self.assertEqual(counter.select_count, 5)
+
+    def test_export_posts_with_tag(self):
+        with self.app.app_context():
+            posts = Post.export(db.session, tag="tag2")
+
+            self.assertEqual([post["id"] for post in posts], [1, 4])
+
+    def test_export_posts_with_category(self):
+        with self.app.app_context():
+            posts = Post.export(db.session, category="category_1")
+
+            self.assertEqual([post["id"] for post in posts], [4])
+
+    def test_export_posts_added_in_time_range(self):
+        with self.app.app_context():
+            posts = Post.export(
+                db.session,
+                added_after=datetime(2016, 10, 5, 12, 31, 0),
+                added_before=datetime(2016, 10, 5, 12, 33, 0)
+            )
+
+            self.assertEqual([post["id"] for post in posts], [2, 3])
+
+    def test_export_without_posts(self):
+        with self.app.app_context():
+            posts = Post.export(db.session, tag="unknown")
+
+            self.assertEqual(list(posts), [])
+
 
 class TagTests(PagetagsTestWithMockData):
     def test_post_count(self):
         with self.app.app_context():
             tag = Tag.get_by_name(db.session, "tag2")
 
-            self.assertEqual(tag.post_count(db.session), 2)
+            self.assertEqual(tag.count_posts(db.session), 2)
 
     def test_get_tags_by_page(self):
         with self.app.app_context():
             paginator = Tag.get_tags_by_page(page=1, per_page=2)
 
-            self.assertIsInstance(paginator, Pagination)
+            self.assertIsInstance(paginator, OffsetPage)
             self.assertEqual(paginator.page, 1)
             self.assertEqual(paginator.per_page, 2)
 
@@ -521,6 +1232,29 @@ class CategoryTests(PagetagsTest):
             self.assertRaises(IntegrityError, db.session.commit)
 
 
+class CategoryBatchCreationTests(PagetagsTest):
+    def test_get_or_create_many(self):
+        with self.app.app_context():
+            Category.create(db.session, "category_1")
+
+            db.session.commit()
+
+            categories = Category.get_or_create_many(
+                db.session, ["category_1", "category_2"])
+
+            self.assertEqual(categories["category_1"].id, 1)
+            self.assertEqual(categories["category_2"].name, "category_2")
+            self.assertIsNotNone(categories["category_2"].added_at)
+
+            try:
+                db.session.commit()
+            except SQLAlchemyError:
+                db.session.rollback()
+                self.fail("failed to commit transaction")
+
+            self.assertEqual(db.session.query(Category).count(), 2)
+
+
 class CategoryRetrievalTests(PagetagsTest):
     def setUp(self):
         super(CategoryRetrievalTests, self).setUp()
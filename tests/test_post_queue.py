@@ -0,0 +1,224 @@
+from unittest import main
+import json
+
+from mock import patch
+from sqlalchemy.exc import SQLAlchemyError
+
+from pagetags import db
+from pagetags.models import Post, QueuedPost
+from pagetags.post_queue import post_queue, POST_CREATION_ERROR
+from common import PagetagsTestWithMockData
+
+
+class PostQueueTestCase(PagetagsTestWithMockData):
+    def setUp(self):
+        super(PostQueueTestCase, self).setUp()
+
+        self.app.config["POST_QUEUE_BACKEND"] = "database"
+        post_queue.init_app(self.app)
+
+        self.token = self.authenticate(
+            self.test_user_username, self.test_user_password)
+
+    def add_post(self, post):
+        return self.client.post(
+            "/api/v1/posts",
+            headers={"Authorization": "JWT %s" % self.token,
+                     "Content-Type": "application/json"},
+            data=json.dumps(post)
+        )
+
+    def get_receipt(self, receipt):
+        return self.client.get(
+            "/api/v1/posts/receipts/%s" % receipt,
+            headers={"Authorization": "JWT %s" % self.token}
+        )
+
+
+class PostQueueApiTests(PostQueueTestCase):
+    def test_queue_post(self):
+        response = self.add_post({
+            "title": "queued post",
+            "url": "http://www.example.com/page_3",
+            "tags": ["tag1", "tag100"],
+            "categories": ["category_1"]
+        })
+
+        self.assertEqual(response.status_code, 202)
+
+        data = json.loads(response.data)
+        self.assertEqual(data["status"], "queued")
+
+        with self.app.app_context():
+            self.assertEqual(db.session.query(Post).count(), 4)
+
+            queued_post = QueuedPost.get_by_receipt(
+                db.session, data["receipt"])
+
+            self.assertEqual(
+                queued_post.to_post(),
+                {
+                    "title": "queued post",
+                    "url": "http://www.example.com/page_3",
+                    "tags": ["tag1", "tag100"],
+                    "categories": ["category_1"]
+                }
+            )
+
+    def test_get_receipt_of_created_post(self):
+        response = self.add_post({
+            "title": "queued post",
+            "url": "http://www.example.com/page_3",
+            "tags": ["tag1"],
+            "categories": []
+        })
+
+        receipt = json.loads(response.data)["receipt"]
+
+        response = self.get_receipt(receipt)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            json.loads(response.data),
+            {
+                "receipt": receipt,
+                "status": "queued",
+                "post_id": None,
+                "error": None
+            }
+        )
+
+        with self.app.app_context():
+            self.assertEqual(post_queue.process(db.session), 1)
+
+        response = self.get_receipt(receipt)
+
+        self.assertEqual(
+            json.loads(response.data),
+            {
+                "receipt": receipt,
+                "status": "created",
+                "post_id": 5,
+                "error": None
+            }
+        )
+
+    def test_queue_invalid_post(self):
+        response = self.add_post({
+            "title": "queued post",
+            "url": "http://www.example.com/page_3",
+            "tags": ["tag1", ""],
+            "categories": []
+        })
+
+        self.assertEqual(response.status_code, 400)
+
+        with self.app.app_context():
+            self.assertEqual(db.session.query(QueuedPost).count(), 0)
+
+    def test_get_receipt_that_does_not_exist(self):
+        response = self.get_receipt("unknown")
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(json.loads(response.data)["error_code"], 3002)
+
+    def test_create_post_when_the_queue_is_disabled(self):
+        self.app.config["POST_QUEUE_BACKEND"] = None
+        post_queue.init_app(self.app)
+
+        response = self.add_post({
+            "title": "new post",
+            "url": "http://www.example.com/page_3",
+            "tags": ["tag1"],
+            "categories": []
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data), {"id": 5})
+
+
+class PostQueueWorkerTests(PostQueueTestCase):
+    def setUp(self):
+        super(PostQueueWorkerTests, self).setUp()
+
+        with self.app.app_context():
+            for i in range(3):
+                post_queue.enqueue(
+                    db.session,
+                    {
+                        "title": "queued post %d" % i,
+                        "url": "http://www.example.com/page_3",
+                        "tags": ["tag1", "tag%d" % (100 + i)],
+                        "categories": ["category_2"]
+                    }
+                )
+
+            db.session.commit()
+
+    def test_process_batch(self):
+        with self.app.app_context():
+            self.assertEqual(post_queue.process(db.session, batch_size=2), 2)
+
+            posts = db.session.query(Post)\
+                              .filter(Post.id > 4)\
+                              .order_by(Post.id)\
+                              .all()
+
+            self.assertEqual(
+                [post.title for post in posts],
+                ["queued post 0", "queued post 1"]
+            )
+            self.assertEqual(posts[1].tag_names(), ["tag1", "tag101"])
+            self.assertEqual(posts[1].category_names(), ["category_2"])
+
+            queued_posts = db.session.query(QueuedPost)\
+                                     .order_by(QueuedPost.id)\
+                                     .all()
+
+            self.assertEqual(
+                [queued_post.status for queued_post in queued_posts],
+                ["created", "created", "queued"]
+            )
+            self.assertEqual(queued_posts[0].post_id, posts[0].id)
+            self.assertEqual(queued_posts[0].added_at, posts[0].added_at)
+
+    def test_run_worker_until_the_queue_is_empty(self):
+        with self.app.app_context():
+            post_queue.run_worker(db.session, batch_size=2, once=True)
+
+            self.assertEqual(db.session.query(Post).count(), 7)
+            self.assertEqual(
+                db.session.query(QueuedPost)
+                          .filter_by(status=QueuedPost.QUEUED)
+                          .count(),
+                0
+            )
+
+    def test_mark_failed_posts(self):
+        create_many = Post.create_many
+
+        def fail_on_post_1(session, posts):
+            if any(post["title"] == "queued post 1" for post in posts):
+                raise SQLAlchemyError(
+                    "INSERT INTO posts (title) VALUES ('queued post 1')")
+
+            return create_many(session, posts)
+
+        with self.app.app_context():
+            with patch.object(Post, "create_many", side_effect=fail_on_post_1):
+                self.assertEqual(post_queue.process(db.session), 3)
+
+            queued_posts = db.session.query(QueuedPost)\
+                                     .order_by(QueuedPost.id)\
+                                     .all()
+
+            self.assertEqual(
+                [queued_post.status for queued_post in queued_posts],
+                ["created", "failed", "created"]
+            )
+            self.assertEqual(queued_posts[1].error, POST_CREATION_ERROR)
+            self.assertEqual(db.session.query(Post).count(), 6)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+from unittest import main
+
+from mock import patch
+from sqlalchemy.orm import mapperlib
+
+from pagetags import db, response_cache, page_cache
+from pagetags.preload import warm_up, reinitialize_worker
+from common import PagetagsTest
+
+
+class PreloadTests(PagetagsTest):
+    def test_compile_templates(self):
+        warm_up(self.app)
+
+        compiled_templates = set(
+            name for _, name in self.app.jinja_env.cache.keys())
+
+        self.assertIn("index.html", compiled_templates)
+        self.assertIn("post_row.html", compiled_templates)
+
+    def test_configure_mappers(self):
+        warm_up(self.app)
+
+        self.assertFalse(mapperlib.Mapper._new_mappers)
+
+    def test_dispose_database_engine(self):
+        with patch("pagetags.preload.db.get_engine") as get_engine:
+            warm_up(self.app)
+
+        get_engine.assert_called_once_with(self.app)
+        get_engine.return_value.dispose.assert_called_once_with()
+
+    def test_reinitialize_worker(self):
+        with patch("pagetags.preload.db.get_engine") as get_engine:
+            reinitialize_worker(self.app)
+
+        get_engine.return_value.dispose.assert_called_once_with()
+
+    def test_disconnect_cache_clients(self):
+        with patch.object(response_cache, "client") as response_client, \
+                patch.object(page_cache, "client") as page_client:
+            reinitialize_worker(self.app)
+
+        response_client.disconnect_all.assert_called_once_with()
+        page_client.disconnect_all.assert_called_once_with()
+
+    def test_application_works_after_warm_up(self):
+        warm_up(self.app)
+
+        # the in memory test database is deleted when the engine is disposed
+        with self.app.app_context():
+            db.create_all()
+
+        response = self.client.get("/")
+
+        self.assertEqual(response.status_code, 200)
+
+
+if __name__ == "__main__":
+    main()
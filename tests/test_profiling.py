@@ -0,0 +1,151 @@
+from unittest import main
+from tempfile import mkdtemp
+from StringIO import StringIO
+import os
+import shutil
+
+from mock import patch
+
+from pagetags.profiling import (
+    request_profiler, list_profiles, load_stats, profile_names
+)
+from common import PagetagsTestWithMockData
+
+
+class RequestProfilerTests(PagetagsTestWithMockData):
+    def setUp(self):
+        super(RequestProfilerTests, self).setUp()
+
+        self.directory = mkdtemp()
+
+        self.app.config["PROFILING_ENABLED"] = True
+        self.app.config["PROFILING_DIRECTORY"] = self.directory
+        self.app.config["PROFILING_TOKEN"] = "profiling-token"
+        request_profiler.init_app(self.app)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+        super(RequestProfilerTests, self).tearDown()
+
+    def test_profile_request_with_header(self):
+        response = self.client.get(
+            "/tag/tag1", headers={"X-Pagetags-Profile": "profiling-token"})
+
+        self.assertEqual(response.status_code, 200)
+
+        profiles = list_profiles(self.directory)
+
+        self.assertEqual(len(profiles), 1)
+
+        profile = profiles[0]
+        self.assertEqual(profile["endpoint"], "views.tags.tag")
+        self.assertEqual(profile["method"], "GET")
+        self.assertEqual(profile["path"], "/tag/tag1?")
+        self.assertEqual(profile["status"], 200)
+        self.assertEqual(profile["trigger"], "header")
+        self.assertGreater(profile["duration_ms"], 0)
+
+        output = StringIO()
+        stats = load_stats(self.directory, [profile["name"]], stream=output)
+        stats.sort_stats("cumulative").print_stats(10)
+
+        self.assertIn("function calls", output.getvalue())
+
+    def test_do_not_profile_request_with_invalid_token(self):
+        self.client.get("/tag/tag1", headers={"X-Pagetags-Profile": "invalid"})
+
+        self.assertEqual(list_profiles(self.directory), [])
+
+    def test_do_not_profile_request_with_non_ascii_token(self):
+        response = self.client.get(
+            "/login", headers={"X-Pagetags-Profile": u"\u00c3\u00a9"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list_profiles(self.directory), [])
+
+    def test_do_not_profile_requests_by_default(self):
+        self.client.get("/tag/tag1")
+
+        self.assertEqual(list_profiles(self.directory), [])
+
+    def test_sample_requests(self):
+        request_profiler.sample_rate = 0.5
+
+        with patch("pagetags.profiling.random.random",
+                   side_effect=[0.2, 0.7]):
+            self.client.get("/tag/tag1")
+            self.client.get("/tag/tag2")
+
+        profiles = list_profiles(self.directory)
+
+        self.assertEqual(len(profiles), 1)
+        self.assertEqual(profiles[0]["path"], "/tag/tag1?")
+        self.assertEqual(profiles[0]["trigger"], "sample")
+
+    def test_delete_old_profiles(self):
+        request_profiler.max_profiles = 2
+
+        for tag in ["tag1", "tag2", "tag3"]:
+            self.client.get(
+                "/tag/%s" % tag,
+                headers={"X-Pagetags-Profile": "profiling-token"}
+            )
+
+        profiles = list_profiles(self.directory)
+
+        self.assertEqual(
+            [profile["path"] for profile in profiles],
+            ["/tag/tag2?", "/tag/tag3?"]
+        )
+        self.assertEqual(len(os.listdir(self.directory)), 4)
+
+    def test_delete_old_profiles_without_reading_them(self):
+        request_profiler.max_profiles = 1
+        headers = {"X-Pagetags-Profile": "profiling-token"}
+
+        self.client.get("/tag/tag1", headers=headers)
+
+        with patch("pagetags.profiling.json.load") as load:
+            response = self.client.get("/tag/tag2", headers=headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(load.called)
+        self.assertEqual(
+            [profile["path"] for profile in list_profiles(self.directory)],
+            ["/tag/tag2?"]
+        )
+
+    def test_ignore_profiles_deleted_by_other_processes(self):
+        headers = {"X-Pagetags-Profile": "profiling-token"}
+
+        self.client.get("/tag/tag1", headers=headers)
+
+        # another process deletes a profile after it has been listed
+        listed_names = ["deleted-profile"] + profile_names(self.directory)
+
+        with patch("pagetags.profiling.profile_names",
+                   return_value=listed_names):
+            profiles = list_profiles(self.directory)
+
+            request_profiler.max_profiles = 1
+            response = self.client.get("/tag/tag2", headers=headers)
+
+        self.assertEqual(
+            [profile["path"] for profile in profiles], ["/tag/tag1?"])
+        self.assertEqual(response.status_code, 200)
+
+    def test_list_profiles_of_endpoint(self):
+        headers = {"X-Pagetags-Profile": "profiling-token"}
+
+        self.client.get("/tag/tag1", headers=headers)
+        self.client.get("/categories", headers=headers)
+
+        profiles = list_profiles(self.directory, "views.categories.categories")
+
+        self.assertEqual(len(profiles), 1)
+        self.assertEqual(profiles[0]["path"], "/categories?")
+
+
+if __name__ == "__main__":
+    main()
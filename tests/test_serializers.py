@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+from unittest import main, TestCase
+from datetime import datetime
+import json
+
+from flask_restful import fields, marshal
+from mock import patch
+
+from pagetags.api import models
+from pagetags.api.serializers import (
+    compile_serializer, serialize, EncodedJSON
+)
+from common import PagetagsTestWithMockData
+
+
+class PostObject(object):
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+def post(**kwargs):
+    values = {
+        "id": 1,
+        "title": u"post α \"quoted\"\n",
+        "url": "http://www.example.com/page_1",
+        "tags": [u"tag1", u"τag2"],
+        "categories": set(["category1"]),
+        "added_at": datetime(2016, 10, 5, 12, 30, 45, 123)
+    }
+    values.update(kwargs)
+
+    return values
+
+
+class CompiledSerializerTests(TestCase):
+    def assertSerializedLikeMarshal(self, data, resource_fields):
+        self.assertEqual(
+            compile_serializer(resource_fields)(data),
+            json.dumps(marshal(data, resource_fields))
+        )
+
+    def test_post(self):
+        self.assertSerializedLikeMarshal(post(), models.Post.resource_fields)
+
+    def test_post_object(self):
+        self.assertSerializedLikeMarshal(
+            PostObject(**post()), models.Post.resource_fields)
+
+    def test_missing_values(self):
+        self.assertSerializedLikeMarshal(
+            post(title=None, tags=None, added_at=None),
+            models.Post.resource_fields
+        )
+        self.assertSerializedLikeMarshal({}, models.Post.resource_fields)
+
+    def test_nested_posts(self):
+        data = {
+            "tag_id": 1,
+            "posts": [post(), PostObject(**post(id=2, tags=[]))],
+            "has_more": True,
+            "page": 1,
+            "per_page": 10,
+            "next_cursor": None
+        }
+
+        self.assertSerializedLikeMarshal(
+            data, models.TagPosts.resource_fields)
+
+    def test_unsupported_list_items(self):
+        self.assertSerializedLikeMarshal(
+            {"posts": [None, post()]}, models.Posts.resource_fields)
+        self.assertSerializedLikeMarshal(
+            {"tags": ("tag1", "tag2"), "mode": "all", "posts": [None]},
+            models.TagsPosts.resource_fields
+        )
+
+    def test_default_values(self):
+        self.assertSerializedLikeMarshal(
+            {"posts": [{"error": "invalid post", "error_code": 1001}]},
+            models.BulkCreatedPosts.resource_fields
+        )
+        self.assertSerializedLikeMarshal(
+            {"receipt": "abc", "status": "pending"},
+            models.PostReceipt.resource_fields
+        )
+
+    def test_raw_fields(self):
+        self.assertSerializedLikeMarshal(
+            {"tags": ["tag1"], "post_counts": {"tag1": 3, u"τ": [1]}},
+            models.Tags.resource_fields
+        )
+
+    def test_list_of_objects(self):
+        self.assertSerializedLikeMarshal(
+            [post(), post(id=2)], models.Post.resource_fields)
+
+    def test_fields_without_compiled_encoders(self):
+        resource_fields = {
+            "id": fields.Integer(attribute="post_id"),
+            "score": fields.Float,
+            "author": fields.String(attribute="author.name"),
+            "post": fields.Nested(models.CreatedPost.resource_fields)
+        }
+
+        self.assertSerializedLikeMarshal(
+            {
+                "post_id": 1,
+                "score": 1.5,
+                "author": {"name": "user1"},
+                "post": {"id": 2}
+            },
+            resource_fields
+        )
+
+    def test_serializers_are_cached(self):
+        self.assertIs(
+            compile_serializer(models.Post.resource_fields),
+            compile_serializer(models.Post.resource_fields)
+        )
+
+
+class SerializerResponseTests(PagetagsTestWithMockData):
+    def get_tag_posts(self):
+        token = self.authenticate(
+            self.test_user_username, self.test_user_password)
+
+        return self.client.get(
+            "/api/v1/tag/tag1", headers={"Authorization": "JWT %s" % token})
+
+    def test_compiled_serializer_response(self):
+        self.app.debug = False
+
+        with patch("pagetags.api.serializers._compiled_serializers_enabled",
+                   return_value=False):
+            marshalled_response = self.get_tag_posts()
+
+        serialized_response = self.get_tag_posts()
+
+        self.assertEqual(serialized_response.status_code, 200)
+        self.assertEqual(
+            serialized_response.content_type, "application/json")
+        self.assertEqual(serialized_response.data, marshalled_response.data)
+        self.assertTrue(json.loads(serialized_response.data)["posts"])
+
+    def test_serialize_in_debug_mode(self):
+        with self.app.test_request_context():
+            self.app.debug = True
+            data = serialize({"id": 1}, models.CreatedPost.resource_fields)
+            self.assertEqual(data, {"id": 1})
+
+            self.app.debug = False
+            data = serialize({"id": 1}, models.CreatedPost.resource_fields)
+            self.assertIsInstance(data, EncodedJSON)
+            self.assertEqual(data.text, '{"id": 1}')
+
+    def test_restful_json_setting(self):
+        self.app.debug = False
+        self.app.config["RESTFUL_JSON"] = {"sort_keys": True}
+
+        with self.app.test_request_context():
+            data = serialize({"id": 1}, models.CreatedPost.resource_fields)
+
+        self.assertEqual(data, {"id": 1})
+
+
+if __name__ == "__main__":
+    main()
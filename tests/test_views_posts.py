@@ -1,6 +1,9 @@
 from unittest import main
 
-from common import PagetagsTestWithMockData
+from pagetags import db, page_cache, fragment_cache
+from pagetags.models import Post, Tag
+
+from common import PagetagsTestWithMockData, QueryCounter
 
 
 class FrontPageViewtests(PagetagsTestWithMockData):
@@ -79,5 +82,136 @@ class FrontPageViewtests(PagetagsTestWithMockData):
         self.logout()
 
 
+class FrontPageCacheTests(PagetagsTestWithMockData):
+    def setUp(self):
+        super(FrontPageCacheTests, self).setUp()
+
+        self.app.config["RESPONSE_CACHE_BACKEND"] = "local"
+        page_cache.init_app(self.app)
+
+    def create_post(self, title):
+        with self.app.app_context():
+            Post.create(
+                db.session, title, "http://www.example.com/page_5",
+                ["tag1"], []
+            )
+            db.session.commit()
+
+    def test_page_is_cached_for_anonymous_users(self):
+        response = self.client.get("/")
+
+        with self.app.app_context():
+            engine = db.get_engine(self.app)
+
+        with QueryCounter(engine) as counter:
+            cached_response = self.client.get("/")
+
+        self.assertEqual(cached_response.status_code, 200)
+        self.assertEqual(cached_response.data, response.data)
+        self.assertEqual(cached_response.mimetype, "text/html")
+        # only the change time of the posts is retrieved
+        self.assertEqual(counter.count, 1)
+        self.assertEqual(page_cache.hits, 1)
+
+    def test_page_is_not_cached_for_logged_in_users(self):
+        self.login()
+
+        self.client.get("/")
+        self.client.get("/")
+
+        self.assertEqual(page_cache.hits, 0)
+        self.assertEqual(page_cache.misses, 0)
+
+    def test_page_is_invalidated_when_posts_are_created(self):
+        self.client.get("/")
+
+        self.create_post("post5")
+
+        response = self.client.get("/")
+
+        self.assertIn("post5", response.data)
+        self.assertEqual(page_cache.hits, 0)
+
+    def test_serve_stale_page_while_it_is_rendered(self):
+        self.client.get("/")
+
+        self.create_post("post5")
+
+        # simulate another request that is rendering the page
+        with self.app.test_request_context("/"):
+            key = page_cache._key("page:index", "/?")
+        page_cache.client.add(key + ":lock", 1)
+
+        response = self.client.get("/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("post5", response.data)
+        self.assertEqual(page_cache.stale_hits, 1)
+
+        page_cache.client.delete(key + ":lock")
+
+        response = self.client.get("/")
+
+        self.assertIn("post5", response.data)
+
+    def test_render_page_if_another_request_fails_to_render_it(self):
+        page_cache.lock_timeout = 0.1
+
+        with self.app.test_request_context("/"):
+            key = page_cache._key("page:index", "/?")
+        page_cache.client.add(key + ":lock", 1)
+
+        response = self.client.get("/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("post4", response.data)
+
+
+class PostFragmentCacheTests(PagetagsTestWithMockData):
+    def setUp(self):
+        super(PostFragmentCacheTests, self).setUp()
+
+        self.login()
+
+        # logging in renders the front page
+        self.assertEqual(fragment_cache.misses, 3)
+
+    def test_rendered_posts_are_cached(self):
+        response = self.client.get("/")
+
+        self.assertEqual(fragment_cache.hits, 3)
+        self.assertEqual(fragment_cache.misses, 3)
+        self.assertIn(
+            "<a href=\"http://www.example.com/page_2\">post4</a>",
+            response.data
+        )
+
+    def test_changed_posts_are_rendered_again(self):
+        with self.app.app_context():
+            post = Post.get_by_id(db.session, 4)
+            post.update(db.session, "new title", post.url.url, ["tag1"])
+            db.session.commit()
+
+        response = self.client.get("/")
+
+        self.assertIn("new title", response.data)
+        self.assertNotIn("tag5", response.data)
+        self.assertEqual(fragment_cache.hits, 2)
+        self.assertEqual(fragment_cache.misses, 4)
+
+    def test_posts_of_renamed_tags_are_rendered_again(self):
+        with self.app.app_context():
+            tag = Tag.get_by_name(db.session, "tag5")
+            tag.name = "renamed_tag"
+            db.session.commit()
+
+        response = self.client.get("/")
+
+        self.assertIn("renamed_tag", response.data)
+        self.assertNotIn("tag5", response.data)
+        self.assertEqual(fragment_cache.hits, 2)
+        self.assertEqual(fragment_cache.misses, 4)
+
+
 if __name__ == "__main__":
     main()
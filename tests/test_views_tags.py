@@ -1,5 +1,8 @@
 from unittest import main
 
+from pagetags import db
+from pagetags.models import Post
+
 from common import PagetagsTestWithMockData
 
 
@@ -45,5 +48,43 @@ class TagViewTests(PagetagsTestWithMockData):
         self.logout()
 
 
+class TagViewConditionalRequestTests(PagetagsTestWithMockData):
+    def test_tag_is_not_modified(self):
+        response = self.client.get("/tag/tag1")
+
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(
+            "/tag/tag1", headers={"If-None-Match": response.headers["ETag"]})
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_tag_is_modified(self):
+        response = self.client.get("/tag/tag1")
+
+        with self.app.app_context():
+            Post.create(
+                db.session, "post5", "http://www.example.com/page_5",
+                ["tag1"], []
+            )
+            db.session.commit()
+
+        response = self.client.get(
+            "/tag/tag1", headers={"If-None-Match": response.headers["ETag"]})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("post5", response.data)
+
+    def test_etag_depends_on_the_logged_in_user(self):
+        response = self.client.get("/tag/tag1")
+
+        self.login()
+
+        response = self.client.get(
+            "/tag/tag1", headers={"If-None-Match": response.headers["ETag"]})
+
+        self.assertEqual(response.status_code, 200)
+
+
 if __name__ == "__main__":
     main()
@@ -10,4 +10,17 @@ if settings_file is None:
     print("The environment variable PAGETAGS_SETTINGS is not set")
     exit(1)
 
-app = create_app(settings_file, environment_type)
+# the comma separated application components, for example "api". Defaults
+# to all the components
+components = os.getenv("PAGETAGS_COMPONENTS")
+if components is not None:
+    components = components.split(",")
+
+app = create_app(settings_file, environment_type, components=components)
+
+# warm up the application when it is loaded by the uWSGI master process
+# before the workers are forked. See uwsgi-preload.ini
+if os.getenv("PAGETAGS_PRELOAD") == "1":
+    from pagetags.preload import preload
+
+    preload(app)